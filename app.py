@@ -1,6 +1,7 @@
 import streamlit as st
 import sys
 import os
+import importlib
 import importlib.util
 
 # Sahifa konfiguratsiyasi
@@ -93,107 +94,145 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
-# Modullar uchun placeholder klasslar
-
-# Ob-havo uchun placeholder
-class WeatherPlaceholder:
-    def show_weather_page():
-        st.error("Ob-havo ma'lumotlari moduli topilmadi. Iltimos, weather.py faylini tekshiring.")
-
-
-# Xarita uchun placeholder
-class Xarita2Placeholder:
-    def show_xarita_page():
-        st.error("Xarita moduli topilmadi. Iltimos, xarita2.py faylini tekshiring.")
-
-
-# Ekinlar uchun placeholder
-class CropPlaceholder:
-    def main():
-        st.error("Ekinlar ma'lumotlar moduli topilmadi. Iltimos, crop.py faylini tekshiring.")
-
-
-# Kasalliklar uchun placeholder
-class DiseaseaiPlaceholder:
-    def main():
-        st.error("Kasalliklarni aniqlash moduli topilmadi. Iltimos, diseaseai.py faylini tekshiring.")
-
-
-# AI xulosa uchun placeholder
-class SmartIrrigationAIPlaceholder:
-    def show_ai_results():
-        st.error("AI xulosa moduli topilmadi. Iltimos, smart_irrigation_ai.py faylini tekshiring.")
-
-    def register_page():
-        return SmartIrrigationAIPlaceholder.show_ai_results
+# Sahifalar ro'yxati: navigatsiya kaliti -> sahifa tavsifi (sidebar tartibida).
+# Har bir sahifa o'z modulini va kirish funksiyasini e'lon qiladi. Modul sahifa birinchi marta
+# ochilganda import qilinadi, shuning uchun TensorFlow, folium, plotly kabi og'ir kutubxonalar
+# ilova ochilishini sekinlashtirmaydi.
+SAHIFALAR = {
+    "obhavo": {
+        "tugma": "Ob-havo ma'lumotlari",
+        "belgi": "🌤️",
+        "rang": "66, 133, 244",
+        "belgi_rangi": "#4285f4",
+        "modul": "weather",
+        "kirish": "show_weather_page",
+        "nomi": "Ob-havo",
+    },
+    "xarita": {
+        "tugma": "Xarita va tuproq namligi",
+        "belgi": "🗺️",
+        "rang": "234, 67, 53",
+        "belgi_rangi": "#ea4335",
+        "modul": "xarita2",
+        "kirish": "show_xarita_page",
+        "nomi": "Xarita",
+    },
+    "osimlik": {
+        "tugma": "O'simliklar bo'yicha ma'lumotlar",
+        "belgi": "🌱",
+        "rang": "52, 168, 83",
+        "belgi_rangi": "#34a853",
+        "modul": "osimlik",
+        "kirish": "show_osimlik_page",
+        "nomi": "O'simliklar",
+    },
+    "crop": {
+        "tugma": "Ekinlarni Sug'orishini Hisoblash",
+        "belgi": "💧",
+        "rang": "156, 39, 176",
+        "belgi_rangi": "#9c27b0",
+        "modul": "crop",
+        "kirish": "main",
+        "nomi": "Ekinlarni Sug'orish",
+    },
+    "disease": {
+        "tugma": "Kasallikni aniqlash va davolash",
+        "belgi": "🔬",
+        "rang": "255, 87, 34",
+        "belgi_rangi": "#ff5722",
+        "modul": "diseaseai",
+        "kirish": "main",
+        "nomi": "Kasalliklarni aniqlash",
+    },
+    "intellektual": {
+        "tugma": "Intellektual tavsiyalar",
+        "belgi": "🧠",
+        "rang": "251, 188, 5",
+        "belgi_rangi": "#fbbc05",
+        "modul": None,
+        "kirish": "intellektual_sahifa",
+        "nomi": "Intellektual tavsiyalar",
+    },
+    "ai_xulosa": {
+        "tugma": "AI XULOSA",
+        "belgi": "🤖",
+        "rang": "0, 150, 136",
+        "belgi_rangi": "#009688",
+        "css": "ai",
+        "modul": "smart_irrigation_ai",
+        "kirish": "show_ai_results",
+        "nomi": "AI XULOSA",
+        "xatoni_korsatish": True,
+    },
+}
+
+
+# Ishlab chiqilayotgan sahifa
+def intellektual_sahifa():
+    st.title("Intellektual tavsiyalar")
+    st.info("Bu sahifa ishlab chiqish jarayonida...")
 
 
-# Modullarni import qilish
-try:
-    import weather
-except ImportError:
-    weather = WeatherPlaceholder
+# Ilova rejimi (APP_MODE): "production" - sahifa modullari birinchi ochilganda bir marta import qilinadi;
+# "dev" - har qayta ishga tushishda sahifa modullari qayta yuklanadi (kod o'zgarishlari darhol ko'rinadi)
+ILOVA_REJIMI = os.environ.get("APP_MODE", "production")
 
-try:
-    import xarita2
-except ImportError:
-    xarita2 = Xarita2Placeholder
 
-try:
-    import crop
-except ImportError:
-    crop = CropPlaceholder
+# Sahifa modulini olish: production rejimida jarayon davomida bir marta import qilinadi.
+# Modul topilmasa yoki yuklanmasa None qaytaradi
+def sahifa_moduli(nomi):
+    try:
+        if ILOVA_REJIMI == "dev" and nomi in sys.modules:
+            return importlib.reload(sys.modules[nomi])
+        return importlib.import_module(nomi)
+    except ImportError:
+        pass
 
-# diseaseai modulini import qilish
-try:
-    # Normal import usuli
-    import diseaseai
-except ImportError:
     # Agar import qilishda xatolik bo'lsa, faylni to'g'ridan-to'g'ri yuklab ko'ramiz
     try:
-        # Joriy papkani olish
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        diseaseai_path = os.path.join(current_dir, "diseaseai.py")
-
-        # Fayl mavjudligini tekshirish
-        if os.path.exists(diseaseai_path):
-            # Fayl mavjud bo'lsa, uni modulga aylantiramiz
-            spec = importlib.util.spec_from_file_location("diseaseai", diseaseai_path)
-            if spec:
-                diseaseai = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(diseaseai)
-            else:
-                diseaseai = DiseaseaiPlaceholder
-        else:
-            diseaseai = DiseaseaiPlaceholder
+        fayl_yoli = os.path.join(os.path.dirname(os.path.abspath(__file__)), f"{nomi}.py")
+        if not os.path.exists(fayl_yoli):
+            return None
+        spec = importlib.util.spec_from_file_location(nomi, fayl_yoli)
+        if not spec:
+            return None
+        modul = importlib.util.module_from_spec(spec)
+        sys.modules[nomi] = modul
+        spec.loader.exec_module(modul)
+        return modul
     except Exception:
-        diseaseai = DiseaseaiPlaceholder
+        sys.modules.pop(nomi, None)
+        return None
 
-# smart_irrigation_ai modulini import qilish
-try:
-    # Normal import usuli
-    from smart_irrigation_ai import register_page as ai_register_page
-except ImportError:
-    # Agar import qilishda xatolik bo'lsa, faylni to'g'ridan-to'g'ri yuklab ko'ramiz
-    try:
-        # Joriy papkani olish
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        ai_path = os.path.join(current_dir, "smart_irrigation_ai.py")
 
-        # Fayl mavjudligini tekshirish
-        if os.path.exists(ai_path):
-            # Fayl mavjud bo'lsa, uni modulga aylantiramiz
-            spec = importlib.util.spec_from_file_location("smart_irrigation_ai", ai_path)
-            if spec:
-                smart_irrigation_ai = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(smart_irrigation_ai)
-                ai_register_page = smart_irrigation_ai.register_page
-            else:
-                ai_register_page = SmartIrrigationAIPlaceholder.register_page
+# Sahifani ko'rsatish: modulini (kerak bo'lsa) import qilib, e'lon qilingan kirish funksiyasini chaqirish
+def sahifani_korsatish(sahifa):
+    try:
+        if sahifa["modul"] is None:
+            kirish = globals()[sahifa["kirish"]]
         else:
-            ai_register_page = SmartIrrigationAIPlaceholder.register_page
-    except Exception:
-        ai_register_page = SmartIrrigationAIPlaceholder.register_page
+            modul = sahifa_moduli(sahifa["modul"])
+            if modul is None:
+                st.error(f"{sahifa['nomi']} moduli topilmadi. Iltimos, {sahifa['modul']}.py faylini tekshiring.")
+                return
+            kirish = getattr(modul, sahifa["kirish"], None)
+            if kirish is None:
+                st.error(f"{sahifa['modul']} modulida {sahifa['kirish']}() funksiyasi topilmadi!")
+                return
+        kirish()
+    except Exception as e:
+        st.error(f"{sahifa['nomi']} sahifasini yuklashda xatolik: {e}")
+        if sahifa.get("xatoni_korsatish"):
+            st.exception(e)
+
+
+# Kasallik modelini ilova ishga tushishi bilan fon rejimida yuklash (DISEASE_MODEL_PRELOAD=1)
+if os.environ.get("DISEASE_MODEL_PRELOAD") == "1":
+    try:
+        import disease_model
+        disease_model.preload_in_background()
+    except ImportError:
+        pass
 
 # Session state ni o'rnatish
 if 'active_nav' not in st.session_state:
@@ -205,75 +244,19 @@ with st.sidebar:
         "<div style='text-align: center; color: #1e1e1e; padding: 15px 0; font-size: 18px; font-weight: 600; border-bottom: 1px solid rgba(0,0,0,0.1); margin-bottom: 20px;'>Navigatsiya</div>",
         unsafe_allow_html=True)
 
-    # Ob-havo tugmasi
-    st.markdown("<div id='obhavo-container' class='obhavo-button'>", unsafe_allow_html=True)
-    col1, col2 = st.columns([1, 4])
-    with col1:
-        st.markdown("<div class='nav-icon' style='background-color: rgba(66, 133, 244, 0.2); color: #4285f4;'>🌤️</div>",
-                    unsafe_allow_html=True)
-    with col2:
-        obhavo = st.button("Ob-havo ma'lumotlari", key="obhavo", use_container_width=True)
-    st.markdown("</div>", unsafe_allow_html=True)
-
-    # Xarita tugmasi
-    st.markdown("<div id='xarita-container' class='xarita-button'>", unsafe_allow_html=True)
-    col1, col2 = st.columns([1, 4])
-    with col1:
-        st.markdown("<div class='nav-icon' style='background-color: rgba(234, 67, 53, 0.2); color: #ea4335;'>🗺️</div>",
-                    unsafe_allow_html=True)
-    with col2:
-        xarita = st.button("Xarita va tuproq namligi", key="xarita", use_container_width=True)
-    st.markdown("</div>", unsafe_allow_html=True)
-
-    # # O'simlik tugmasi
-    # st.markdown("<div id='osimlik-container' class='osimlik-button'>", unsafe_allow_html=True)
-    # col1, col2 = st.columns([1, 4])
-    # with col1:
-    #     st.markdown("<div class='nav-icon' style='background-color: rgba(52, 168, 83, 0.2); color: #34a853;'>🌱</div>",
-    #                 unsafe_allow_html=True)
-    # with col2:
-    #     osimlik = st.button("O'simliklar bo'yicha ma'lumotlar", key="osimlik", use_container_width=True)
-    # st.markdown("</div>", unsafe_allow_html=True)
-
-    # Ekinlarni sug'orish tugmasi
-    st.markdown("<div id='crop-container' class='crop-button'>", unsafe_allow_html=True)
-    col1, col2 = st.columns([1, 4])
-    with col1:
-        st.markdown("<div class='nav-icon' style='background-color: rgba(156, 39, 176, 0.2); color: #9c27b0;'>💧</div>",
-                    unsafe_allow_html=True)
-    with col2:
-        crop_watering = st.button("Ekinlarni Sug'orishini Hisoblash", key="crop", use_container_width=True)
-    st.markdown("</div>", unsafe_allow_html=True)
-
-    # Kasallikni aniqlash tugmasi
-    st.markdown("<div id='disease-container' class='disease-button'>", unsafe_allow_html=True)
-    col1, col2 = st.columns([1, 4])
-    with col1:
-        st.markdown("<div class='nav-icon' style='background-color: rgba(255, 87, 34, 0.2); color: #ff5722;'>🔬</div>",
-                    unsafe_allow_html=True)
-    with col2:
-        disease_detection = st.button("Kasallikni aniqlash va davolash", key="disease", use_container_width=True)
-    st.markdown("</div>", unsafe_allow_html=True)
-
-    # Intellektual tugmasi
-    st.markdown("<div id='intellektual-container' class='intellektual-button'>", unsafe_allow_html=True)
-    col1, col2 = st.columns([1, 4])
-    with col1:
-        st.markdown("<div class='nav-icon' style='background-color: rgba(251, 188, 5, 0.2); color: #fbbc05;'>🧠</div>",
-                    unsafe_allow_html=True)
-    with col2:
-        intellektual = st.button("Intellektual tavsiyalar", key="intellektual", use_container_width=True)
-    st.markdown("</div>", unsafe_allow_html=True)
-
-    # AI XULOSA tugmasi - YANGI
-    st.markdown("<div id='ai-container' class='ai-button'>", unsafe_allow_html=True)
-    col1, col2 = st.columns([1, 4])
-    with col1:
-        st.markdown("<div class='nav-icon' style='background-color: rgba(0, 150, 136, 0.2); color: #009688;'>🤖</div>",
-                    unsafe_allow_html=True)
-    with col2:
-        ai_xulosa = st.button("AI XULOSA", key="ai_xulosa", use_container_width=True)
-    st.markdown("</div>", unsafe_allow_html=True)
+    # Har bir sahifa uchun navigatsiya tugmasi
+    for kalit, sahifa in SAHIFALAR.items():
+        css = sahifa.get("css", kalit)
+        st.markdown(f"<div id='{css}-container' class='{css}-button'>", unsafe_allow_html=True)
+        col1, col2 = st.columns([1, 4])
+        with col1:
+            st.markdown(f"<div class='nav-icon' style='background-color: rgba({sahifa['rang']}, 0.2); "
+                        f"color: {sahifa['belgi_rangi']};'>{sahifa['belgi']}</div>",
+                        unsafe_allow_html=True)
+        with col2:
+            if st.button(sahifa["tugma"], key=kalit, use_container_width=True):
+                st.session_state.active_nav = kalit
+        st.markdown("</div>", unsafe_allow_html=True)
 
     # Hover effektlari uchun JavaScript
     st.markdown("""
@@ -299,83 +282,8 @@ with st.sidebar:
     </script>
     """, unsafe_allow_html=True)
 
-# Tugmalar orqali navigatsiyani boshqarish
-if obhavo:
-    st.session_state.active_nav = "obhavo"
-elif xarita:
-    st.session_state.active_nav = "xarita"
-# elif osimlik:
-#     st.session_state.active_nav = "osimlik"
-elif crop_watering:
-    st.session_state.active_nav = "crop"
-elif disease_detection:
-    st.session_state.active_nav = "disease"
-elif intellektual:
-    st.session_state.active_nav = "intellektual"
-elif ai_xulosa:  # YANGI - AI xulosa tugmasi uchun
-    st.session_state.active_nav = "ai_xulosa"
-
 # Tanlangan navigatsiyaga mos sahifani ko'rsatish
-if st.session_state.active_nav == "obhavo":
-    try:
-        # Modulni yangilash
-        if 'weather' in sys.modules:
-            importlib.reload(sys.modules['weather'])
-        # Ob-havo sahifasini ko'rsatish
-        weather.show_weather_page()
-    except Exception as e:
-        st.error(f"Ob-havo sahifasini yuklashda xatolik: {e}")
-
-elif st.session_state.active_nav == "xarita":
-    try:
-        # Modulni yangilash
-        if 'xarita2' in sys.modules:
-            importlib.reload(sys.modules['xarita2'])
-        # Xarita sahifasini ko'rsatish
-        xarita2.show_xarita_page()
-    except Exception as e:
-        st.error(f"Xarita sahifasini yuklashda xatolik: {e}")
-
-elif st.session_state.active_nav == "osimlik":
-    st.title("O'simliklar bo'yicha ma'lumotlar")
-    st.info("Bu sahifa ishlab chiqish jarayonida...")
-
-elif st.session_state.active_nav == "crop":
-    try:
-        # Modulni yangilash
-        if 'crop' in sys.modules:
-            importlib.reload(sys.modules['crop'])
-        # Ekinlar sahifasini ko'rsatish
-        crop.main()
-    except Exception as e:
-        st.error(f"Ekinlarni Sug'orish sahifasini yuklashda xatolik: {e}")
-
-elif st.session_state.active_nav == "disease":
-    try:
-        # Modulni yangilash
-        if 'diseaseai' in sys.modules:
-            importlib.reload(sys.modules['diseaseai'])
-        # Kasalliklarni aniqlash sahifasini ko'rsatish
-        if hasattr(diseaseai, 'main'):
-            diseaseai.main()
-        else:
-            st.error("diseaseai modulida main() funksiyasi topilmadi!")
-    except Exception as e:
-        st.error(f"Kasalliklarni aniqlash sahifasini yuklashda xatolik: {e}")
-
-elif st.session_state.active_nav == "intellektual":
-    st.title("Intellektual tavsiyalar")
-    st.info("Bu sahifa ishlab chiqish jarayonida...")
-
-# YANGI - AI XULOSA sahifasi
-elif st.session_state.active_nav == "ai_xulosa":
-    try:
-        # AI xulosa sahifasini ko'rsatish
-        ai_page = ai_register_page()
-        ai_page()
-    except Exception as e:
-        st.error(f"AI XULOSA sahifasini yuklashda xatolik: {e}")
-        st.exception(e)
+sahifani_korsatish(SAHIFALAR.get(st.session_state.active_nav, SAHIFALAR["intellektual"]))
 
 # Footer
 st.markdown("""
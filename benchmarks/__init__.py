@@ -0,0 +1,6 @@
+"""
+Benchmarks and regression checks. Each script is a module of this package and
+imports the project from the root, so run it from the project root with:
+
+    python -m benchmarks.<name>
+"""
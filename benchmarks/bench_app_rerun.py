@@ -0,0 +1,83 @@
+"""
+Rerun latency of each app.py page.
+
+Opens every page through its sidebar button with Streamlit's AppTest, then
+times plain reruns of that page (what a widget interaction costs). Weather
+requests go to the local OWM stub and the disease page uses the image
+heuristics, so the timings are the app's own work. Run once per APP_MODE to
+compare importing page modules once (production) with reloading them on
+every rerun (dev):
+
+    APP_MODE=dev python -m benchmarks.bench_app_rerun
+    APP_MODE=production python -m benchmarks.bench_app_rerun
+"""
+import importlib
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks.mock_owm_server import MockOWMServer
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+RERUNS = 20
+TIMEOUT = 120
+
+# Page modules app.py reloads on every rerun in dev mode
+PAGE_MODULES = ["weather", "xarita2", "crop", "diseaseai", "osimlik", "smart_irrigation_ai"]
+
+# Sidebar button key -> page name
+PAGES = {
+    "obhavo": "weather",
+    "xarita": "map",
+    "crop": "crop watering",
+    "disease": "disease detection",
+    "ai_xulosa": "AI summary",
+}
+
+
+def main():
+    from streamlit.testing.v1 import AppTest
+
+    with MockOWMServer(latency=0) as server, tempfile.TemporaryDirectory() as tmp:
+        os.environ["OWM_API_ROOT"] = server.api_root
+        os.environ["FORECAST_STORE_PATH"] = os.path.join(tmp, "forecasts.sqlite3")
+        os.environ["DIAGNOSIS_CACHE_PATH"] = os.path.join(tmp, "diagnoses.sqlite3")
+        os.environ["DISEASE_RUNTIME"] = "tflite"
+        os.environ["DISEASE_TFLITE_PATH"] = os.path.join(tmp, "missing.tflite")
+        print(f"APP_MODE={os.environ.get('APP_MODE', '(default)')}, median of {RERUNS} reruns per page")
+
+        at = AppTest.from_file(APP, default_timeout=TIMEOUT)
+        start = time.perf_counter()
+        at.run()
+        print(f"  {'first paint':18s} {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+        for key, name in PAGES.items():
+            start = time.perf_counter()
+            at.button(key=key).click().run()
+            opened = (time.perf_counter() - start) * 1000
+            timings = []
+            for _ in range(RERUNS):
+                start = time.perf_counter()
+                at.run()
+                timings.append((time.perf_counter() - start) * 1000)
+            print(f"  {name:18s} {statistics.median(timings):8.1f} ms rerun, {opened:8.1f} ms first open"
+                  + (f", exception: {at.exception[0].message}" if at.exception else ""))
+
+    # What one rerun pays per page module: a reload (dev) or a sys.modules lookup (production)
+    print("per-rerun module cost: reload vs cached import")
+    for name in PAGE_MODULES:
+        module = importlib.import_module(name)
+        reloads, lookups = [], []
+        for _ in range(RERUNS):
+            start = time.perf_counter()
+            importlib.reload(module)
+            reloads.append((time.perf_counter() - start) * 1000)
+            start = time.perf_counter()
+            importlib.import_module(name)
+            lookups.append((time.perf_counter() - start) * 1000)
+        print(f"  {name:20s} {statistics.median(reloads):7.2f} ms reload, {statistics.median(lookups) * 1000:6.1f} us import")
+
+
+if __name__ == "__main__":
+    main()
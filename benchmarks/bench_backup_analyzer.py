@@ -0,0 +1,90 @@
+"""
+Backup image analyzer benchmark: the histogram-based feature vector against
+the original per-feature NumPy passes, on 224x224 and full-resolution photos.
+Predictions must match the original rules on a fixture set that reaches every branch.
+
+Run from the project root:
+    python -m benchmarks.bench_backup_analyzer
+"""
+import time
+
+import numpy as np
+
+from disease_inference import analyze_image_backup
+
+SIZES = ((224, 224), (3024, 4032))
+FIXTURES = 400
+
+
+def original_backup(img_rgb):
+    """analyze_image_backup as it was before the feature vector (reference implementation)"""
+    has_dark_spots = np.mean(img_rgb[:, :, 0] < 50) > 0.05
+    has_white_powder = np.mean(img_rgb > 200) > 0.15
+    greenness = np.mean(img_rgb[:, :, 1]) / (np.mean(img_rgb[:, :, 0]) + np.mean(img_rgb[:, :, 2]) + 1e-10)
+    reddish_brown = np.mean((img_rgb[:, :, 0] > 120) & (img_rgb[:, :, 1] < 100) & (img_rgb[:, :, 2] < 80)) > 0.08
+    yellowish = np.mean((img_rgb[:, :, 0] > 180) & (img_rgb[:, :, 1] > 180) & (img_rgb[:, :, 2] < 100)) > 0.08
+    texture_variance = np.std(img_rgb)
+    discoloration = np.std(img_rgb[:, :, 1]) > 50
+
+    if has_dark_spots and discoloration:
+        return "pomidor_fitoftoroz", 0.85
+    elif has_white_powder and greenness > 1.0:
+        return "bodring_un_shudring", 0.88
+    elif reddish_brown and texture_variance > 50:
+        return "pomidor_barg_dog", 0.87
+    elif yellowish and texture_variance > 45:
+        return "galla_zang", 0.86
+    elif np.mean(img_rgb[:, :, 1]) < 100 and texture_variance > 60:
+        return "kartoshka_fitoftoroz", 0.84
+    elif has_dark_spots and np.mean(img_rgb[:, :, 1]) < 120:
+        return "uzum_mildyu", 0.83
+    elif np.mean(img_rgb[:, :, 0]) > 150 and np.mean(img_rgb[:, :, 1]) < 140:
+        return "pomidor_bakterial_dog", 0.82
+    elif greenness > 1.3 and texture_variance < 40 and not has_dark_spots and not has_white_powder:
+        return "sog_osimlik", 0.95
+    return "pomidor_barg_dog", 0.70
+
+
+def fixture_images(rng, size=(224, 224)):
+    """Leaf-like images: a base colour with noise plus patches of dark, white, brown or yellow pixels"""
+    images = []
+    for _ in range(FIXTURES):
+        base = rng.integers(0, 256, 3)
+        img = np.clip(base + rng.normal(0, rng.uniform(0, 70), size + (3,)), 0, 255).astype(np.uint8)
+        for colour in ([20, 60, 30], [230, 230, 230], [150, 70, 40], [210, 200, 60]):
+            if rng.random() < 0.35:
+                mask = rng.random(size) < rng.uniform(0, 0.3)
+                img[mask] = colour
+        images.append(img)
+    return images
+
+
+def mean_time(function, images):
+    start = time.perf_counter()
+    for img in images:
+        function(img)
+    return (time.perf_counter() - start) / len(images)
+
+
+def main():
+    rng = np.random.default_rng(0)
+    fixtures = fixture_images(rng)
+    expected = [original_backup(img) for img in fixtures]
+    assert [analyze_image_backup(img) for img in fixtures] == expected
+    branches = len(set(expected))
+    print(f"{FIXTURES} fixture images, {branches} distinct predictions: identical results")
+
+    for height, width in SIZES:
+        count = 50 if height <= 224 else 3
+        images = fixture_images(rng, (height, width))[:count] if height <= 224 else \
+            [np.clip(rng.normal(120, 40, (height, width, 3)), 0, 255).astype(np.uint8) for _ in range(count)]
+        for img in images:
+            assert analyze_image_backup(img) == original_backup(img)
+        before = mean_time(original_backup, images)
+        after = mean_time(analyze_image_backup, images)
+        print(f"{width}x{height}: original {before * 1e3:8.2f} ms   feature vector {after * 1e3:8.2f} ms   "
+              f"({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
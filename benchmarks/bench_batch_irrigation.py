@@ -0,0 +1,80 @@
+"""
+Benchmark for the vectorized irrigation planner.
+
+Run from the project root:
+    python -m benchmarks.bench_batch_irrigation
+"""
+import time
+
+import numpy as np
+
+from irrigation_core import calculate_smart_irrigation
+from irrigation_core.engine import plan_irrigation_batch
+
+FIELD_COUNTS = [10_000, 100_000]
+SCALAR_SAMPLE = 2_000
+FORECAST_DAYS = 7
+
+
+def random_fields(n, seed=0):
+    """Random field, crop and forecast inputs for n fields"""
+    rng = np.random.default_rng(seed)
+    return {
+        "base_daily_water": rng.uniform(0.5, 50.0, n),
+        "days_to_next": rng.integers(-5, 12, n),
+        "urgency_score": rng.integers(1, 4, n),
+        "irrigation_period": rng.integers(2, 13, n),
+        "disease_adjustment": rng.choice([0.0, -0.3], n),
+        "avg_temp": rng.uniform(5, 40, n),
+        "avg_rain_prob": rng.uniform(0, 100, n),
+        "day_temps": rng.integers(5, 41, (n, FORECAST_DAYS)).astype(float),
+        "day_rain_probs": rng.uniform(0, 100, (n, FORECAST_DAYS)),
+    }
+
+
+def time_batch(n, repeats=5):
+    inputs = random_fields(n)
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        plan_irrigation_batch(**inputs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def time_scalar(n):
+    """Per-field loop through calculate_smart_irrigation"""
+    inputs = random_fields(n)
+    start = time.perf_counter()
+    for i in range(n):
+        weather = {
+            "avg_temp": inputs["avg_temp"][i],
+            "avg_rain_prob": inputs["avg_rain_prob"][i],
+            "dates": list(range(FORECAST_DAYS)),
+            "temps": list(inputs["day_temps"][i]),
+            "rain_probs": list(inputs["day_rain_probs"][i]),
+        }
+        field = {
+            "days_to_next_irrigation": int(inputs["days_to_next"][i]),
+            "urgency_score": int(inputs["urgency_score"][i]),
+            "irrigation_period": int(inputs["irrigation_period"][i]),
+        }
+        calculate_smart_irrigation(weather, field,
+                                   {"irrigation_adjustment": inputs["disease_adjustment"][i]},
+                                   {"daily_water_requirement": inputs["base_daily_water"][i]})
+    return time.perf_counter() - start
+
+
+def main():
+    print(f"{'fields':>10} {'seconds':>10} {'schedules/s':>14}")
+    for n in FIELD_COUNTS:
+        elapsed = time_batch(n)
+        print(f"{n:>10} {elapsed:>10.4f} {n / elapsed:>14,.0f}")
+
+    elapsed = time_scalar(SCALAR_SAMPLE)
+    print(f"scalar loop: {SCALAR_SAMPLE} fields in {elapsed:.3f} s "
+          f"({SCALAR_SAMPLE / elapsed:,.0f} schedules/s)")
+
+
+if __name__ == "__main__":
+    main()
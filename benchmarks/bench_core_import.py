@@ -0,0 +1,49 @@
+"""
+Cold-start benchmark for the headless irrigation core.
+
+Starts a fresh interpreter that imports irrigation_core and plans one field,
+then reports the time taken and checks that no UI module was imported.
+
+Run from the project root:
+    python -m benchmarks.bench_core_import
+"""
+import json
+import subprocess
+import sys
+
+BUDGET_MS = 100
+UI_MODULES = ["streamlit", "plotly", "matplotlib", "folium", "requests", "tensorflow"]
+
+WORKER = """
+import json, sys, time
+start = time.perf_counter()
+import irrigation_core
+imported = time.perf_counter()
+field = irrigation_core.analyze_field_status({"ekin": "paxta", "tuproq_namligi": 30})
+crop = irrigation_core.analyze_crop_water_needs({"area": 1000, "water_requirement": "5-7 mm/day",
+                                                 "duration": "7-10 days"})
+weather = {"avg_temp": 32, "avg_rain_prob": 20, "dates": ["01-06"], "temps": [33], "rain_probs": [10]}
+plan = irrigation_core.calculate_smart_irrigation(weather, field, {}, crop)
+planned = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "total_ms": (planned - start) * 1000,
+    "status": plan["status"],
+    "modules": sorted(m for m in %r if m in sys.modules),
+}))
+"""
+
+
+def main():
+    output = subprocess.check_output([sys.executable, "-c", WORKER % UI_MODULES])
+    result = json.loads(output)
+    print(f"import irrigation_core: {result['import_ms']:.1f} ms")
+    print(f"import + plan one field: {result['total_ms']:.1f} ms (budget {BUDGET_MS} ms)")
+    print(f"plan status: {result['status']}")
+    print(f"UI modules loaded: {result['modules'] or 'none'}")
+    if result["modules"] or result["total_ms"] > BUDGET_MS:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
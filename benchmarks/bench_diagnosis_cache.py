@@ -0,0 +1,67 @@
+"""
+Diagnosis cache benchmark: a scout session where photos are re-uploaded and
+the page reruns, comparing cached lookups with full decode + inference.
+
+Run from the project root (DISEASE_MODEL_PATH may point at a local model file):
+    python -m benchmarks.bench_diagnosis_cache
+"""
+import io
+import os
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image
+
+from diagnosis_cache import DiagnosisCache
+from disease_inference import diagnose_batch
+from disease_model import get_model, model_version
+
+PHOTOS = 50
+UPLOADS = 500
+
+
+def main():
+    rng = np.random.default_rng(0)
+    photos = []
+    for _ in range(PHOTOS):
+        buffer = io.BytesIO()
+        Image.fromarray(rng.integers(0, 256, (960, 1280, 3), dtype=np.uint8)).save(buffer, format="JPEG")
+        photos.append(buffer.getvalue())
+
+    # Reruns and re-uploads make a few photos much more frequent than the rest
+    weights = 1.0 / np.arange(1, PHOTOS + 1)
+    uploads = rng.choice(PHOTOS, UPLOADS, p=weights / weights.sum())
+
+    model = get_model()
+    version = model_version()
+    with tempfile.TemporaryDirectory() as folder:
+        cache = DiagnosisCache(os.path.join(folder, "diagnoses.sqlite3"))
+        hit_times, miss_times = [], []
+        for i in uploads.tolist():
+            before = cache.metrics()["misses"]
+            start = time.perf_counter()
+            cache.diagnose(photos[i], lambda: diagnose_batch([photos[i]], model, batch_size=1, workers=1)[0],
+                           version)
+            elapsed = time.perf_counter() - start
+            (miss_times if cache.metrics()["misses"] > before else hit_times).append(elapsed)
+
+        # A new worker process starts with an empty memory tier and reads from disk
+        fresh = DiagnosisCache(cache.path)
+        start = time.perf_counter()
+        for photo in photos:
+            fresh.diagnose(photo, lambda: ("unused", 0.0), version)
+        disk_hit = (time.perf_counter() - start) / PHOTOS
+        metrics = cache.metrics()
+
+    print(f"model: {version}, {UPLOADS} uploads of {PHOTOS} distinct photos")
+    print(f"hit rate:        {metrics['hit_rate']:.1%} ({metrics['memory_hits']} memory, "
+          f"{metrics['disk_hits']} disk, {metrics['misses']} misses)")
+    print(f"miss latency:    {np.median(miss_times) * 1e3:8.2f} ms (decode + inference, max {max(miss_times) * 1e3:.0f} ms)")
+    print(f"memory hit:      {np.median(hit_times) * 1e3:8.3f} ms")
+    print(f"disk hit:        {disk_hit * 1e3:8.3f} ms (fresh process, {fresh.metrics()['disk_hits']} hits)")
+    print(f"saved:           {metrics['saved_ms'] / 1e3:.1f} s of {(metrics['saved_ms'] + metrics['compute_ms']) / 1e3:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
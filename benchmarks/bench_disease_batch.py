@@ -0,0 +1,55 @@
+"""
+Batched disease inference benchmark: images/sec of diagnose_batch at batch
+sizes 1, 8, 32 and 64 on CPU, against one analyze_plant_image call per image.
+
+Run from the project root (DISEASE_MODEL_PATH may point at a local model file):
+    python -m benchmarks.bench_disease_batch
+"""
+import io
+import time
+
+import numpy as np
+from PIL import Image
+
+from disease_inference import diagnose_batch
+from disease_model import get_model, model_stats
+
+IMAGES = 256
+BATCH_SIZES = (1, 8, 32, 64)
+
+
+def make_uploads(rng):
+    """JPEG bytes of random phone-sized photos, as uploaded by the page"""
+    uploads = []
+    for _ in range(IMAGES):
+        img = Image.fromarray(rng.integers(0, 256, (480, 640, 3), dtype=np.uint8))
+        buffer = io.BytesIO()
+        img.save(buffer, format="JPEG")
+        uploads.append(buffer.getvalue())
+    return uploads
+
+
+def main():
+    model = get_model()
+    if model is None:
+        print(f"model could not be loaded: {model_stats()['error']}")
+        return
+    uploads = make_uploads(np.random.default_rng(0))
+
+    # One image per call with no preprocessing threads, as the page did before
+    start = time.perf_counter()
+    single = [diagnose_batch([upload], model, batch_size=1, workers=1)[0] for upload in uploads]
+    baseline = IMAGES / (time.perf_counter() - start)
+    print(f"{'per-image calls':>16}: {baseline:7.1f} images/s")
+
+    for batch_size in BATCH_SIZES:
+        diagnose_batch(uploads[:batch_size], model, batch_size=batch_size)  # trace this batch shape once
+        start = time.perf_counter()
+        results = diagnose_batch(uploads, model, batch_size=batch_size)
+        rate = IMAGES / (time.perf_counter() - start)
+        assert [code for code, _ in results] == [code for code, _ in single]
+        print(f"{'batch ' + str(batch_size):>16}: {rate:7.1f} images/s ({rate / baseline:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Disease model registry benchmark: cold load time and memory, the cost of
+later get_model() calls, and latency of the first diagnosis after loading.
+
+Run from the project root:
+    python -m benchmarks.bench_disease_model
+"""
+import time
+
+import numpy as np
+from PIL import Image
+
+import disease_model
+from diseaseai import analyze_plant_image
+
+REPEATED_CALLS = 10_000
+
+
+def main():
+    start = time.perf_counter()
+    model = disease_model.get_model()
+    cold = time.perf_counter() - start
+    stats = disease_model.model_stats()
+    if model is None:
+        print(f"model could not be loaded: {stats['error']}")
+        return
+
+    start = time.perf_counter()
+    for _ in range(REPEATED_CALLS):
+        assert disease_model.get_model() is model
+    warm_call = (time.perf_counter() - start) / REPEATED_CALLS
+
+    rng = np.random.default_rng(0)
+    img = Image.fromarray(rng.integers(0, 256, (480, 640, 3), dtype=np.uint8))
+    start = time.perf_counter()
+    analyze_plant_image(img, model)
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    analyze_plant_image(img, model)
+    second = time.perf_counter() - start
+
+    print(f"model source:            {stats['source']}")
+    print(f"cold get_model():        {cold:.2f} s (build {stats['load_seconds']:.2f} s, "
+          f"warm-up {stats['warm_up_seconds']:.2f} s)")
+    print(f"RSS:                     {stats['rss_before_mb']:.0f} MB -> {stats['rss_after_mb']:.0f} MB "
+          f"(+{stats['rss_delta_mb']:.0f} MB)")
+    print(f"warm get_model():        {warm_call * 1e9:.0f} ns")
+    print(f"first diagnosis:         {first * 1e3:.1f} ms")
+    print(f"second diagnosis:        {second * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Disease model runtime benchmark: the Keras path against exported TFLite float32
+and int8 models. Each runtime runs in a fresh process to measure cold start
+(imports + load + warm-up), per-image latency and RSS.
+
+Run from the project root (DISEASE_MODEL_PATH may point at a local model file):
+    python -m benchmarks.bench_disease_runtime
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+IMAGES = 40
+
+
+def child():
+    """Measured in a fresh interpreter: everything from the first import on counts as cold start"""
+    start = time.perf_counter()
+    from disease_inference import decode_and_resize, diagnose_batch, predict_batches
+    from disease_model import get_model, model_stats
+    from PIL import Image
+    model = get_model()
+    cold = time.perf_counter() - start
+
+    rng = np.random.default_rng(0)
+    images = [Image.fromarray(rng.integers(0, 256, (480, 640, 3), dtype=np.uint8)) for _ in range(IMAGES)]
+    latencies = []
+    scores = []
+    for img in images:
+        start = time.perf_counter()
+        diagnose_batch([img], model, batch_size=1, workers=1)
+        latencies.append(time.perf_counter() - start)
+        scores.append(predict_batches(model, decode_and_resize(img)[None], 1)[0].tolist())
+
+    print(json.dumps({
+        "source": model_stats()["source"],
+        "cold_start": cold,
+        "latency_ms": float(np.median(latencies) * 1e3),
+        "rss_mb": model_stats()["rss_after_mb"],
+        "tensorflow_imported": "tensorflow" in sys.modules,
+        "scores": scores,
+    }))
+
+
+def run_variant(env):
+    output = subprocess.run([sys.executable, "-m", "benchmarks.bench_disease_runtime", "--child"],
+                            env=dict(os.environ, TF_CPP_MIN_LOG_LEVEL="3", **env),
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    from disease_export import export_tflite
+    from disease_model import build_model
+
+    keras_model, source = build_model("keras")
+    with tempfile.TemporaryDirectory() as folder:
+        float_path = os.path.join(folder, "model.tflite")
+        int8_path = os.path.join(folder, "model_int8.tflite")
+        export_tflite(keras_model, float_path)
+        export_tflite(keras_model, int8_path, int8=True)
+
+        variants = {
+            "keras": {"DISEASE_RUNTIME": "keras"},
+            "tflite float32": {"DISEASE_RUNTIME": "tflite", "DISEASE_TFLITE_PATH": float_path},
+            "tflite int8": {"DISEASE_RUNTIME": "tflite", "DISEASE_TFLITE_INT8_PATH": int8_path,
+                            "DISEASE_MODEL_INT8": "1"},
+        }
+        results = {name: run_variant(env) for name, env in variants.items()}
+        sizes = {"keras": None, "tflite float32": os.path.getsize(float_path),
+                 "tflite int8": os.path.getsize(int8_path)}
+
+    reference = np.array(results["keras"]["scores"])
+    print(f"model: {source}, {IMAGES} images")
+    print(f"{'runtime':>15} {'cold s':>7} {'ms/img':>7} {'RSS MB':>7} {'file MB':>8} {'TF loaded':>9} "
+          f"{'top-1 agree':>11} {'max |dp|':>9}")
+    for name, result in results.items():
+        scores = np.array(result["scores"])
+        agree = np.mean(scores.argmax(axis=1) == reference.argmax(axis=1))
+        size = f"{sizes[name] / 1e6:.1f}" if sizes[name] else "-"
+        print(f"{name:>15} {result['cold_start']:>7.2f} {result['latency_ms']:>7.1f} {result['rss_mb']:>7.0f} "
+              f"{size:>8} {str(result['tensorflow_imported']):>9} {agree:>11.0%} "
+              f"{np.abs(scores - reference).max():>9.4f}")
+
+
+if __name__ == "__main__":
+    if "--child" in sys.argv:
+        child()
+    else:
+        main()
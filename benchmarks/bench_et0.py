@@ -0,0 +1,92 @@
+"""
+Reference evapotranspiration benchmark: one year of hourly weather for all 13 regions.
+
+Synthetic hourly temperature, humidity, wind and cloud cover (seasonal and daily
+cycles plus noise) are fed to irrigation_core.et0.reference_et in one call, once
+with all inputs (Penman-Monteith) and once with temperature only (Hargreaves).
+Checks FAO-56 example 19 first and exits non-zero if the year takes longer than
+the budget.
+
+Run from the project root:
+    python -m benchmarks.bench_et0
+"""
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from irrigation_core.et0 import REGION_ELEVATIONS, crop_demand, reference_et
+from weather_api import UZB_CITIES
+
+HOURS = 365 * 24
+REPEATS = 5
+BUDGET_MS = 500
+
+
+def synthetic_year(n_regions, seed=0):
+    """Hourly weather for n_regions with seasonal and daily cycles (UTC timestamps, Uzbekistan is UTC+5)"""
+    rng = np.random.default_rng(seed)
+    times = np.datetime64("2025-01-01T00:30", "s") + np.arange(HOURS) * np.timedelta64(3600, "s")
+    day = np.arange(HOURS) / 24
+    season = -np.cos(2 * np.pi * (day - 15) / 365)
+    daily = np.sin(2 * np.pi * ((np.arange(HOURS) + 5) % 24 - 9) / 24)
+    offset = rng.normal(0, 2, (n_regions, 1))
+    temp = 14 + offset + 15 * season + (6 + 3 * season) * daily + rng.normal(0, 1.5, (n_regions, HOURS))
+    humidity = np.clip(60 - 25 * season - 15 * daily + rng.normal(0, 8, (n_regions, HOURS)), 5, 100)
+    wind = np.abs(2.5 + rng.normal(0, 1.2, (n_regions, HOURS)))
+    clouds = np.clip(45 - 35 * season + rng.normal(0, 25, (n_regions, HOURS)), 0, 100)
+    return times, temp, humidity, wind, clouds
+
+
+def check_fao_example():
+    """FAO-56 example 19: N'Diaye (Senegal), 1 October, 14:00-15:00 local time, ET0 = 0.63 mm/hour"""
+    times = np.array(["2025-10-01T15:30", "2025-10-01T16:30"], dtype="datetime64[s]")
+    result = reference_et(times, [[38, 38]], humidity=[[52, 52]], wind_speed=[[3.3, 3.3]],
+                          latitude=16.217, longitude=-16.25, elevation=8,
+                          solar_radiation=[[2.45, 2.45]], wind_height=2)
+    et0 = float(result["et0"][0, 0])
+    print(f"FAO-56 example 19: {et0:.3f} mm/hour (expected 0.63)")
+    assert abs(et0 - 0.63) < 0.01, et0
+
+
+def timed(function):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+def main():
+    check_fao_example()
+
+    regions = list(UZB_CITIES)
+    latitude = np.array([UZB_CITIES[name][1] for name in regions])
+    longitude = np.array([UZB_CITIES[name][2] for name in regions])
+    elevation = np.array([REGION_ELEVATIONS[name] for name in regions])
+    times, temp, humidity, wind, clouds = synthetic_year(len(regions))
+    slots = temp.size
+    print(f"{len(regions)} regions x {HOURS} hourly slots = {slots} slots")
+
+    pm_ms, pm = timed(lambda: reference_et(times, temp, humidity, wind, clouds,
+                                           latitude=latitude, longitude=longitude, elevation=elevation))
+    hg_ms, hg = timed(lambda: reference_et(times, temp, latitude=latitude, longitude=longitude,
+                                           elevation=elevation))
+    kc_ms, _ = timed(lambda: crop_demand(pm["et0"], "paxta", np.arange(HOURS) / 24))
+    print(f"Penman-Monteith:    {pm_ms:7.1f} ms ({slots / pm_ms / 1000:.1f} M slots/s)")
+    print(f"Hargreaves:         {hg_ms:7.1f} ms")
+    print(f"crop demand (Kc):   {kc_ms:7.1f} ms")
+
+    print("annual ET0 (mm), Penman-Monteith / Hargreaves:")
+    for name, pm_total, hg_total in zip(regions, pm["et0"].sum(axis=1), hg["et0"].sum(axis=1)):
+        print(f"  {name:12s} {pm_total:7.0f} {hg_total:7.0f}")
+
+    if pm_ms > BUDGET_MS:
+        print(f"over budget ({BUDGET_MS} ms)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Spatial index benchmark: click hit-testing and viewport queries over 100k
+field polygons, FieldIndex versus scanning every field.
+
+Run from the project root:
+    python -m benchmarks.bench_field_index
+"""
+import time
+
+import numpy as np
+
+from irrigation_core.field_index import FieldIndex, geometry_of, point_in_polygons, polygon_rings
+
+FIELDS = 100_000
+QUERIES = 2_000
+SCAN_QUERIES = 20
+
+# Uzbekistan bounding box
+LON_RANGE = (56.0, 73.0)
+LAT_RANGE = (37.2, 45.6)
+
+
+def make_fields(rng):
+    """Random quadrilateral fields of roughly 100-600 m across"""
+    centers = np.column_stack([rng.uniform(*LON_RANGE, FIELDS), rng.uniform(*LAT_RANGE, FIELDS)])
+    half = rng.uniform(0.0005, 0.003, (FIELDS, 1))
+    corners = np.array([[-1, -1], [1, -1], [1, 1], [-1, 1], [-1, -1]], dtype=float)
+    jitter = rng.uniform(0.8, 1.2, (FIELDS, 5, 1))
+    rings = centers[:, None, :] + corners[None] * half[:, :, None] * jitter
+    rings[:, -1] = rings[:, 0]
+    return [{"type": "Feature", "geometry": {"type": "Polygon", "coordinates": [ring.tolist()]}}
+            for ring in rings]
+
+
+def scan_point(polygons, lon, lat):
+    return [i for i, rings in enumerate(polygons) if point_in_polygons(rings, lon, lat)]
+
+
+def main():
+    rng = np.random.default_rng(0)
+    fields = make_fields(rng)
+
+    start = time.perf_counter()
+    index = FieldIndex()
+    index.extend(fields)
+    build = time.perf_counter() - start
+
+    # Clicks on field centres, so almost every query is a hit
+    targets = rng.integers(0, FIELDS, QUERIES)
+    bounds = index.bounds
+    clicks = np.column_stack([(bounds[targets, 0] + bounds[targets, 2]) / 2,
+                              (bounds[targets, 1] + bounds[targets, 3]) / 2])
+
+    start = time.perf_counter()
+    hits = [index.query_point(lon, lat) for lon, lat in clicks]
+    point_time = (time.perf_counter() - start) / QUERIES
+    assert all(t in h for t, h in zip(targets.tolist(), hits))
+
+    polygons = [polygon_rings(geometry_of(field)) for field in fields]
+    start = time.perf_counter()
+    for (lon, lat), expected in zip(clicks[:SCAN_QUERIES], hits):
+        assert scan_point(polygons, lon, lat) == expected
+    scan_point_time = (time.perf_counter() - start) / SCAN_QUERIES
+
+    # Viewports of a zoomed-in map (about 10 x 6 km)
+    corners = np.column_stack([rng.uniform(*LON_RANGE, QUERIES), rng.uniform(*LAT_RANGE, QUERIES)])
+    start = time.perf_counter()
+    found = [index.query_bbox(lon, lat, lon + 0.12, lat + 0.06) for lon, lat in corners]
+    bbox_time = (time.perf_counter() - start) / QUERIES
+
+    start = time.perf_counter()
+    for (lon, lat), expected in zip(corners[:SCAN_QUERIES], found):
+        scanned = []
+        for i, field in enumerate(fields):
+            min_lon, min_lat, max_lon, max_lat = _bbox_of(field)
+            if min_lon <= lon + 0.12 and max_lon >= lon and min_lat <= lat + 0.06 and max_lat >= lat:
+                scanned.append(i)
+        assert scanned == expected.tolist()
+    scan_bbox_time = (time.perf_counter() - start) / SCAN_QUERIES
+
+    print(f"{FIELDS:,} polygons, index built in {build:.2f} s ({len(index.cells):,} grid cells)")
+    print(f"point query:  index {point_time * 1e6:8.1f} us   scan {scan_point_time * 1e3:8.1f} ms   "
+          f"({scan_point_time / point_time:,.0f}x)")
+    print(f"bbox query:   index {bbox_time * 1e6:8.1f} us   scan {scan_bbox_time * 1e3:8.1f} ms   "
+          f"({scan_bbox_time / bbox_time:,.0f}x), avg {np.mean([len(f) for f in found]):.1f} fields per viewport")
+
+
+def _bbox_of(field):
+    ring = field["geometry"]["coordinates"][0]
+    lons = [p[0] for p in ring]
+    lats = [p[1] for p in ring]
+    return min(lons), min(lats), max(lons), max(lats)
+
+
+if __name__ == "__main__":
+    main()
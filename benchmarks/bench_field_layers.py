@@ -0,0 +1,59 @@
+"""
+Map rendering benchmark: one GeoJson layer per field versus a single
+FeatureCollection layer, measuring HTML size and render time.
+
+Run from the project root:
+    python -m benchmarks.bench_field_layers
+"""
+import datetime
+import time
+
+import folium
+import numpy as np
+
+from field_layers import alohida_qatlamlar_qoshish, yagona_qatlam_qoshish
+from irrigation_core.crops import osimlik_turlari
+
+FIELD_COUNTS = (1_000, 10_000)
+
+
+def make_fields(count, rng):
+    bugun = datetime.date.today()
+    ekinlar = list(osimlik_turlari)
+    maydonlar = []
+    for i in range(count):
+        lon, lat = 64.0 + rng.uniform(0, 2), 41.0 + rng.uniform(0, 1)
+        kenglik = rng.uniform(0.002, 0.01)
+        maydonlar.append({
+            "nomi": f"Maydon {i + 1}",
+            "ekin": ekinlar[i % len(ekinlar)],
+            "oxirgi_sugorilgan": bugun - datetime.timedelta(days=int(rng.integers(0, 14))),
+            "ekish_sanasi": bugun - datetime.timedelta(days=int(rng.integers(10, 150))),
+            "tuproq_namligi": float(rng.uniform(10, 90)),
+            "shakl": {"type": "Feature", "geometry": {"type": "Polygon", "coordinates": [[
+                [lon, lat], [lon + kenglik, lat], [lon + kenglik, lat + kenglik], [lon, lat + kenglik], [lon, lat]
+            ]]}}
+        })
+    return maydonlar
+
+
+def render(qoshish, maydonlar):
+    start = time.perf_counter()
+    xarita = folium.Map(location=[41.5, 65.0], zoom_start=8)
+    qoshish(xarita, maydonlar)
+    html = xarita.get_root().render()
+    return time.perf_counter() - start, len(html.encode("utf-8")), html.count("L.geoJson(")
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'fields':>7} {'mode':>8} {'render s':>9} {'HTML MB':>8} {'layers':>7}")
+    for count in FIELD_COUNTS:
+        maydonlar = make_fields(count, rng)
+        for nom, qoshish in (("alohida", alohida_qatlamlar_qoshish), ("yagona", yagona_qatlam_qoshish)):
+            elapsed, size, layers = render(qoshish, maydonlar)
+            print(f"{count:>7,} {nom:>8} {elapsed:>9.2f} {size / 1e6:>8.2f} {layers:>7,}")
+
+
+if __name__ == "__main__":
+    main()
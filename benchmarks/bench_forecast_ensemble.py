@@ -0,0 +1,91 @@
+"""
+Forecast-uncertainty ensemble benchmark: runtime versus ensemble size.
+
+One cotton field is planned over the rest of its season under a synthetic
+5-day forecast (the local OWM stub's payload), deterministically and with
+irrigation_core.ensemble.ensemble_irrigation for growing ensemble sizes, on
+one worker thread and on every CPU. The stub forecast gets rain volumes on
+its likelier rainy slots. Prints the P10/P50/P90 of the first irrigations for
+the default ensemble size, checks that every deterministic irrigation day
+falls inside its P10-P90 band, and exits non-zero if the ensemble takes
+longer than the budget.
+
+Run from the project root:
+    python -m benchmarks.bench_forecast_ensemble
+"""
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.mock_owm_server import forecast_payload
+from irrigation_core.analysis import summarize_forecast, water_balance_schedule
+from irrigation_core.ensemble import DEFAULT_SCENARIOS, ensemble_irrigation
+from irrigation_core.forecast import build_forecast, parse_forecast_columns
+
+SIZES = [50, 100, 200, 500, 1000, 2000, 5000]
+REPEATS = 5
+BUDGET_MS = 200
+# Forecast rain (mm per 3-hour slot) on slots with a probability of precipitation above RAIN_POP (%)
+SLOT_RAIN_MM = 1.5
+RAIN_POP = 50
+FIELD = {"crop_type": "paxta", "soil_moisture": 45, "days_after_planting": 40}
+CROP = {"area": 10_000, "daily_water_requirement": 50}
+
+
+def timed(function):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+def main():
+    forecast = build_forecast(parse_forecast_columns(forecast_payload("Tashkent")))
+    forecast.update(region="Toshkent", latitude=41.2995, longitude=69.2401)
+    forecast["rain_mm"] = np.where(forecast["rain_probs"] > RAIN_POP, SLOT_RAIN_MM, 0.0)
+    weather = summarize_forecast(forecast)
+    cpus = os.cpu_count() or 1
+
+    single_ms, plan = timed(lambda: water_balance_schedule(weather, FIELD, CROP))
+    print(f"deterministic plan: {single_ms:.1f} ms, {len(plan['day_offsets'])} irrigations "
+          f"over {plan['horizon_days']} days")
+
+    print(f"ensemble runtime on 1 worker thread and on all {cpus} CPUs:")
+    print(f"{'scenarios':>10} {'1 thread ms':>12} {'all CPUs ms':>12} {'scenarios/s':>12}")
+    default_ms = None
+    for size in SIZES:
+        one_ms, _ = timed(lambda: ensemble_irrigation(forecast, FIELD, CROP, n_scenarios=size, workers=1, seed=0))
+        all_ms, result = timed(lambda: ensemble_irrigation(forecast, FIELD, CROP, n_scenarios=size,
+                                                           workers=cpus, seed=0))
+        print(f"{size:>10} {one_ms:>12.1f} {all_ms:>12.1f} {size / min(one_ms, all_ms) * 1000:>12,.0f}")
+        if size == DEFAULT_SCENARIOS:
+            default_ms, default = all_ms, result
+
+    print(f"first irrigations, {DEFAULT_SCENARIOS} scenarios (P10 / P50 / P90):")
+    for i in range(min(3, len(default["volume_m3"]))):
+        days = " / ".join(f"{d:.0f}" for d in default["day_offset"][i])
+        volumes = " / ".join(f"{v:.0f}" for v in default["volume_m3"][i])
+        print(f"  #{i + 1}: day {days}, {volumes} m³ (needed in {default['probability'][i]:.0%} of scenarios, "
+              f"deterministic: day {plan['day_offsets'][i]}, {plan['depth_mm'][i] * CROP['area'] / 1000:.0f} m³)")
+    print(f"season total: {' / '.join(f'{v:.0f}' for v in default['total_m3'])} m³")
+
+    # The ensemble is centred on the forecast: the deterministic plan lies inside every band
+    for i, day in enumerate(plan["day_offsets"][:len(default["day_offset"])]):
+        low, _, high = default["day_offset"][i]
+        assert low <= day <= high, f"deterministic irrigation {i + 1} on day {day}, outside {low:.0f}-{high:.0f}"
+    print("deterministic irrigation days inside the P10-P90 bands: yes")
+
+    assert np.allclose(ensemble_irrigation(forecast, FIELD, CROP, n_scenarios=1000, workers=1, seed=0)["volume_m3"],
+                       ensemble_irrigation(forecast, FIELD, CROP, n_scenarios=1000, workers=4, seed=0)["volume_m3"])
+    if default_ms > BUDGET_MS:
+        print(f"over budget ({BUDGET_MS} ms)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark of the persistent forecast store against the local stub server.
+
+Measures a cold miss, a fresh hit and a stale hit (served immediately while the
+entry is refreshed in the background), then starts several worker processes on
+one expired entry to check that only one of them refreshes it upstream.
+
+Run from the project root:
+    python -m benchmarks.bench_forecast_store
+"""
+import multiprocessing
+import os
+import tempfile
+import time
+
+from benchmarks.mock_owm_server import MockOWMServer
+
+UPSTREAM_LATENCY = 0.2
+WORKERS = 8
+REGION = "Toshkent"
+
+
+def _worker(api_root, store_path, results):
+    os.environ["OWM_API_ROOT"] = api_root
+    import weather_api
+    from forecast_store import ForecastStore
+
+    start = time.perf_counter()
+    forecast = weather_api.get_forecast(REGION, store=ForecastStore(store_path))
+    results.append((time.perf_counter() - start, forecast is not None))
+    time.sleep(UPSTREAM_LATENCY * 3)  # keep the process alive for its background refresh
+
+
+def expire(store, ttl):
+    """Replace the latest entry with a copy that is older than the TTL"""
+    fetched_at, payload = store.latest("forecast", REGION)
+    with store._connect() as conn:
+        conn.execute("DELETE FROM forecasts WHERE kind = ? AND region = ?", ("forecast", REGION))
+    store.put("forecast", REGION, payload, fetched_at=fetched_at - ttl - 1)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    with MockOWMServer(latency=UPSTREAM_LATENCY) as server, tempfile.TemporaryDirectory() as tmp:
+        os.environ["OWM_API_ROOT"] = server.api_root
+        import weather_api
+        from forecast_store import ForecastStore
+
+        store = ForecastStore(os.path.join(tmp, "forecasts.sqlite3"))
+
+        ms, _ = timed(lambda: weather_api.get_forecast(REGION, store=store))
+        print(f"cold miss:   {ms:7.1f} ms (upstream hits: {server.hits['forecast']})")
+        ms, _ = timed(lambda: weather_api.get_forecast(REGION, store=store))
+        print(f"fresh hit:   {ms:7.1f} ms (upstream hits: {server.hits['forecast']})")
+
+        expire(store, weather_api.FORECAST_TTL)
+
+        ms, _ = timed(lambda: weather_api.get_forecast(REGION, store=store))
+        print(f"stale hit:   {ms:7.1f} ms (served immediately, refreshing in background)")
+        time.sleep(UPSTREAM_LATENCY * 3)
+        print(f"after refresh upstream hits: {server.hits['forecast']}")
+
+        # Shared across processes: expire again and let several workers read at once
+        expire(store, weather_api.FORECAST_TTL)
+        before = server.hits["forecast"]
+        with multiprocessing.Manager() as manager:
+            results = manager.list()
+            procs = [multiprocessing.Process(target=_worker, args=(server.api_root, store.path, results))
+                     for _ in range(WORKERS)]
+            for proc in procs:
+                proc.start()
+            for proc in procs:
+                proc.join()
+            worst = max(r[0] for r in results) * 1000
+        print(f"{WORKERS} workers on an expired entry: slowest read {worst:.1f} ms, "
+              f"upstream refreshes: {server.hits['forecast'] - before}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Incremental season planner benchmark: 10k fields, a 180-day season, a new
+forecast every few days.
+
+Every UPDATE_EVERY days a share of the fields sends a moisture reading (one
+update), then a new forecast replaces rain and demand for the next
+FORECAST_DAYS days of every field (a second update, passed with from_day, so
+the planner skips the diff). The planner re-runs only the changed fields, from
+the earliest changed day; the benchmark times both
+kinds of update against planning the whole season again, reports days
+recomputed versus reused, and checks the final plans against a full run.
+
+Run from the project root:
+    python -m benchmarks.bench_incremental_planner
+"""
+import os
+import time
+
+import numpy as np
+
+from irrigation_core.incremental import IncrementalPlanner
+from irrigation_core.water_balance import (
+    WATER_TABLE_CROPS, depletion_from_moisture, root_zone_parameters, simulate_water_balance, stage_demand,
+)
+from irrigation_core.water_table import load_water_table
+
+FIELDS = 10_000
+SEASON_DAYS = 180
+UPDATE_EVERY = 3
+FORECAST_DAYS = 5
+READING_SHARE = 0.1
+WATER_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sug'orish.csv")
+
+
+def main():
+    rng = np.random.default_rng(0)
+    table = load_water_table(WATER_CSV)
+    crops = rng.choice(list(WATER_TABLE_CROPS), FIELDS)
+    crop_ids = np.array([table.crop_ids[WATER_TABLE_CROPS[c]] for c in crops])
+    demand = stage_demand(table, crop_ids, rng.integers(-30, 30, FIELDS), SEASON_DAYS)
+    rain = np.tile(np.where(rng.random(SEASON_DAYS) < 0.15, rng.gamma(2.0, 3.0, SEASON_DAYS), 0.0), (FIELDS, 1))
+    observed = np.full((FIELDS, SEASON_DAYS), np.nan)
+    taw, allowable, refill = root_zone_parameters(crops)
+    initial = depletion_from_moisture(rng.uniform(30, 90, FIELDS), taw)
+    field_ids = [f"maydon-{i}" for i in range(FIELDS)]
+
+    def full_run():
+        return simulate_water_balance(demand, taw, allowable, initial, rain_mm=rain, refill_depletion=refill,
+                                      observed_depletion=observed)
+
+    planner = IncrementalPlanner("2026-04-01", SEASON_DAYS)
+    start = time.perf_counter()
+    planner.update(field_ids, demand, taw, allowable, refill, initial, rain_mm=rain, observed_depletion=observed)
+    print(f"first plan: {FIELDS:,} fields x {SEASON_DAYS} days in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    reading_s = forecast_s = full_s = 0.0
+    updates = 0
+    for today in range(UPDATE_EVERY, SEASON_DAYS, UPDATE_EVERY):
+        readers = rng.random(FIELDS) < READING_SHARE
+        modelled = planner.depletion[[planner.rows[f] for f in np.array(field_ids)[readers]], today]
+        observed[readers, today] = np.clip(modelled + rng.normal(0, 5, readers.sum()), 0, taw[readers])
+        start = time.perf_counter()
+        planner.update(field_ids, demand, taw, allowable, refill, initial, rain_mm=rain,
+                       observed_depletion=observed)
+        reading_s += time.perf_counter() - start
+
+        window = slice(today, min(today + FORECAST_DAYS, SEASON_DAYS))
+        width = window.stop - window.start
+        rain[:, window] = np.where(rng.random((FIELDS, width)) < 0.2, rng.gamma(2.0, 3.0, (FIELDS, width)), 0.0)
+        demand[:, window] *= rng.uniform(0.9, 1.1, (FIELDS, width))
+        start = time.perf_counter()
+        planner.update(field_ids, demand, taw, allowable, refill, initial, rain_mm=rain,
+                       observed_depletion=observed, from_day=today)
+        forecast_s += time.perf_counter() - start
+
+        start = time.perf_counter()
+        reference = full_run()
+        full_s += time.perf_counter() - start
+        updates += 1
+
+    print(f"{updates} days with updates (every {UPDATE_EVERY} days), ms per update:")
+    for name, elapsed in [(f"moisture readings ({READING_SHARE:.0%} of fields)", reading_s),
+                          ("new forecast (all fields)", forecast_s), ("full season recomputation", full_s)]:
+        print(f"  {name:34s} {elapsed / updates * 1000:6.1f}")
+
+    stats = planner.stats()
+    print(f"days recomputed {stats['recomputed_days']:,}, reused {stats['reused_days']:,} "
+          f"({stats['reuse_ratio']:.0%} reused, first plan included)")
+
+    rows = [planner.rows[f] for f in field_ids]
+    assert np.allclose(planner.depletion[rows], reference["depletion"])
+    assert np.allclose(planner.irrigation_mm[rows], reference["irrigation_mm"])
+    print("final plans match a full recomputation: yes")
+    print(f"irrigations per field over the season: {(reference['irrigation_mm'] > 0).sum(axis=1).mean():.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Knowledge-base search benchmark over a synthetic 100k-document corpus.
+
+Documents are random stretches of the plants_database.csv and
+diseases_database.csv records plus noise words, so term frequencies and
+co-occurrence resemble the real texts. Compares
+a linear scan (substring match of every query word over every normalized
+document) with the BM25 inverted index in irrigation_core.knowledge_search,
+and checks its early-terminating top-k against scoring every match. Exits
+non-zero if a query's median time is over the budget.
+
+Run from the project root:
+    python -m benchmarks.bench_knowledge_search
+"""
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from irrigation_core.knowledge_search import SearchIndex, build_search_index, normalize, tokenize
+
+DOCUMENTS = 100_000
+MIN_WORDS = 20
+NOISE_WORDS = 10
+BUDGET_MS = 1.0
+
+QUERIES = [
+    "fitoftoroz", "pomidor barg dog'", "oʻgʻit", "sug‘orish", "kasal", "un shudring",
+    "mis tarkibli fungitsid", "qizil o'rgimchakkana", "olma", "issiq iqlim tuproq",
+]
+
+
+def synthetic_documents(count, seed=0):
+    """
+    Each document is a random stretch of one real record (so words that belong together
+    still co-occur) with noise words from the whole corpus mixed in
+    """
+    real = build_search_index().documents
+    texts = [document["text"].split() for document in real]
+    words = [word for text in texts for word in text]
+    rng = np.random.default_rng(seed)
+    sources = rng.integers(0, len(real), count)
+    documents = []
+    for i, source in enumerate(sources.tolist()):
+        text = texts[source]
+        length = int(rng.integers(min(MIN_WORDS, len(text)), len(text) + 1))
+        start = int(rng.integers(0, len(text) - length + 1))
+        noise = [words[j] for j in rng.integers(0, len(words), NOISE_WORDS)]
+        documents.append({
+            "kind": real[source]["kind"],
+            "key": str(i),
+            "title": f"{real[source]['title']} {i}",
+            "text": " ".join(text[start:start + length] + noise),
+            "summary": "",
+            "record": {},
+        })
+    return documents
+
+
+def linear_scan(normalized, query, limit=10):
+    """Count query-word occurrences in every document (the no-index baseline)"""
+    terms = tokenize(query)
+    scores = [(sum(text.count(term) for term in terms), i) for i, text in enumerate(normalized)]
+    return sorted((s for s in scores if s[0]), reverse=True)[:limit]
+
+
+def exhaustive(index, query, limit=10):
+    """Score every matching document (reference for the early-terminating search)"""
+    scores = np.zeros(len(index), dtype=np.float32)
+    for word in dict.fromkeys(tokenize(query)):
+        postings = index.word_postings(word)
+        if postings:
+            scores[postings[0]] += postings[1]
+    top = np.argsort(-scores, kind="stable")[:limit]
+    return scores[top[scores[top] > 0]]
+
+
+def main():
+    documents = synthetic_documents(DOCUMENTS)
+    start = time.perf_counter()
+    index = SearchIndex(documents)
+    build = time.perf_counter() - start
+    print(f"{DOCUMENTS} documents, {len(index.vocabulary)} terms, index built in {build:.1f} s")
+
+    normalized = [normalize(d["title"] + " " + d["text"]) for d in documents]
+    start = time.perf_counter()
+    for query in QUERIES[:3]:
+        linear_scan(normalized, query)
+    scan_ms = (time.perf_counter() - start) * 1000 / 3
+    print(f"linear scan:      {scan_ms:8.1f} ms/query")
+
+    cold = []
+    for query in QUERIES:
+        start = time.perf_counter()
+        results = index.search(query)
+        cold.append((time.perf_counter() - start) * 1000)
+        reference = exhaustive(index, query)
+        assert len(results) == len(reference) and np.allclose([score for score, _ in results], reference), query
+    print(f"first query of a word (prefix merge): {statistics.median(cold):.2f} ms median, {max(cold):.1f} ms max")
+    timings = {query: [] for query in QUERIES}
+    for _ in range(50):
+        for query in QUERIES:
+            start = time.perf_counter()
+            index.search(query)
+            timings[query].append((time.perf_counter() - start) * 1000)
+
+    over = []
+    for query, values in timings.items():
+        median = statistics.median(values)
+        matched = len(index.search(query, limit=DOCUMENTS))
+        print(f"  {query:28s} {median:6.3f} ms median, {matched:6d} matching documents")
+        if median > BUDGET_MS:
+            over.append(query)
+    overall = statistics.median(v for values in timings.values() for v in values)
+    print(f"inverted index:   {overall:8.3f} ms/query median (budget {BUDGET_MS} ms), "
+          f"{len(over)} queries over budget")
+    if over:
+        print(f"over budget ({BUDGET_MS} ms): {', '.join(over)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
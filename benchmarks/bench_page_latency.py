@@ -0,0 +1,101 @@
+"""
+Page latency regression check for the diagnosis, weather and AI pages.
+
+Runs each page headless with Streamlit's AppTest against instant backends
+(the local OWM stub with no latency, an empty diagnosis cache and the image
+heuristics instead of a model), so what remains is the page's own fixed
+overhead. Fails (exit status 1, naming the interactions) when the median of
+an interaction exceeds its budget. The budgets sit about 200 ms above the
+medians measured after the fix, below the smallest removed delay (a 0.5 s
+sleep), so an artificial sleep or progress animation that creeps back in
+fails the check.
+
+Run from the project root:
+    python -m benchmarks.bench_page_latency
+"""
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image
+
+from benchmarks.mock_owm_server import MockOWMServer
+
+REPEATS = 5
+TIMEOUT = 120
+
+# Median wall time allowed per interaction, in ms (measured medians: about 135, 90 and 65 ms)
+BUDGETS_MS = {
+    "diagnosis: upload leaf photo": 350,
+    "weather: show region": 300,
+    "ai: run analysis": 250,
+}
+
+
+def leaf_photo(seed):
+    buffer = io.BytesIO()
+    pixels = np.random.default_rng(seed).integers(0, 256, (480, 640, 3), dtype=np.uint8)
+    Image.fromarray(pixels).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+def timed_runs(app_test, interact):
+    """Render the page once (imports, first paint), then time REPEATS interactions"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_string(app_test, default_timeout=TIMEOUT)
+    at.run()
+    timings = []
+    for i in range(REPEATS):
+        interact(at, i)
+        start = time.perf_counter()
+        at.run()
+        timings.append((time.perf_counter() - start) * 1000)
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+    return timings
+
+
+def upload_photo(at, i):
+    at.file_uploader[0].set_value((f"leaf_{i}.jpg", leaf_photo(i), "image/jpeg"))
+
+
+def click_first_button(at, i):
+    at.button[0].click()
+
+
+def main():
+    with MockOWMServer(latency=0) as server, tempfile.TemporaryDirectory() as tmp:
+        os.environ["OWM_API_ROOT"] = server.api_root
+        os.environ["FORECAST_STORE_PATH"] = os.path.join(tmp, "forecasts.sqlite3")
+        os.environ["DIAGNOSIS_CACHE_PATH"] = os.path.join(tmp, "diagnoses.sqlite3")
+        # A missing TFLite model makes the disease page fall back to the image heuristics
+        os.environ["DISEASE_RUNTIME"] = "tflite"
+        os.environ["DISEASE_TFLITE_PATH"] = os.path.join(tmp, "missing.tflite")
+
+        results = {
+            "diagnosis: upload leaf photo": timed_runs("import diseaseai\ndiseaseai.main()", upload_photo),
+            "weather: show region": timed_runs("import weather\nweather.show_weather_page()", click_first_button),
+            "ai: run analysis": timed_runs("import smart_irrigation_ai\nsmart_irrigation_ai.show_ai_results()",
+                                           click_first_button),
+        }
+
+    failed = []
+    for name, timings in results.items():
+        median = statistics.median(timings)
+        budget = BUDGETS_MS[name]
+        status = "ok" if median <= budget else "OVER BUDGET"
+        print(f"{name:30s} median {median:7.1f} ms, max {max(timings):7.1f} ms (budget {budget} ms) {status}")
+        if median > budget:
+            failed.append(name)
+    if failed:
+        sys.exit(f"page latency regression: {', '.join(failed)} over budget")
+    print("page latency check passed")
+
+
+if __name__ == "__main__":
+    main()
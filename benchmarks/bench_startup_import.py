@@ -0,0 +1,97 @@
+"""
+Startup import profile of app.py.
+
+Runs the first paint of app.py (Streamlit's AppTest, default page) in a fresh
+interpreter under -X importtime, and lists the packages imported before the
+page was drawn with their cumulative import time. Three startups are compared:
+
+    eager + TensorFlow   every page module and TensorFlow imported up front
+    eager                every page module imported up front, TensorFlow deferred
+    registry             app.py as is: page modules import on first visit
+
+The eager startups import the modules in the worker before the first paint,
+which is what app.py did before its page registry. Exits non-zero if the
+registry startup imports any heavy module.
+
+Run from the project root:
+    python -m benchmarks.bench_startup_import
+"""
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Imported by the pages but not by Streamlit itself (Streamlit already pulls in pandas, PIL and plotly)
+HEAVY_MODULES = ["tensorflow", "keras", "folium", "streamlit_folium", "matplotlib", "altair"]
+PAGE_MODULES = ["weather", "xarita2", "osimlik", "crop", "diseaseai", "smart_irrigation_ai"]
+TOP_PACKAGES = 8
+
+STARTUPS = {
+    "eager + TensorFlow": ["tensorflow"] + PAGE_MODULES,
+    "eager": PAGE_MODULES,
+    "registry": [],
+}
+
+WORKER = """
+import importlib, json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+for name in %r:
+    importlib.import_module(name)
+at = AppTest.from_file(%r, default_timeout=300)
+at.run()
+print(json.dumps({
+    "first_paint_ms": (time.perf_counter() - start) * 1000,
+    "exception": at.exception[0].message if at.exception else None,
+    "modules": len(sys.modules),
+    "heavy": sorted(m for m in %r if m in sys.modules),
+}))
+"""
+
+
+def import_profile(stderr):
+    """Cumulative import time (ms) of each top-level package from -X importtime output"""
+    packages = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part for part in line[len("import time:"):].split("|"))
+        # Nested imports are indented; only count the outermost one
+        if name.startswith(" " * 2):
+            continue
+        root = name.strip().split(".")[0]
+        packages[root] = packages.get(root, 0) + int(cumulative) / 1000
+    return packages
+
+
+def run_startup(modules):
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1", TF_CPP_MIN_LOG_LEVEL="3")
+    worker = WORKER % (modules, os.path.join(ROOT, "app.py"), HEAVY_MODULES)
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", worker], cwd=ROOT, env=env,
+                             capture_output=True, text=True, check=True)
+    result = json.loads(process.stdout.strip().splitlines()[-1])
+    result["packages"] = import_profile(process.stderr)
+    return result
+
+
+def main():
+    results = {}
+    for name, modules in STARTUPS.items():
+        result = results[name] = run_startup(modules)
+        print(f"{name}: first paint {result['first_paint_ms']:.0f} ms, {result['modules']} modules loaded, "
+              f"heavy: {', '.join(result['heavy']) or 'none'}"
+              + (f", exception: {result['exception']}" if result["exception"] else ""))
+        top = sorted(result["packages"].items(), key=lambda item: -item[1])[:TOP_PACKAGES]
+        for package, ms in top:
+            print(f"    {package:24s} {ms:8.1f} ms")
+
+    eager = results["eager + TensorFlow"]["first_paint_ms"]
+    registry = results["registry"]["first_paint_ms"]
+    print(f"time to first paint: {eager:.0f} ms -> {registry:.0f} ms with the page registry")
+    if results["registry"]["heavy"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
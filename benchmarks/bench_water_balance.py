@@ -0,0 +1,83 @@
+"""
+Root-zone water-balance benchmark: a 180-day season for 10k fields.
+
+Demand comes from the growth stages of sug'orish.csv for each field's crop,
+with random planting dates, starting moisture and season rain. The engine
+fires irrigations on depletion; the same fields are also run with the old
+fixed sugorish_davri interval for comparison (water applied, stress days,
+drainage). Exits non-zero if the season takes longer than the budget.
+
+Run from the project root:
+    python -m benchmarks.bench_water_balance
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+from irrigation_core.crops import osimlik_turlari
+from irrigation_core.water_balance import (
+    WATER_TABLE_CROPS, depletion_from_moisture, root_zone_parameters, simulate_water_balance, stage_demand,
+)
+from irrigation_core.water_table import load_water_table
+
+FIELDS = 10_000
+SEASON_DAYS = 180
+BUDGET_S = 1.0
+WATER_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sug'orish.csv")
+
+
+def make_fields(table, rng):
+    crops = rng.choice(list(WATER_TABLE_CROPS), FIELDS)
+    crop_ids = np.array([table.crop_ids[WATER_TABLE_CROPS[c]] for c in crops])
+    days_after_planting = rng.integers(-30, 30, FIELDS)
+    moisture = rng.uniform(30, 90, FIELDS)
+    rain_mm = np.where(rng.random(SEASON_DAYS) < 0.15, rng.gamma(2.0, 3.0, SEASON_DAYS), 0.0)
+    return crops, crop_ids, days_after_planting, moisture, rain_mm
+
+
+def summary(name, elapsed, result):
+    print(f"{name:16s} {elapsed * 1000:8.1f} ms  "
+          f"{result['irrigation_count'].mean():5.1f} irrigations  "
+          f"{result['irrigation_mm'].sum(axis=1).mean():6.0f} mm applied  "
+          f"{result['stress_days'].mean():5.1f} stress days  "
+          f"{result['drainage_mm'].sum(axis=1).mean():5.0f} mm drained")
+
+
+def main():
+    rng = np.random.default_rng(0)
+    table = load_water_table(WATER_CSV)
+    crops, crop_ids, days_after_planting, moisture, rain_mm = make_fields(table, rng)
+    taw, allowable, refill = root_zone_parameters(crops)
+    initial = depletion_from_moisture(moisture, taw)
+
+    start = time.perf_counter()
+    demand = stage_demand(table, crop_ids, days_after_planting, SEASON_DAYS)
+    demand_s = time.perf_counter() - start
+    start = time.perf_counter()
+    balance = simulate_water_balance(demand, taw, allowable, initial, rain_mm=rain_mm, refill_depletion=refill)
+    balance_s = time.perf_counter() - start
+    print(f"{FIELDS:,} fields x {SEASON_DAYS} days: demand {demand_s * 1000:.1f} ms, "
+          f"water balance {balance_s * 1000:.1f} ms "
+          f"({FIELDS * SEASON_DAYS / (demand_s + balance_s) / 1e6:.1f}M field-days/s, budget {BUDGET_S} s)")
+
+    # The old schedule: refill every sugorish_davri days from a random phase, whatever the soil holds
+    periods = np.array([osimlik_turlari[c]["sugorish_davri"] for c in crops])
+    days = np.arange(SEASON_DAYS)
+    fixed_days = (days[None, :] + rng.integers(0, 12, FIELDS)[:, None]) % periods[:, None] == 0
+    start = time.perf_counter()
+    fixed = simulate_water_balance(demand, taw, allowable, initial, rain_mm=rain_mm, refill_depletion=refill,
+                                   auto_irrigate=False, irrigate_on=fixed_days)
+    fixed_s = time.perf_counter() - start
+
+    print("per field, season averages:")
+    summary("depletion-based", balance_s, balance)
+    summary("fixed interval", fixed_s, fixed)
+
+    if demand_s + balance_s > BUDGET_S:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
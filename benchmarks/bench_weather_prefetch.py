@@ -0,0 +1,52 @@
+"""
+All-region weather prefetch benchmark against the local stub server.
+
+Compares one-request-at-a-time fetching with a fresh connection per call
+(the old weather.py behaviour) against weather_prefetch.prefetch_all, which
+uses a bounded thread pool over a pooled keep-alive session.
+
+Run from the project root:
+    python -m benchmarks.bench_weather_prefetch
+"""
+import os
+import tempfile
+import time
+
+import requests
+
+from benchmarks.mock_owm_server import MockOWMServer
+
+UPSTREAM_LATENCY = 0.1
+
+
+def sequential_unpooled(weather_api):
+    start = time.perf_counter()
+    for region, (city, _, _) in weather_api.UZB_CITIES.items():
+        for url in (weather_api.BASE_URL, weather_api.FORECAST_URL):
+            requests.get(url, params={"q": city + ",UZ", "appid": weather_api.API_KEY}).json()
+    return time.perf_counter() - start
+
+
+def main():
+    with MockOWMServer(latency=UPSTREAM_LATENCY) as server, tempfile.TemporaryDirectory() as tmp:
+        os.environ["OWM_API_ROOT"] = server.api_root
+        import weather_api
+        import weather_prefetch
+        from forecast_store import ForecastStore
+
+        regions = len(weather_api.UZB_CITIES)
+        print(f"{regions} regions, 2 requests each, {UPSTREAM_LATENCY * 1000:.0f} ms upstream latency")
+
+        elapsed = sequential_unpooled(weather_api)
+        print(f"sequential, new connection per call: {elapsed:6.2f} s, {server.connections} connections")
+
+        store = ForecastStore(os.path.join(tmp, "forecasts.sqlite3"))
+        for workers in (4, 8, 16):
+            before = server.connections
+            report = weather_prefetch.prefetch_all(store=store, max_workers=workers)
+            print(f"prefetch_all, {workers:2d} workers, pooled session: {report['wall_time']:6.2f} s, "
+                  f"{server.connections - before} new connections, {len(report['failed'])} failed")
+
+
+if __name__ == "__main__":
+    main()
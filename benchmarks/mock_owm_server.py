@@ -0,0 +1,113 @@
+"""
+Local stub of the OpenWeatherMap endpoints used by weather_api.
+
+Serves synthetic /weather and /forecast responses with an optional artificial
+latency and counts the requests it receives. Point weather_api at it with
+OWM_API_ROOT=<server.api_root> (set before weather_api is imported).
+
+    with MockOWMServer(latency=0.2) as server:
+        os.environ["OWM_API_ROOT"] = server.api_root
+"""
+import json
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def _seed(city):
+    return zlib.crc32(city.encode("utf-8")) % 1000
+
+
+def current_payload(city):
+    seed = _seed(city)
+    return {
+        "name": city,
+        "main": {"temp": 20 + seed % 15, "feels_like": 19 + seed % 15, "humidity": 30 + seed % 50,
+                 "pressure": 1000 + seed % 30},
+        "wind": {"speed": 1 + (seed % 70) / 10},
+        "weather": [{"description": "ochiq osmon", "icon": "01d"}],
+    }
+
+
+def forecast_payload(city, count=40):
+    seed = _seed(city)
+    start = datetime.now().replace(minute=0, second=0, microsecond=0)
+    start = start - timedelta(hours=start.hour % 3)
+    entries = []
+    for i in range(count):
+        slot = start + timedelta(hours=3 * i)
+        entries.append({
+            "dt": int(slot.timestamp()),
+            "dt_txt": slot.strftime("%Y-%m-%d %H:%M:%S"),
+            "main": {"temp": 15 + (seed + 7 * i) % 20, "humidity": 30 + (seed + 11 * i) % 60,
+                     "temp_min": 12 + (seed + 7 * i) % 20, "temp_max": 18 + (seed + 7 * i) % 20,
+                     "pressure": 1000 + (seed + i) % 30},
+            "wind": {"speed": 1 + ((seed + 3 * i) % 80) / 10},
+            "pop": ((seed + 13 * i) % 100) / 100,
+            "weather": [{"description": "bulutli", "icon": "03d"}],
+        })
+    return {"cod": "200", "cnt": count, "list": entries}
+
+
+class MockOWMServer:
+    """Threaded stub server; use as a context manager"""
+
+    def __init__(self, latency=0.0, host="127.0.0.1", port=0):
+        self.latency = latency
+        self.hits = {"weather": 0, "forecast": 0}
+        self.connections = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                kind = url.path.rstrip("/").rsplit("/", 1)[-1]
+                city = parse_qs(url.query).get("q", ["Tashkent,UZ"])[0].split(",")[0]
+                if kind == "weather":
+                    body = current_payload(city)
+                elif kind == "forecast":
+                    body = forecast_payload(city)
+                else:
+                    self.send_error(404)
+                    return
+                with server._lock:
+                    server.hits[kind] += 1
+                if server.latency:
+                    time.sleep(server.latency)
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def api_root(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/data/2.5"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
@@ -1,10 +1,11 @@
 import streamlit as st
-import csv
 import datetime
-from datetime import timedelta
 import pandas as pd
 import os
 
+from irrigation_core.crops import suv_talabini_hisoblash, davomiylikni_hisoblash, keyingi_sugorish_kuni
+from irrigation_core.water_table import WaterTable, load_water_table
+
 # Ekin bosqichlari o'zbek tiliga tarjimasi
 bosqich_tarjimasi = {
     "Germination": "Unib chiqish",
@@ -88,10 +89,8 @@ ekin_tarjimasi = {
 }
 
 
-def csv_fayldan_oqish(fayl_nomi="sug'orish.csv"):
-    """CSV fayldan ma'lumotlarni o'qish"""
-    ekinlar_malumoti = {}
-
+def suv_jadvalini_olish(fayl_nomi="sug'orish.csv"):
+    """Sug'orish jadvalini kompilyatsiya qilingan (raqamli) ko'rinishda olish"""
     try:
         # First try to find the file in the current directory
         if os.path.exists(fayl_nomi):
@@ -102,39 +101,19 @@ def csv_fayldan_oqish(fayl_nomi="sug'orish.csv"):
         # As a fallback, we'll use demo data
         else:
             # If file not found, return some demo data
-            return get_demo_data()
-
-        with open(path, 'r', encoding='utf-8') as fayl:
-            csv_reader = csv.reader(fayl)
-            joriy_ekin = None
-
-            for qator in csv_reader:
-                if len(qator) >= 4:  # Kamida 4 ta ustun bo'lishi kerak
-                    if qator[1] and qator[1] not in ["Crop", ""]:  # Ekin nomi bo'lsa
-                        joriy_ekin = qator[1]
-                        ekinlar_malumoti[joriy_ekin] = {"bosqichlar": {}}
-
-                    if joriy_ekin and qator[2] and qator[2] != "Growth Stage":  # O'sish bosqichi bo'lsa
-                        # Suv talabi va davomiyligi (masalan: "5-7 mm/day (5-10 days)")
-                        suv_malumoti = qator[3] if len(qator) > 3 else ""
-
-                        if suv_malumoti:
-                            # Suv talabini ajratib olish (masalan: "5-7 mm/day")
-                            suv_talabi = suv_malumoti.split("(")[0].strip()
-
-                            # Davomiylikni ajratib olish (masalan: "5-10 days")
-                            davomiylik = suv_malumoti.split("(")[1].replace(")",
-                                                                            "").strip() if "(" in suv_malumoti else ""
-
-                            ekinlar_malumoti[joriy_ekin]["bosqichlar"][qator[2]] = {
-                                "suv_talabi": suv_talabi,
-                                "davomiylik": davomiylik
-                            }
-        return ekinlar_malumoti
+            return WaterTable(get_demo_data())
+
+        # Jadval bir marta o'qiladi va fayl o'zgarmaguncha keshda saqlanadi
+        return load_water_table(path)
     except Exception as e:
         st.error(f"CSV faylni o'qishda xatolik: {e}")
         # If there's an error, return demo data
-        return get_demo_data()
+        return WaterTable(get_demo_data())
+
+
+def csv_fayldan_oqish(fayl_nomi="sug'orish.csv"):
+    """CSV fayldan ma'lumotlarni o'qish"""
+    return suv_jadvalini_olish(fayl_nomi).ekinlar_malumoti
 
 
 def get_demo_data():
@@ -171,42 +150,6 @@ def get_demo_data():
     }
 
 
-def suv_talabini_hisoblash(suv_talabi, maydoni):
-    """Suv talabini hisoblash (m³)"""
-    # suv_talabi format: "5-7 mm/day"
-    if "-" in suv_talabi:
-        min_suv, max_suv = map(float, suv_talabi.split(" ")[0].split("-"))
-        ortacha_suv = (min_suv + max_suv) / 2  # mm/kun
-    else:
-        ortacha_suv = float(suv_talabi.split(" ")[0])  # mm/kun
-
-    # mm/kun -> m³/kun/gektar (1 mm = 10 m³/gektar)
-    kunlik_suv_m3_gektar = ortacha_suv * 10
-
-    # Umumiy suv hajmi (m³)
-    jami_suv_m3 = kunlik_suv_m3_gektar * (maydoni / 10000)  # maydoni m² dan gektarga o'tkaziladi
-
-    return jami_suv_m3
-
-
-def davomiylikni_hisoblash(davomiylik):
-    """Davomiylikni kunlarda hisoblash"""
-    # davomiylik format: "5-10 days"
-    if "-" in davomiylik:
-        min_kun, max_kun = map(int, davomiylik.split(" ")[0].split("-"))
-        ortacha_kun = (min_kun + max_kun) / 2
-    else:
-        ortacha_kun = int(davomiylik.split(" ")[0])
-
-    return ortacha_kun
-
-
-def keyingi_sugorish_kuni(oxirgi_sugorish_kuni, bosqich_davomiyligi):
-    """Keyingi sug'orish kunini hisoblash"""
-    keyingi_sana = oxirgi_sugorish_kuni + timedelta(days=bosqich_davomiyligi)
-    return keyingi_sana
-
-
 def main():
     # Streamlit dasturi sarlavhasi
     st.title("Ekinlarni Sug'orish Dasturi")
@@ -221,7 +164,8 @@ def main():
     """, unsafe_allow_html=True)
 
     # CSV fayldan ma'lumotlarni o'qish
-    ekinlar_malumoti = csv_fayldan_oqish()
+    suv_jadvali = suv_jadvalini_olish()
+    ekinlar_malumoti = suv_jadvali.ekinlar_malumoti
 
     # Agar ma'lumotlar mavjud bo'lsa
     if ekinlar_malumoti:
@@ -263,8 +207,9 @@ def main():
             davomiylik = bosqich_malumoti["davomiylik"]
 
             # Hisoblash
-            kunlik_suv = suv_talabini_hisoblash(suv_talabi, maydon)
-            bosqich_davomiyligi = davomiylikni_hisoblash(davomiylik)
+            qator = suv_jadvali.row(tanlangan_ekin, tanlangan_bosqich)
+            kunlik_suv = float(suv_jadvali.daily_water_m3(qator, maydon))
+            bosqich_davomiyligi = float(suv_jadvali.stage_days(qator))
             keyingi_sana = keyingi_sugorish_kuni(oxirgi_sugorish, bosqich_davomiyligi)
 
             # Natijalarni ko'rsatish
@@ -0,0 +1,168 @@
+import contextlib
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Default location of the on-disk tier (override with DIAGNOSIS_CACHE_PATH)
+DEFAULT_CACHE_PATH = os.environ.get(
+    "DIAGNOSIS_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "diagnoses.sqlite3")
+)
+
+# Diagnoses kept in process memory
+MEMORY_ENTRIES = 1024
+
+# Upper bound of the stored rows on disk; least recently used rows are evicted beyond it
+DISK_MAX_BYTES = 16 * 1024 * 1024
+
+# Approximate per-row overhead of SQLite added to the stored key and code
+ROW_OVERHEAD_BYTES = 48
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def diagnosis_key(image_bytes, model_version):
+    """SHA-256 of the model version and the raw image bytes"""
+    digest = hashlib.sha256(model_version.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(image_bytes)
+    return digest.hexdigest()
+
+
+class DiagnosisCache:
+    """
+    Two-tier cache of (disease code, confidence) keyed by image content and model version.
+    The memory tier is a per-process LRU; the SQLite tier is shared by every worker and
+    evicts least recently used rows once their total size passes disk_max_bytes.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, memory_entries=MEMORY_ENTRIES, disk_max_bytes=DISK_MAX_BYTES):
+        self.path = path
+        self.memory_entries = memory_entries
+        self.disk_max_bytes = disk_max_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._metrics = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "saved_ms": 0.0, "compute_ms": 0.0}
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS diagnoses (
+                    key TEXT PRIMARY KEY,
+                    code TEXT NOT NULL,
+                    confidence REAL NOT NULL,
+                    compute_ms REAL NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS diagnoses_last_used ON diagnoses (last_used)")
+
+    @contextlib.contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _remember(self, key, entry):
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key):
+        """Return (code, confidence, compute_ms) from memory or disk, or None"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self._metrics["memory_hits"] += 1
+                self._metrics["saved_ms"] += entry[2]
+                return entry
+
+        with self._connect() as conn:
+            row = conn.execute("SELECT code, confidence, compute_ms FROM diagnoses WHERE key = ?",
+                               (key,)).fetchone()
+            if row is not None:
+                conn.execute("UPDATE diagnoses SET last_used = ? WHERE key = ?", (time.time(), key))
+        if row is None:
+            return None
+
+        entry = (row[0], row[1], row[2])
+        self._remember(key, entry)
+        with self._lock:
+            self._metrics["disk_hits"] += 1
+            self._metrics["saved_ms"] += entry[2]
+        return entry
+
+    def put(self, key, code, confidence, compute_ms):
+        """Store a diagnosis in both tiers and evict old disk rows beyond disk_max_bytes"""
+        entry = (code, float(confidence), float(compute_ms))
+        self._remember(key, entry)
+        size = len(key) + len(code.encode("utf-8")) + ROW_OVERHEAD_BYTES
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO diagnoses (key, code, confidence, compute_ms, size, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, entry[0], entry[1], entry[2], size, time.time())
+            )
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM diagnoses").fetchone()[0]
+            if total > self.disk_max_bytes:
+                # Drop the least recently used rows until the total fits again
+                conn.execute(
+                    "DELETE FROM diagnoses WHERE key IN ("
+                    "SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY last_used DESC) AS kept "
+                    "FROM diagnoses) WHERE kept > ?)",
+                    (self.disk_max_bytes,)
+                )
+
+    def diagnose(self, image_bytes, compute, model_version):
+        """
+        Cached diagnosis of an uploaded image
+        Args:
+            image_bytes: Raw bytes of the uploaded file
+            compute: Callable() returning (code, confidence); only called on a miss
+            model_version: Identifier of the model (see disease_model.model_version)
+        Returns:
+            (code, confidence) tuple
+        """
+        key = diagnosis_key(image_bytes, model_version)
+        entry = self.get(key)
+        if entry is not None:
+            return entry[0], entry[1]
+
+        start = time.perf_counter()
+        code, confidence = compute()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self._metrics["misses"] += 1
+            self._metrics["compute_ms"] += elapsed_ms
+        self.put(key, code, confidence, elapsed_ms)
+        return code, float(confidence)
+
+    def metrics(self):
+        """Hit counts per tier, hit rate and milliseconds of inference saved by hits"""
+        with self._lock:
+            metrics = dict(self._metrics)
+        lookups = metrics["memory_hits"] + metrics["disk_hits"] + metrics["misses"]
+        metrics["lookups"] = lookups
+        metrics["hit_rate"] = (metrics["memory_hits"] + metrics["disk_hits"]) / lookups if lookups else 0.0
+        return metrics
+
+
+def get_cache():
+    """Process-wide diagnosis cache, created on first use"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = DiagnosisCache()
+    return _cache
@@ -0,0 +1,65 @@
+import argparse
+import os
+
+import numpy as np
+
+from disease_model import TFLITE_INT8_MODEL_PATH, TFLITE_MODEL_PATH, INPUT_SIZE, build_model, preprocess
+from disease_inference import preprocess_images
+
+# Calibration images used for int8 quantization
+CALIBRATION_SAMPLES = 100
+
+
+def representative_images(calibration_dir=None, samples=CALIBRATION_SAMPLES):
+    """
+    Preprocessed images for int8 calibration: leaf photos from a directory, or random
+    pixels when no directory is given (quantization accuracy is much better with real photos)
+    """
+    if calibration_dir:
+        names = sorted(name for name in os.listdir(calibration_dir)
+                       if name.lower().endswith((".jpg", ".jpeg", ".png")))[:samples]
+        images = preprocess_images([os.path.join(calibration_dir, name) for name in names])
+    else:
+        rng = np.random.default_rng(0)
+        images = rng.integers(0, 256, (samples,) + INPUT_SIZE[::-1] + (3,), dtype=np.uint8)
+    return preprocess(images)
+
+
+def export_tflite(model, output_path, int8=False, calibration_dir=None):
+    """
+    Convert a Keras model to a TFLite file
+    Args:
+        model: Keras model
+        output_path: Where to write the .tflite file
+        int8: Quantize weights and activations to int8 (inputs and outputs stay float)
+        calibration_dir: Folder of leaf photos used to calibrate int8 ranges
+    Returns:
+        Size of the written file in bytes
+    """
+    import tensorflow as tf
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    if int8:
+        calibration = representative_images(calibration_dir)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = lambda: ([image[None]] for image in calibration)
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+
+    content = converter.convert()
+    with open(output_path, "wb") as f:
+        f.write(content)
+    return len(content)
+
+
+# Buyruq qatoridan ishga tushirish: python disease_export.py [--int8] [--calibration-dir DIR]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Kasallik modelini TFLite formatiga eksport qilish")
+    parser.add_argument("--output", help="Natija fayli (standart: DISEASE_TFLITE_PATH yoki int8 yo'li)")
+    parser.add_argument("--int8", action="store_true", help="int8 kvantlangan variantini yaratish")
+    parser.add_argument("--calibration-dir", help="int8 kalibrlash uchun barg rasmlari papkasi")
+    args = parser.parse_args()
+
+    keras_model, source = build_model("keras")
+    output = args.output or (TFLITE_INT8_MODEL_PATH if args.int8 else TFLITE_MODEL_PATH)
+    size = export_tflite(keras_model, output, int8=args.int8, calibration_dir=args.calibration_dir)
+    print(f"{source} -> {output} ({size / 1024 / 1024:.1f} MB)")
@@ -0,0 +1,222 @@
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from disease_model import INPUT_SIZE, get_model, preprocess
+
+# Images per model call; the last batch is padded so the model always sees the same shape
+DEFAULT_BATCH_SIZE = 32
+
+# Threads used to decode and resize images (PIL releases the GIL while doing so)
+PREPROCESS_WORKERS = min(8, os.cpu_count() or 1)
+
+# Model predictions below this confidence fall back to the image heuristics
+CONFIDENCE_THRESHOLD = 0.5
+
+# Simplified mapping from ImageNet classes to plant diseases
+IMAGENET_DISEASES = {
+    970: "pomidor_barg_dog", 971: "pomidor_barg_dog", 972: "pomidor_barg_dog",
+    973: "pomidor_fitoftoroz", 974: "pomidor_fitoftoroz", 975: "pomidor_fitoftoroz",
+    980: "kartoshka_fitoftoroz", 981: "kartoshka_fitoftoroz", 982: "kartoshka_fitoftoroz",
+    985: "bodring_un_shudring", 986: "bodring_un_shudring", 987: "bodring_un_shudring",
+    990: "uzum_mildyu", 991: "uzum_mildyu", 992: "uzum_mildyu",
+}
+
+
+# Pixels processed at a time by image_features; small enough for the temporaries to stay in cache
+FEATURE_CHUNK_PIXELS = 1 << 16
+
+
+def image_features(img_rgb):
+    """
+    Feature vector of the backup analyzer, accumulated in one pass over cache-sized
+    chunks of the image instead of a separate full-image pass per feature
+    Args:
+        img_rgb: (H, W, 3) uint8 RGB array
+    Returns:
+        Dictionary with channel means, standard deviations and the ratios of
+        dark, white, reddish-brown and yellowish pixels
+    """
+    img_rgb = np.asarray(img_rgb)[:, :, :3]
+    if img_rgb.dtype != np.uint8:
+        return _image_features_direct(img_rgb)
+
+    pixels = img_rgb.reshape(-1, 3)
+    n = len(pixels)
+    sums = np.zeros(3)
+    squares = np.zeros(3)
+    dark = white = reddish_brown = yellowish = 0
+    for start in range(0, n, FEATURE_CHUNK_PIXELS):
+        # Planar copy of the chunk so every channel is contiguous
+        planes = np.ascontiguousarray(pixels[start:start + FEATURE_CHUNK_PIXELS].T)
+        values = planes.astype(np.float64)
+        sums += values.sum(axis=1)
+        squares += np.einsum("ij,ij->i", values, values)
+
+        red, green, blue = planes
+        dark += np.count_nonzero(red < 50)
+        white += np.count_nonzero(planes > 200)
+        reddish_brown += np.count_nonzero((red > 120) & (green < 100) & (blue < 80))
+        yellowish += np.count_nonzero((red > 180) & (green > 180) & (blue < 100))
+
+    # Sums of uint8 values are exact in float64, so the variances can be formed in integers
+    total_sum, total_squares = int(sums.sum()), int(squares.sum())
+    green_sum, green_squares = int(sums[1]), int(squares[1])
+    return {
+        "mean_r": sums[0] / n,
+        "mean_g": sums[1] / n,
+        "mean_b": sums[2] / n,
+        "std_all": np.sqrt((3 * n * total_squares - total_sum * total_sum) / (3 * n) ** 2),
+        "std_g": np.sqrt((n * green_squares - green_sum * green_sum) / n ** 2),
+        "dark_ratio": dark / n,
+        "white_ratio": white / (3 * n),
+        "reddish_brown_ratio": reddish_brown / n,
+        "yellowish_ratio": yellowish / n,
+    }
+
+
+def _image_features_direct(img_rgb):
+    """Same features computed channel by channel, for images that are not uint8"""
+    red, green, blue = img_rgb[:, :, 0], img_rgb[:, :, 1], img_rgb[:, :, 2]
+    return {
+        "mean_r": np.mean(red),
+        "mean_g": np.mean(green),
+        "mean_b": np.mean(blue),
+        "std_all": np.std(img_rgb),
+        "std_g": np.std(green),
+        "dark_ratio": np.mean(red < 50),
+        "white_ratio": np.mean(img_rgb > 200),
+        "reddish_brown_ratio": np.mean((red > 120) & (green < 100) & (blue < 80)),
+        "yellowish_ratio": np.mean((red > 180) & (green > 180) & (blue < 100)),
+    }
+
+
+def classify_features(features):
+    """Backup decision rules applied to an image_features vector; returns (code, confidence)"""
+    has_dark_spots = features["dark_ratio"] > 0.05
+    has_white_powder = features["white_ratio"] > 0.15
+    greenness = features["mean_g"] / (features["mean_r"] + features["mean_b"] + 1e-10)
+    reddish_brown = features["reddish_brown_ratio"] > 0.08
+    yellowish = features["yellowish_ratio"] > 0.08
+    texture_variance = features["std_all"]
+    discoloration = features["std_g"] > 50
+
+    # Improved disease detection logic with more sensitivity
+    if has_dark_spots and discoloration:
+        return "pomidor_fitoftoroz", 0.85
+    if has_white_powder and greenness > 1.0:
+        return "bodring_un_shudring", 0.88
+    if reddish_brown and texture_variance > 50:
+        return "pomidor_barg_dog", 0.87
+    if yellowish and texture_variance > 45:
+        return "galla_zang", 0.86
+    if features["mean_g"] < 100 and texture_variance > 60:
+        return "kartoshka_fitoftoroz", 0.84
+    if has_dark_spots and features["mean_g"] < 120:
+        return "uzum_mildyu", 0.83
+    if features["mean_r"] > 150 and features["mean_g"] < 140:
+        return "pomidor_bakterial_dog", 0.82
+
+    # Lower the threshold for healthy plants
+    # This makes the system more sensitive to detecting diseases
+    if greenness > 1.3 and texture_variance < 40 and not has_dark_spots and not has_white_powder:
+        return "sog_osimlik", 0.95
+    # If uncertain but there are some abnormalities, guess the most common disease
+    return "pomidor_barg_dog", 0.70
+
+
+def analyze_image_backup(img_rgb):
+    """Backup analysis method when model is not available or confident"""
+    return classify_features(image_features(img_rgb))
+
+
+def decode_and_resize(source, size=INPUT_SIZE):
+    """
+    Load one image (PIL image, raw bytes or file path) as a (H, W, 3) uint8 RGB array
+    resized to the model input size
+    """
+    if isinstance(source, Image.Image):
+        img = source
+    elif isinstance(source, (bytes, bytearray)):
+        img = Image.open(io.BytesIO(source))
+    else:
+        img = Image.open(source)
+    return np.asarray(img.convert("RGB").resize(size))
+
+
+def preprocess_images(sources, workers=PREPROCESS_WORKERS):
+    """Decode and resize many images in parallel into one (N, H, W, 3) uint8 array"""
+    if workers and workers > 1 and len(sources) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            arrays = list(pool.map(decode_and_resize, sources))
+    else:
+        arrays = [decode_and_resize(source) for source in sources]
+    return np.stack(arrays) if arrays else np.empty((0,) + INPUT_SIZE[::-1] + (3,), dtype=np.uint8)
+
+
+def _report(progress, stage):
+    if progress is not None:
+        progress(stage)
+
+
+def predict_batches(model, images_rgb, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    """
+    Run preprocessed images through the model in fixed-size batches
+    Args:
+        model: Keras model
+        images_rgb: (N, H, W, 3) uint8 array
+        batch_size: Images per model call (the last batch is zero-padded)
+        progress: Optional callable(stage) told when each batch enters "preprocess" and "infer"
+    Returns:
+        (N, classes) prediction array
+    """
+    outputs = []
+    for start in range(0, len(images_rgb), batch_size):
+        _report(progress, "preprocess")
+        batch = preprocess(images_rgb[start:start + batch_size])
+        count = len(batch)
+        if count < batch_size:
+            batch = np.concatenate([batch, np.zeros((batch_size - count,) + batch.shape[1:], dtype=batch.dtype)])
+        _report(progress, "infer")
+        outputs.append(np.asarray(model.predict_on_batch(batch))[:count])
+    return np.concatenate(outputs)
+
+
+def diagnose_batch(sources, model=None, batch_size=DEFAULT_BATCH_SIZE, workers=PREPROCESS_WORKERS, progress=None):
+    """
+    Diagnose many leaf images at once
+    Args:
+        sources: List of PIL images, raw image bytes or file paths
+        model: Keras model (defaults to the shared model from disease_model)
+        batch_size: Images per model call
+        workers: Threads used for decoding and resizing
+        progress: Optional callable(stage) called as the pipeline reaches each stage:
+            "decode", "preprocess", "infer" and "classify"
+    Returns:
+        List of (disease code, confidence) tuples in input order
+    """
+    _report(progress, "decode")
+    images_rgb = preprocess_images(sources, workers)
+    if len(images_rgb) == 0:
+        return []
+
+    model = get_model() if model is None else model
+    if model is None:
+        _report(progress, "classify")
+        return [analyze_image_backup(img_rgb) for img_rgb in images_rgb]
+
+    predictions = predict_batches(model, images_rgb, batch_size, progress)
+    _report(progress, "classify")
+    top_classes = predictions.argmax(axis=1)
+    top_scores = predictions.max(axis=1)
+
+    results = []
+    for img_rgb, top_class, score in zip(images_rgb, top_classes.tolist(), top_scores.tolist()):
+        if score > CONFIDENCE_THRESHOLD and top_class in IMAGENET_DISEASES:
+            results.append((IMAGENET_DISEASES[top_class], score))
+        else:
+            results.append(analyze_image_backup(img_rgb))
+    return results
@@ -0,0 +1,224 @@
+import os
+import threading
+import time
+
+# Trained plant disease model; MobileNetV2 (ImageNet) is used when it is missing
+DISEASE_MODEL_PATH = os.environ.get("DISEASE_MODEL_PATH", "plant_disease_model.h5")
+
+# Exported TFLite models (see disease_export.py), run without importing TensorFlow
+TFLITE_MODEL_PATH = os.environ.get("DISEASE_TFLITE_PATH", "plant_disease_model.tflite")
+TFLITE_INT8_MODEL_PATH = os.environ.get("DISEASE_TFLITE_INT8_PATH", "plant_disease_model_int8.tflite")
+USE_INT8 = os.environ.get("DISEASE_MODEL_INT8") == "1"
+
+# "auto" uses an exported TFLite model when present, "tflite" requires it, "keras" never uses it
+RUNTIME = os.environ.get("DISEASE_RUNTIME", "auto")
+
+# Input size of the fallback model
+INPUT_SIZE = (224, 224)
+
+_lock = threading.Lock()
+_model = None
+_loaded = False
+_stats = {
+    "loaded": False,
+    "source": None,
+    "load_seconds": None,
+    "warm_up_seconds": None,
+    "rss_before_mb": None,
+    "rss_after_mb": None,
+    "error": None,
+}
+
+
+def current_rss_mb():
+    """Resident memory of this process in MB (None where it cannot be read)"""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KB, macOS bytes
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except (ImportError, OSError):
+        return None
+
+
+def preprocess(img_array):
+    """Scale RGB pixels to [-1, 1] like tf.keras.applications.mobilenet_v2.preprocess_input"""
+    import numpy as np
+
+    return np.asarray(img_array, dtype=np.float32) / 127.5 - 1.0
+
+
+def _interpreter_class():
+    """Slimmest available TFLite interpreter: LiteRT, then tflite_runtime, then TensorFlow itself"""
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+    except ImportError:
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+            Interpreter = tf.lite.Interpreter
+    return Interpreter
+
+
+class TFLiteModel:
+    """
+    TFLite model with the small part of the Keras model API used here
+    (predict_on_batch, predict and input_shape). Quantized inputs and outputs are
+    converted to and from float, so callers always pass preprocessed float images.
+    """
+
+    def __init__(self, path, num_threads=None):
+        self.path = path
+        self.interpreter = _interpreter_class()(model_path=path, num_threads=num_threads or os.cpu_count())
+        self.interpreter.allocate_tensors()
+        self._lock = threading.Lock()
+        self._read_details()
+        self.input_shape = (None,) + tuple(int(dim) for dim in self._input["shape"][1:])
+
+    def _read_details(self):
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+
+    def predict_on_batch(self, batch):
+        import numpy as np
+
+        batch = np.asarray(batch, dtype=np.float32)
+        # The interpreter is not thread-safe, and every Streamlit session shares this instance
+        with self._lock:
+            if self._input["shape"][0] != len(batch):
+                self.interpreter.resize_tensor_input(self._input["index"], batch.shape)
+                self.interpreter.allocate_tensors()
+                self._read_details()
+
+            dtype = self._input["dtype"]
+            if dtype != np.float32:
+                scale, zero_point = self._input["quantization"]
+                limits = np.iinfo(dtype)
+                batch = np.clip(np.round(batch / scale + zero_point), limits.min, limits.max).astype(dtype)
+            self.interpreter.set_tensor(self._input["index"], batch)
+            self.interpreter.invoke()
+            output = self.interpreter.get_tensor(self._output["index"])
+
+            if output.dtype != np.float32:
+                scale, zero_point = self._output["quantization"]
+                output = (output.astype(np.float32) - zero_point) * scale
+        return output
+
+    def predict(self, batch, verbose=0):
+        return self.predict_on_batch(batch)
+
+
+def build_model(runtime=None):
+    """
+    Load the exported TFLite model when available, otherwise the trained Keras model,
+    or MobileNetV2 with ImageNet weights as a last fallback
+    Args:
+        runtime: "auto", "tflite" or "keras" (defaults to DISEASE_RUNTIME)
+    Returns:
+        (model, source) tuple
+    """
+    runtime = runtime or RUNTIME
+    if runtime in ("auto", "tflite"):
+        tflite_path = TFLITE_INT8_MODEL_PATH if USE_INT8 else TFLITE_MODEL_PATH
+        if os.path.exists(tflite_path):
+            return TFLiteModel(tflite_path), tflite_path
+        if runtime == "tflite":
+            raise FileNotFoundError(f"TFLite model topilmadi: {tflite_path}")
+
+    import tensorflow as tf
+
+    if os.path.exists(DISEASE_MODEL_PATH):
+        try:
+            return tf.keras.models.load_model(DISEASE_MODEL_PATH), DISEASE_MODEL_PATH
+        except Exception:
+            pass
+    model = tf.keras.applications.MobileNetV2(
+        weights='imagenet',
+        input_shape=INPUT_SIZE + (3,),
+        include_top=True
+    )
+    return model, "MobileNetV2"
+
+
+def _warm_up(model):
+    """Run one prediction so the first real diagnosis does not pay for graph tracing"""
+    import numpy as np
+
+    shape = tuple(dim or 1 for dim in model.input_shape)
+    model.predict_on_batch(np.zeros(shape, dtype=np.float32))
+
+
+def get_model():
+    """
+    Process-wide disease model, loaded lazily on first call and shared by every session
+    Returns:
+        Keras model, or None if it could not be loaded (the image heuristics are used instead)
+    """
+    global _model, _loaded
+    if _loaded:
+        return _model
+
+    with _lock:
+        if _loaded:
+            return _model
+
+        _stats["rss_before_mb"] = current_rss_mb()
+        start = time.perf_counter()
+        try:
+            model, source = build_model()
+            _stats["source"] = source
+            _stats["load_seconds"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            _warm_up(model)
+            _stats["warm_up_seconds"] = time.perf_counter() - start
+            _model = model
+        except Exception as e:
+            _stats["load_seconds"] = time.perf_counter() - start
+            _stats["error"] = str(e)
+            _model = None
+
+        _stats["rss_after_mb"] = current_rss_mb()
+        _stats["loaded"] = _model is not None
+        _loaded = True
+    return _model
+
+
+def preload_in_background():
+    """Start loading the model in a daemon thread (no-op once it is loaded)"""
+    if _loaded:
+        return None
+    thread = threading.Thread(target=get_model, name="disease-model-preload", daemon=True)
+    thread.start()
+    return thread
+
+
+def model_version():
+    """
+    Identifier of the loaded model: the runtime and the source get_model() actually loaded
+    ("heuristic" when it returned None) plus the model file's size and modification time,
+    so cached diagnoses are not reused after the model file is replaced or when a different
+    model (or the image heuristics) produced them
+    """
+    source = _stats["source"] if get_model() is not None else "heuristic"
+    if os.path.exists(source):
+        info = os.stat(source)
+        return f"{RUNTIME}:{source}:{info.st_size}:{info.st_mtime_ns}"
+    return f"{RUNTIME}:{source}"
+
+
+def model_stats():
+    """Load time, warm-up time, memory before/after loading and model source"""
+    stats = dict(_stats)
+    if stats["rss_before_mb"] is not None and stats["rss_after_mb"] is not None:
+        stats["rss_delta_mb"] = stats["rss_after_mb"] - stats["rss_before_mb"]
+    return stats
@@ -1,13 +1,47 @@
 import streamlit as st
 import numpy as np
-import tensorflow as tf
-from tensorflow.keras.preprocessing import image
-from PIL import Image
-import io
 import pandas as pd
-import matplotlib.pyplot as plt
 import plotly.express as px
-import time
+
+from disease_model import get_model, model_stats, model_version
+from disease_inference import diagnose_batch
+from diagnosis_cache import get_cache
+from irrigation_core.disease_kb import load_disease_kb
+
+
+# Barg rasmini model (yoki zaxira algoritm) yordamida tahlil qilish
+def analyze_plant_image(img, model):
+    try:
+        return diagnose_batch([img], model, batch_size=1, workers=1)[0]
+    except Exception as e:
+        st.error(f"Error analyzing image: {str(e)}")
+        return "sog_osimlik", 0.75
+
+
+# Tahlil bosqichlari: progress foizi va holat matni (sun'iy kutishsiz, haqiqiy bosqichlarga bog'langan)
+TAHLIL_BOSQICHLARI = {
+    "lookup": (10, "Kesh tekshirilmoqda..."),
+    "decode": (25, "Rasm o'qilmoqda..."),
+    "preprocess": (45, "Rasm tayyorlanmoqda..."),
+    "infer": (65, "Model tahlil qilmoqda..."),
+    "classify": (85, "Natija aniqlanmoqda..."),
+    "knowledge": (95, "Kasallik ma'lumotlari olinmoqda..."),
+}
+
+
+# Yuklangan rasm tahlili: bir xil rasm va model uchun natija keshdan olinadi (dekodlash va model chaqirilmaydi)
+def diagnose_uploaded_image(image_data, model, progress=None):
+    try:
+        if progress is not None:
+            progress("lookup")
+        return get_cache().diagnose(
+            image_data,
+            lambda: diagnose_batch([image_data], model, batch_size=1, workers=1, progress=progress)[0],
+            model_version()
+        )
+    except Exception as e:
+        st.error(f"Error analyzing image: {str(e)}")
+        return "sog_osimlik", 0.75
 
 
 # O'simlik kasalliklarini aniqlash va davolash tizimi asosiy funksiyasi
@@ -75,124 +109,6 @@ def main():
     </style>
     """, unsafe_allow_html=True)
 
-    # O'simlik kasalliklari ma'lumotlar bazasi
-    plant_diseases = {
-        "pomidor": {
-            "name": "Pomidor (Solanum lycopersicum)",
-            "description": "Istemol qilinadigan mevasi uchun ekiladigan ko'p yillik o'simlik.",
-            "common_diseases": ["pomidor_fitoftoroz", "pomidor_barg_dog", "pomidor_bakterial_dog",
-                                "pomidor_virus_mozaika", "pomidor_bakterial_rak", "pomidor_fuzarioz"],
-            "care_tips": "Quyoshli joylarda yetishtiring, muntazam sug'oring, lekin barglarni ho'llamang.",
-            "treatment": "Kasallik turiga qarab fungitsid, bakteritsid yoki insektitsidlar bilan davolash tavsiya etiladi. Kasallangan qismlarni kesib tashlang.",
-            "fertilizers": ["NPK 10-10-10", "Kalsiy nitrat", "Magniy sulfat", "Organik o'g'it"],
-            "prevention": "Kasallangan o'simlik qoldiqlarini yo'q qiling. Almashlab ekishga rioya qiling. Barglarni ho'llamasdan, ildiz qismini sug'oring."
-        },
-        "bodring": {
-            "name": "Bodring (Cucumis sativus)",
-            "description": "Palak o'simlik, toza mevasi uchun ekiladi.",
-            "common_diseases": ["bodring_un_shudring", "bodring_bakterioz", "bodring_antraknoz", "bodring_fuzarioz",
-                                "bodring_virus_mozaika"],
-            "care_tips": "Issiq iqlimni yaxshi ko'radi, muntazam sug'orishni talab qiladi.",
-            "treatment": "Un shudringga qarshi oltingugurt asosli preparatlar, fuzarioz uchun maxsus fungitsidlar qo'llash kerak.",
-            "fertilizers": ["NPK 8-16-36", "Kalsiy nitrat", "Humus", "Biogumus"],
-            "prevention": "Havo aylanishini yaxshilang. Kasallik kuzatilganda, zudlik bilan davolang. Almashlab ekishga rioya qiling."
-        },
-        "kartoshka": {
-            "name": "Kartoshka (Solanum tuberosum)",
-            "description": "Yer ostida hosil bo'ladigan tuganaklari uchun ekiladi.",
-            "common_diseases": ["kartoshka_fitoftoroz", "kartoshka_alternarioz", "kartoshka_parsha",
-                                "kartoshka_rizoktoniya", "kartoshka_kolorado_qo'ng'izi"],
-            "care_tips": "Tuganaklar ekishdan oldin ko'kartiriladi, o'simlik gullagan paytda tuproq ko'tarilib qo'yiladi.",
-            "treatment": "Fitoftoroz uchun mis kuporos va ohakli aralashmalar, kolorado qo'ng'izi uchun insektitsidlar.",
-            "fertilizers": ["NPK 5-10-15", "Superfosfat", "Kaliy sulfat", "Organik o'g'it"],
-            "prevention": "Ekishdan oldin urug'larni dorilang. Zararkunanda va kasallikka chidamli navlarni tanlang."
-        },
-        "olma": {
-            "name": "Olma (Malus domestica)",
-            "description": "Ko'p yillik mevali daraxt, ko'plab navlari mavjud.",
-            "common_diseases": ["olmali_qora_chirish", "olmali_kuyish", "olmali_un_shudring", "olmali_qizil_dog",
-                                "olmali_parsha"],
-            "care_tips": "Yillik budash zarur, hosil ko'p bo'lganda mevalar siyraklashtiriladi.",
-            "treatment": "Mis kuporos eritmalari, fungitsidlar, yashil sovun eritmasi bilan ishlov berish.",
-            "fertilizers": ["NPK 12-12-17", "Fosfor-kaliy o'g'iti", "Mikroelementli o'g'it", "Humus"],
-            "prevention": "Muntazam profilaktik ishlov berish, qurib qolgan shoxlarni kesish, kuzda barglarni yig'ib tashlash."
-        },
-        "uzum": {
-            "name": "Uzum (Vitis vinifera)",
-            "description": "Tok o'simligi, mevasi uchun yetishtiriladi.",
-            "common_diseases": ["uzum_mildyu", "uzum_oidium", "uzum_antraknoz", "uzum_qora_chirish",
-                                "uzum_virus_kasallik"],
-            "care_tips": "Har yili budash zarur, novdalar bog'lab qo'yiladi, kasalliklardan himoya qilinadi.",
-            "treatment": "Mis kuporos va oltingugurt asosidagi preparatlar bilan ishlov berish.",
-            "fertilizers": ["NPK 8-20-30", "Kalsiy sulfat", "Magniy sulfat", "Organik o'g'it"],
-            "prevention": "O'z vaqtida budash, kasallangan qismlarni kesib tashlash, profilaktik ishlov berish."
-        },
-        "piyoz": {
-            "name": "Piyoz (Allium cepa)",
-            "description": "Yer ostida piyozboshi hosil qiladigan o'simlik.",
-            "common_diseases": ["piyoz_peronosporoz", "piyoz_fuzarioz", "piyoz_so'lish", "piyoz_bakterial_chirish"],
-            "care_tips": "Qurg'oqchilikka chidamli, lekin o'sish davrida muntazam sug'orishni talab qiladi.",
-            "treatment": "Fungiitsidlar bilan ishlov berish, kasallangan piyozlarni olib tashlash.",
-            "fertilizers": ["NPK 5-10-15", "Azotli o'g'it", "Fosforli o'g'it", "Organik o'g'it"],
-            "prevention": "Almashlab ekishga rioya qilish, kasallangan o'simliklarni yo'q qilish."
-        },
-        "sabzi": {
-            "name": "Sabzi (Daucus carota)",
-            "description": "Ildizmevasi uchun ekiladigan o'simlik.",
-            "common_diseases": ["sabzi_alternarioz", "sabzi_fuzarioz", "sabzi_bakterial_chirish", "sabzi_nematoda"],
-            "care_tips": "Chuqur va yumshoq tuprog'ni yaxshi ko'radi, toshli yerda ekilmaydi.",
-            "treatment": "Fungitsidlar, biologik preparatlar, agrotexnik choralar.",
-            "fertilizers": ["NPK 6-8-10", "Kaliy sulfat", "Mikroelementlar", "Organik o'g'it"],
-            "prevention": "Almashlab ekish, urug'larni dorilash, kasallangan o'simliklarni yo'qotish."
-        },
-        "karam": {
-            "name": "Karam (Brassica oleracea)",
-            "description": "Barg hosil qiladigan bir yillik o'simlik.",
-            "common_diseases": ["karam_fuzarioz", "karam_alternarioz", "karam_so'lish", "karam_bakterioz",
-                                "karam_oq_chirish"],
-            "care_tips": "Salqin ob-havoni yaxshi ko'radi, muntazam sug'orish va oziqlantirishni talab qiladi.",
-            "treatment": "Fungitsidlar, bakteritsidlar, biologik preparatlar bilan ishlov berish.",
-            "fertilizers": ["NPK 14-7-14", "Ammoniy nitrat", "Superfosfat", "Go'ng"],
-            "prevention": "Almashlab ekish, urug'larni dorilash, kasallangan o'simliklarni yo'qotish."
-        },
-        "galla": {
-            "name": "G'alla (Triticum spp.)",
-            "description": "Don ekinlari oilasiga mansub bo'lgan o'simlik.",
-            "common_diseases": ["galla_zang", "galla_qorakuya", "galla_septorioz", "galla_fuzarioz", "galla_virus"],
-            "care_tips": "O'g'itlash va sug'orish rejimiga qat'iy rioya qilish lozim.",
-            "treatment": "Fungitsidlar, biologik preparatlar, kasallangan o'simliklarni yo'qotish.",
-            "fertilizers": ["NPK 16-16-16", "Azotli o'g'it", "Fosforli o'g'it", "Kaliy o'g'iti"],
-            "prevention": "Chidamli navlarni tanlash, urug'larni dorilash, almashlab ekish."
-        },
-        "javdar": {
-            "name": "Javdar (Secale cereale)",
-            "description": "Donli ekin, nonbop un olinadi.",
-            "common_diseases": ["javdar_qorakuya", "javdar_zang", "javdar_fuzarioz", "javdar_septorioz"],
-            "care_tips": "Sovuqqa chidamli, quyi haroratlarda ham o'sa oladi.",
-            "treatment": "Fungitsidlar, kasallangan o'simliklarni yo'qotish.",
-            "fertilizers": ["NPK 16-16-16", "Azotli o'g'it", "Organik o'g'it", "Mikroelementlar"],
-            "prevention": "Chidamli navlarni tanlash, urug'larni dorilash, almashlab ekish."
-        },
-        "arpa": {
-            "name": "Arpa (Hordeum vulgare)",
-            "description": "Donli ekin, asosan chorvachilik uchun ekiladi.",
-            "common_diseases": ["arpa_qorakuya", "arpa_zang", "arpa_un_shudring", "arpa_fusarioz"],
-            "care_tips": "Sovuqqa chidamli, qurg'oqchilikka bardoshli, qisqa vegetatsiya davriga ega.",
-            "treatment": "Fungitsidlar, kasallangan o'simliklarni yo'qotish.",
-            "fertilizers": ["NPK 16-16-16", "Azotli o'g'it", "Fosforli o'g'it", "Kaliy o'g'iti"],
-            "prevention": "Chidamli navlarni tanlash, urug'larni dorilash, almashlab ekish."
-        },
-        "sog_osimlik": {
-            "name": "Sog'lom o'simlik",
-            "description": "Bu o'simlikda biror kasallik belgilari aniqlanmadi.",
-            "common_diseases": [],
-            "care_tips": "O'simlikni yaxshi parvarish qilishda davom eting.",
-            "treatment": "Davolash talab etilmaydi. Muntazam sug'orish va o'g'itlashni davom ettiring.",
-            "fertilizers": ["Universal NPK o'g'it", "Organik o'g'it", "Mikroelementli o'g'it", "Humus"],
-            "prevention": "Profilaktika choralarini ko'rib turing, o'simliklarni muntazam tekshiring."
-        }
-    }
-
     # Asosiy sarlavha
     st.markdown("<h1 class='main-header'>🌿 O'simlik kasalliklarini aniqlash tizimi</h1>", unsafe_allow_html=True)
 
@@ -211,185 +127,18 @@ def main():
     uploaded_file = st.file_uploader("Rasm yuklash (JPG, PNG, maksimum 100MB)", type=["jpg", "jpeg", "png"])
     st.markdown("</div>", unsafe_allow_html=True)
 
-    # Model yuklaydigan funksiya
-    @st.cache_resource
-    def load_ai_model():
-        try:
-            # PlantVillage yoki boshqa o'qitilgan model yuklanadi
-            # Real holatda modelni ko'rsatilgan manzildan yuklash kerak
-            # model = tf.keras.models.load_model('plant_disease_model.h5')
-            # return model
-
-            # Hozir model mavjud bo'lmaganligi sababli, zaxira modelni yaratamiz
-            # Bu yerda MobileNetV2 modelini faqat tasniflash uchun foydalaniladi
-            mobilenet = tf.keras.applications.MobileNetV2(
-                weights='imagenet',
-                input_shape=(224, 224, 3),
-                include_top=True
-            )
-
-            return mobilenet
-        except Exception as e:
-            st.error(f"Model yuklanmadi: {str(e)}")
-            # Minimal model qaytaramiz
-            return None
-
-    # Replace the analyze_plant_image function with this improved version
-
-    def analyze_plant_image(img, model):
-        try:
-            # Preprocess the image for the model
-            img_resized = img.resize((224, 224))
-            img_array = np.array(img_resized)
-            img_array = np.expand_dims(img_array, axis=0)
-            img_array = tf.keras.applications.mobilenet_v2.preprocess_input(img_array)
-
-            # Get model predictions
-            if model is not None:
-                predictions = model.predict(img_array)
-                # Get the top predicted class features
-                prediction_features = predictions[0]
-            else:
-                # If model is not available, use the backup approach
-                prediction_features = None
-
-            # Extract image features for backup analysis
-            img_rgb = np.array(img_resized)
-
-            # Define mapping from ImageNet classes to plant diseases
-            # This is a simplified mapping - in a real system, you'd need proper training data
-            # and a model specifically trained for plant diseases
-
-            # Use model predictions if available, otherwise use the backup approach
-            if model is not None and np.max(predictions) > 0.5:
-                # Find the top predicted class
-                top_class = np.argmax(predictions)
-
-                # Map ImageNet classes to plant diseases
-                # This is a simplified example - you would need a proper mapping
-                # based on your specific model and training data
-                if top_class in [970, 971, 972]:  # ImageNet classes for plants/vegetables
-                    prediction = "pomidor_barg_dog"
-                    confidence = np.max(predictions)
-                elif top_class in [973, 974, 975]:
-                    prediction = "pomidor_fitoftoroz"
-                    confidence = np.max(predictions)
-                elif top_class in [980, 981, 982]:
-                    prediction = "kartoshka_fitoftoroz"
-                    confidence = np.max(predictions)
-                elif top_class in [985, 986, 987]:
-                    prediction = "bodring_un_shudring"
-                    confidence = np.max(predictions)
-                elif top_class in [990, 991, 992]:
-                    prediction = "uzum_mildyu"
-                    confidence = np.max(predictions)
-                else:
-                    # If no specific mapping, use backup approach
-                    prediction, confidence = analyze_image_backup(img_rgb)
-            else:
-                # Use backup approach if model is not available
-                prediction, confidence = analyze_image_backup(img_rgb)
-
-            return prediction, confidence
-
-        except Exception as e:
-            st.error(f"Error analyzing image: {str(e)}")
-            return "sog_osimlik", 0.75
-
-    # Add this backup analysis function
-    def analyze_image_backup(img_rgb):
-        """Backup analysis method when model is not available or confident"""
-
-        # Extract key features from the image
-        # 1. Check for dark spots
-        has_dark_spots = np.mean(img_rgb[:, :, 0] < 50) > 0.05
-
-        # 2. Check for white powder/spots
-        has_white_powder = np.mean(img_rgb > 200) > 0.15
-
-        # 3. Calculate "greenness" ratio
-        greenness = np.mean(img_rgb[:, :, 1]) / (np.mean(img_rgb[:, :, 0]) + np.mean(img_rgb[:, :, 2]) + 1e-10)
-
-        # 4. Check for reddish-brown spots
-        reddish_brown = np.mean((img_rgb[:, :, 0] > 120) & (img_rgb[:, :, 1] < 100) & (img_rgb[:, :, 2] < 80)) > 0.08
-
-        # 5. Check for yellowish spots
-        yellowish = np.mean((img_rgb[:, :, 0] > 180) & (img_rgb[:, :, 1] > 180) & (img_rgb[:, :, 2] < 100)) > 0.08
-
-        # 6. Texture variance
-        texture_variance = np.std(img_rgb)
-
-        # 7. Check for leaf discoloration
-        discoloration = np.std(img_rgb[:, :, 1]) > 50
-
-        # Improved disease detection logic with more sensitivity
-        if has_dark_spots and discoloration:
-            prediction = "pomidor_fitoftoroz"
-            confidence = 0.85
-        elif has_white_powder and greenness > 1.0:
-            prediction = "bodring_un_shudring"
-            confidence = 0.88
-        elif reddish_brown and texture_variance > 50:
-            prediction = "pomidor_barg_dog"
-            confidence = 0.87
-        elif yellowish and texture_variance > 45:
-            prediction = "galla_zang"
-            confidence = 0.86
-        elif np.mean(img_rgb[:, :, 1]) < 100 and texture_variance > 60:
-            prediction = "kartoshka_fitoftoroz"
-            confidence = 0.84
-        elif has_dark_spots and np.mean(img_rgb[:, :, 1]) < 120:
-            prediction = "uzum_mildyu"
-            confidence = 0.83
-        elif np.mean(img_rgb[:, :, 0]) > 150 and np.mean(img_rgb[:, :, 1]) < 140:
-            prediction = "pomidor_bakterial_dog"
-            confidence = 0.82
-        else:
-            # Lower the threshold for healthy plants
-            # This makes the system more sensitive to detecting diseases
-            if greenness > 1.3 and texture_variance < 40 and not has_dark_spots and not has_white_powder:
-                prediction = "sog_osimlik"
-                confidence = 0.95
-            else:
-                # If uncertain but there are some abnormalities, guess the most common disease
-                prediction = "pomidor_barg_dog"
-                confidence = 0.70
-
-        return prediction, confidence
-
-    # Update the load_ai_model function to handle model loading better
-    @st.cache_resource
-    def load_ai_model():
-        try:
-            # Try to load the specific plant disease model if available
-            try:
-                model = tf.keras.models.load_model('plant_disease_model.h5')
-                return model
-            except:
-                st.warning("Plant disease model not found. Using MobileNetV2 as a fallback.")
-
-            # Use MobileNetV2 as a fallback
-            mobilenet = tf.keras.applications.MobileNetV2(
-                weights='imagenet',
-                input_shape=(224, 224, 3),
-                include_top=True
-            )
-            return mobilenet
-        except Exception as e:
-            st.error(f"Failed to load model: {str(e)}")
-            return None
-
-        except Exception as e:
-            st.error(f"Rasm tahlilida xatolik: {str(e)}")
-            # Xatolik yuz berganda eng ehtimoliy kasallikni qaytaramiz
-            return "pomidor_barg_dog", 0.75
-
-    # Model yuklash
+    # Model yuklash (jarayon bo'yicha bir marta, barcha sessiyalar uchun umumiy)
     with st.spinner("AI model yuklanmoqda..."):
-        model = load_ai_model()
+        model = get_model()
         if model is not None:
-            st.success("Model muvaffaqiyatli yuklandi!")
+            stats = model_stats()
+            if stats["source"] == "MobileNetV2":
+                st.warning("Plant disease model not found. Using MobileNetV2 as a fallback.")
+            st.success(f"Model muvaffaqiyatli yuklandi! ({stats['source']}, "
+                       f"{stats['load_seconds']:.1f} s, ~{stats.get('rss_delta_mb') or 0:.0f} MB)")
         else:
+            if model_stats()["error"]:
+                st.error(f"Model yuklanmadi: {model_stats()['error']}")
             st.warning("Model yuklanmadi. Tahlil oddiy algoritm bilan amalga oshiriladi.")
 
     # Agar rasm yuklangan bo'lsa
@@ -409,26 +158,27 @@ def main():
             # Tahlil boshlash
             with st.spinner('Rasm tahlil qilinmoqda...'):
                 progress_bar = st.progress(0)
-                for i in range(100):
-                    time.sleep(0.02)
-                    progress_bar.progress(i + 1)
+
+                def bosqich(nomi):
+                    foiz, matn = TAHLIL_BOSQICHLARI[nomi]
+                    progress_bar.progress(foiz, text=matn)
 
                 # Rasm tahlil natijasi
-                img = Image.open(io.BytesIO(image_data))
-                prediction, confidence = analyze_plant_image(img, model)
+                prediction, confidence = diagnose_uploaded_image(image_data, model, bosqich)
 
-                # Ma'lumotlar bazasidan kasallik ma'lumotlarini olish
-                if prediction in plant_diseases:
-                    disease_info = plant_diseases[prediction]
-                else:
-                    # Agar aniqlanmagan kasallik bo'lsa
-                    disease_info = plant_diseases["sog_osimlik"]
+                # Ma'lumotlar bazasidan kasallik ma'lumotlarini olish (aniqlanmagan kod sog'lom o'simlik deb olinadi)
+                bosqich("knowledge")
+                disease_info = load_disease_kb().lookup(prediction)
+                progress_bar.progress(100, text="Tahlil yakunlandi")
 
             with col2:
                 st.markdown("<h3>Tahlil natijasi</h3>", unsafe_allow_html=True)
                 st.markdown(
                     f"<div class='result-box'><h4>Kasallik: {disease_info['name']}</h4><p>Aniqlash ishonchliligi: {confidence * 100:.1f}%</p></div>",
                     unsafe_allow_html=True)
+                kesh = get_cache().metrics()
+                st.caption(f"Kesh: {kesh['hit_rate'] * 100:.0f}% topildi ({kesh['lookups']} ta so'rov), "
+                           f"{kesh['saved_ms']:.0f} ms tejaldi")
 
                 # Pie chart for visualization
                 fig = px.pie(values=[confidence * 100, (1 - confidence) * 100],
@@ -449,7 +199,7 @@ def main():
             st.markdown("<h2 class='sub-header'>🌱 Tavsiya etiladigan o'g'itlar</h2>", unsafe_allow_html=True)
 
             fertilizer_data = pd.DataFrame({
-                "O'g'it nomi": disease_info['fertilizers'],
+                "O'g'it nomi": list(disease_info['fertilizers']),
                 "Samaradorlik": np.random.uniform(60, 95, len(disease_info['fertilizers']))
             })
 
@@ -0,0 +1,158 @@
+import datetime
+import os
+
+import folium
+
+from irrigation_core.crops import osimlik_turlari, maydon_rangini_olish
+from irrigation_core.field_index import geometry_of
+
+# Rendering mode of the field layer: "yagona" puts every field into one FeatureCollection,
+# "alohida" keeps one GeoJson layer (with its own popup and tooltip) per field
+QATLAM_REJIMI = os.environ.get("XARITA_QATLAM", "yagona")
+
+# Popup rows of the single layer: feature property -> label
+POPUP_MAYDONLARI = {
+    "ekin": "Ekin",
+    "sugorish_davri": "Sug'orish davri",
+    "pishib_yetilish": "Pishib yetilish",
+    "oxirgi_sugorilgan": "Oxirgi sug'orilgan",
+    "tuproq_namligi": "Tuproq namligi",
+    "holat": "Status",
+    "ekish_sanasi": "Ekish sanasi",
+    "pishib_yetilish_sanasi": "Pishib yetilish sanasi",
+    "pishib_yetilish_holati": "Pishib yetilish holati",
+}
+
+
+# Maydonning xaritada ko'rsatiladigan xususiyatlari (rang va holat maydon_rangini_olish dan)
+def maydon_xususiyatlari(maydon, bugun=None):
+    bugun = bugun or datetime.date.today()
+    ekish_sanasi = maydon.get("ekish_sanasi", None)
+    rang, holat = maydon_rangini_olish(maydon["oxirgi_sugorilgan"], maydon["ekin"],
+                                       maydon["tuproq_namligi"], ekish_sanasi)
+
+    if maydon["ekin"] in osimlik_turlari:
+        sugorish_davri = osimlik_turlari[maydon["ekin"]]["sugorish_davri"]
+        pishib_yetilish_muddat = osimlik_turlari[maydon["ekin"]]["pishib_yetilish_muddat"]
+    else:
+        sugorish_davri = "Aniqlanmagan"
+        pishib_yetilish_muddat = "Aniqlanmagan"
+
+    pishib_yetilish_kuni = None
+    if ekish_sanasi and isinstance(pishib_yetilish_muddat, int):
+        pishib_yetilish_kuni = ekish_sanasi + datetime.timedelta(days=pishib_yetilish_muddat * 30)
+        qolgan_kunlar = (pishib_yetilish_kuni - bugun).days
+        if qolgan_kunlar > 0:
+            pishib_yetilish_holati = f"Pishib yetilishga {qolgan_kunlar} kun qoldi"
+        else:
+            pishib_yetilish_holati = "Pishib yetilgan"
+    else:
+        pishib_yetilish_holati = "Ekish sanasi kiritilmagan"
+
+    return {
+        "nomi": maydon["nomi"],
+        "ekin": maydon["ekin"],
+        "rang": rang,
+        "holat": holat,
+        "sugorish_davri": f"{sugorish_davri} kun",
+        "pishib_yetilish": f"{pishib_yetilish_muddat} oy",
+        "oxirgi_sugorilgan": str(maydon["oxirgi_sugorilgan"]),
+        "tuproq_namligi": f"{maydon['tuproq_namligi']:.1f}%",
+        "ekish_sanasi": str(ekish_sanasi) if ekish_sanasi else "-",
+        "pishib_yetilish_sanasi": str(pishib_yetilish_kuni) if pishib_yetilish_kuni else "-",
+        "pishib_yetilish_holati": pishib_yetilish_holati,
+    }
+
+
+# Barcha maydonlarni bitta FeatureCollection ga yig'ish
+def maydonlar_feature_collection(maydonlar, indekslar=None):
+    """
+    Build one FeatureCollection for the given fields
+    Args:
+        maydonlar: List of field dictionaries (st.session_state.maydonlar)
+        indekslar: Positions of the fields to include (defaults to all)
+    Returns:
+        GeoJSON FeatureCollection whose features carry the field index as id
+        and the colour, status and popup values as properties
+    """
+    bugun = datetime.date.today()
+    indekslar = range(len(maydonlar)) if indekslar is None else indekslar
+    features = []
+    for i in indekslar:
+        maydon = maydonlar[i]
+        if "shakl" in maydon and maydon["shakl"]:
+            features.append({
+                "type": "Feature",
+                "id": str(i),
+                "geometry": geometry_of(maydon["shakl"]),
+                "properties": maydon_xususiyatlari(maydon, bugun)
+            })
+    return {"type": "FeatureCollection", "features": features}
+
+
+# Barcha maydonlar uchun yagona uslub funksiyasi (rang feature xususiyatlaridan olinadi)
+def maydon_uslubi(feature):
+    return {
+        'fillColor': feature["properties"]["rang"],
+        'color': 'white',
+        'weight': 2,
+        'fillOpacity': 0.5,
+        'dashArray': '5, 5'
+    }
+
+
+# Maydonlarni bitta GeoJson qatlami sifatida xaritaga qo'shish
+def yagona_qatlam_qoshish(xarita_obyekti, maydonlar, indekslar=None):
+    collection = maydonlar_feature_collection(maydonlar, indekslar)
+    if not collection["features"]:
+        return None
+    return folium.GeoJson(
+        collection,
+        name="Maydonlar",
+        style_function=maydon_uslubi,
+        popup=folium.GeoJsonPopup(fields=["nomi"] + list(POPUP_MAYDONLARI),
+                                  aliases=[""] + [f"{nom}:" for nom in POPUP_MAYDONLARI.values()],
+                                  max_width=300),
+        tooltip=folium.GeoJsonTooltip(fields=["nomi", "holat"], aliases=["", ""], labels=False)
+    ).add_to(xarita_obyekti)
+
+
+# Har bir maydonni alohida GeoJson qatlami sifatida qo'shish (oldingi usul)
+def alohida_qatlamlar_qoshish(xarita_obyekti, maydonlar, indekslar=None):
+    bugun = datetime.date.today()
+    indekslar = range(len(maydonlar)) if indekslar is None else indekslar
+    for i in indekslar:
+        maydon = maydonlar[i]
+        if "shakl" in maydon and maydon["shakl"]:
+            xususiyatlar = maydon_xususiyatlari(maydon, bugun)
+            ekish_sanasi = maydon.get("ekish_sanasi", None)
+
+            # Popup ma'lumotini yaratish
+            popup = folium.Popup(
+                f"<b>{xususiyatlar['nomi']}</b><br>" +
+                f"Ekin: {xususiyatlar['ekin']}<br>" +
+                f"Sug'orish davri: {xususiyatlar['sugorish_davri']}<br>" +
+                f"Pishib yetilish: {xususiyatlar['pishib_yetilish']}<br>" +
+                f"Oxirgi sug'orilgan: {xususiyatlar['oxirgi_sugorilgan']}<br>" +
+                f"Tuproq namligi: {xususiyatlar['tuproq_namligi']}<br>" +
+                f"Status: {xususiyatlar['holat']}<br>" +
+                (f"Ekish sanasi: {ekish_sanasi}<br>" if ekish_sanasi else "") +
+                (f"Pishib yetilish sanasi: {xususiyatlar['pishib_yetilish_sanasi']}<br>" if ekish_sanasi else "") +
+                (f"Pishib yetilish holati: {xususiyatlar['pishib_yetilish_holati']}" if ekish_sanasi else ""),
+                max_width=300
+            )
+
+            folium.GeoJson(
+                {"type": "Feature", "geometry": geometry_of(maydon["shakl"]), "properties": xususiyatlar},
+                style_function=maydon_uslubi,
+                popup=popup,
+                tooltip=folium.Tooltip(f"{xususiyatlar['nomi']} - {xususiyatlar['holat']}")
+            ).add_to(xarita_obyekti)
+
+
+# Tanlangan rejimga qarab maydonlarni xaritaga qo'shish
+def maydonlarni_xaritaga_qoshish(xarita_obyekti, maydonlar, indekslar=None, rejim=None):
+    if (rejim or QATLAM_REJIMI) == "alohida":
+        alohida_qatlamlar_qoshish(xarita_obyekti, maydonlar, indekslar)
+    else:
+        yagona_qatlam_qoshish(xarita_obyekti, maydonlar, indekslar)
@@ -0,0 +1,165 @@
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Default location of the shared forecast store (override with FORECAST_STORE_PATH)
+DEFAULT_STORE_PATH = os.environ.get(
+    "FORECAST_STORE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "forecasts.sqlite3")
+)
+
+# How long a background refresh may hold its lease before another worker can take over
+REFRESH_LEASE_SECONDS = 30
+
+# Older fetches kept per (kind, region) besides the latest one
+HISTORY_LIMIT = 24
+
+
+class ForecastStore:
+    """
+    SQLite-backed store of raw OpenWeatherMap responses keyed by kind, region and fetch time.
+    The file is shared by every worker process. Reads use stale-while-revalidate:
+    a cached entry is returned immediately and refreshed in the background once its TTL expires.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH, lease_seconds=REFRESH_LEASE_SECONDS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS forecasts (
+                    kind TEXT NOT NULL,
+                    region TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    payload TEXT NOT NULL,
+                    PRIMARY KEY (kind, region, fetched_at)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS refresh_leases (
+                    kind TEXT NOT NULL,
+                    region TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    PRIMARY KEY (kind, region)
+                )
+            """)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def latest(self, kind, region):
+        """Return (fetched_at, payload) of the newest stored entry, or None"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT fetched_at, payload FROM forecasts WHERE kind = ? AND region = ? "
+                "ORDER BY fetched_at DESC LIMIT 1",
+                (kind, region)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def put(self, kind, region, payload, fetched_at=None):
+        """Store a fetched payload and drop history beyond HISTORY_LIMIT"""
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO forecasts (kind, region, fetched_at, payload) VALUES (?, ?, ?, ?)",
+                (kind, region, fetched_at, json.dumps(payload))
+            )
+            conn.execute(
+                "DELETE FROM forecasts WHERE kind = ? AND region = ? AND fetched_at NOT IN ("
+                "SELECT fetched_at FROM forecasts WHERE kind = ? AND region = ? "
+                "ORDER BY fetched_at DESC LIMIT ?)",
+                (kind, region, kind, region, HISTORY_LIMIT + 1)
+            )
+        return fetched_at
+
+    def refresh(self, kind, region, fetch):
+        """Fetch synchronously and store the result; returns (fetched_at, payload) or None"""
+        payload = fetch(region)
+        if payload is None:
+            return None
+        return self.put(kind, region, payload), payload
+
+    def get(self, kind, region, fetch, ttl):
+        """
+        Return (fetched_at, payload) for a region using stale-while-revalidate
+        Args:
+            kind: Entry kind, e.g. "current" or "forecast"
+            region: Region name
+            fetch: Callable(region) returning a raw payload or None on failure
+            ttl: Seconds after which the entry is refreshed in the background
+        Returns:
+            (fetched_at, payload) tuple, or None if nothing is stored and the fetch failed
+        """
+        entry = self.latest(kind, region)
+        if entry is None:
+            # Nothing to serve yet, so the first caller has to wait for the fetch
+            return self.refresh(kind, region, fetch)
+
+        if time.time() - entry[0] > ttl:
+            self.refresh_in_background(kind, region, fetch)
+        return entry
+
+    def refresh_in_background(self, kind, region, fetch):
+        """Start a background refresh unless this or another worker is already refreshing"""
+        key = (kind, region)
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+
+        if not self._acquire_lease(kind, region):
+            with self._lock:
+                self._refreshing.discard(key)
+            return False
+
+        def run():
+            try:
+                self.refresh(kind, region, fetch)
+            except Exception:
+                # The stale entry keeps being served; the next expired read retries
+                pass
+            finally:
+                self._release_lease(kind, region)
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=run, name=f"forecast-refresh-{kind}-{region}", daemon=True).start()
+        return True
+
+    def _acquire_lease(self, kind, region):
+        """Cross-process guard so only one worker refreshes a given entry at a time"""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT expires_at FROM refresh_leases WHERE kind = ? AND region = ?",
+                (kind, region)
+            ).fetchone()
+            if row is not None and row[0] > now:
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO refresh_leases (kind, region, expires_at) VALUES (?, ?, ?)",
+                (kind, region, now + self.lease_seconds)
+            )
+        return True
+
+    def _release_lease(self, kind, region):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM refresh_leases WHERE kind = ? AND region = ?", (kind, region))
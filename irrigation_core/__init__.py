@@ -0,0 +1,20 @@
+# Headless irrigation core: pure computation with no Streamlit, plotting or HTTP imports.
+# Batch workers can import this package and plan without loading any UI modules.
+from irrigation_core.crops import (
+    osimlik_turlari,
+    maydon_rangini_olish,
+    suv_talabini_hisoblash,
+    davomiylikni_hisoblash,
+    keyingi_sugorish_kuni,
+)
+from irrigation_core.analysis import (
+    summarize_forecast,
+    analyze_field_status,
+    analyze_disease_status,
+    analyze_crop_water_needs,
+    calculate_smart_irrigation,
+)
+from irrigation_core.disease_kb import (
+    DiseaseKnowledgeBase,
+    load_disease_kb,
+)
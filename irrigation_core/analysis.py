@@ -0,0 +1,560 @@
+import datetime
+
+from irrigation_core.crops import osimlik_turlari, suv_talabini_hisoblash, davomiylikni_hisoblash
+from irrigation_core.disease_kb import HEALTHY_CODE, load_disease_kb
+
+
+# Weather factors that affect irrigation
+def summarize_forecast(forecast_data):
+    """
+    Summarize a forecast (as returned by weather.get_forecast) for irrigation planning
+    Args:
+        forecast_data: Columnar forecast dictionary with weekly averages and daily arrays
+    Returns:
+        Dictionary with avg_temp, avg_rain_prob, avg_et0 (mm/day) and daily dates, temps,
+        rain_probs, et0 (reference evapotranspiration, mm/day) and rain_mm (mm/day) arrays,
+        and the forecast itself (per-slot values, used by irrigation_core.ensemble)
+    """
+    if not forecast_data:
+        return {"status": "error", "message": "Ob-havo ma'lumotlari olinmadi"}
+
+    import numpy as np
+    from irrigation_core.forecast import format_day_month
+    from irrigation_core.et0 import daily_totals, forecast_reference_et
+
+    # Reference ET and rain of every forecast slot, summed per day and matched to the daily selection
+    et0 = forecast_reference_et(forecast_data)
+    daily_days = np.asarray(forecast_data["daily_dates"]).astype("datetime64[D]")
+    selected = np.searchsorted(et0["days"], daily_days)
+    daily_et0 = et0["daily_et0"][selected]
+    rain_mm = forecast_data.get("rain_mm")
+    if rain_mm is None:
+        daily_rain = np.zeros(len(daily_days))
+    else:
+        daily_rain = daily_totals(forecast_data["dates"], rain_mm, et0["hours"])[1][selected]
+
+    return {
+        "avg_temp": forecast_data["weekly_avg_temp"],  # Using weekly as an approximation
+        "avg_rain_prob": forecast_data["weekly_avg_rain_prob"],
+        "avg_et0": round(float(daily_et0.mean()), 2) if len(daily_et0) else 0,
+        "dates": format_day_month(forecast_data["daily_dates"]),
+        "temps": forecast_data["daily_temps"],
+        "rain_probs": forecast_data["daily_rain_probs"],
+        "et0": daily_et0,
+        "rain_mm": daily_rain,
+        "forecast": forecast_data,
+        "status": "success"
+    }
+
+
+# Field status analysis
+def analyze_field_status(field_data):
+    """
+    Analyze field data to get soil moisture, crop type, last irrigation date
+    Args:
+        field_data: Dictionary with field information
+    Returns:
+        Dictionary with analysis results
+    """
+    try:
+        crop_type = field_data.get("ekin", "")
+        last_irrigated = field_data.get("oxirgi_sugorilgan", datetime.date.today())
+        soil_moisture = field_data.get("tuproq_namligi", 50)
+        planting_date = field_data.get("ekish_sanasi", None)
+
+        if crop_type in osimlik_turlari:
+            crop_info = osimlik_turlari[crop_type]
+            irrigation_period = crop_info["sugorish_davri"]
+            optimal_moisture = crop_info["namlik_optimal"]
+            min_moisture = crop_info["namlik_minimum"]
+
+            days_since_irrigation = (datetime.date.today() - last_irrigated).days
+            days_after_planting = None
+            if isinstance(planting_date, datetime.date):
+                days_after_planting = (datetime.date.today() - planting_date).days
+
+            # Calculate irrigation urgency
+            if soil_moisture < min_moisture:
+                urgency = "high"
+                urgency_score = 3
+            elif soil_moisture < min_moisture * 1.2:
+                urgency = "medium"
+                urgency_score = 2
+            else:
+                urgency = "low"
+                urgency_score = 1
+
+            # Calculate next irrigation date based on period
+            next_irrigation_date = last_irrigated + datetime.timedelta(days=irrigation_period)
+            days_to_next = (next_irrigation_date - datetime.date.today()).days
+
+            return {
+                "crop_type": crop_type,
+                "last_irrigated": last_irrigated,
+                "soil_moisture": soil_moisture,
+                "optimal_moisture": optimal_moisture,
+                "min_moisture": min_moisture,
+                "days_since_irrigation": days_since_irrigation,
+                "next_scheduled_irrigation": next_irrigation_date,
+                "days_to_next_irrigation": days_to_next,
+                "irrigation_urgency": urgency,
+                "urgency_score": urgency_score,
+                "irrigation_period": irrigation_period,
+                "days_after_planting": days_after_planting,
+                "status": "success"
+            }
+        else:
+            return {"status": "error", "message": "Ekin turi tanlanmagan yoki noto'g'ri"}
+    except Exception as e:
+        return {"status": "error", "message": f"Dalani tahlil qilishda xatolik: {str(e)}"}
+
+
+# Disease analysis - rewritten to not depend on the missing function
+def analyze_disease_status(disease_info):
+    """
+    Analyze if plant has disease and if it affects irrigation
+    Args:
+        disease_info: Dictionary with disease information; a "code" key is looked up
+            in the disease knowledge base (diseases_database.csv)
+    Returns:
+        Dictionary with analysis results
+    """
+    try:
+        if disease_info and disease_info.get("code"):
+            record = load_disease_kb().get(disease_info["code"])
+            if record is not None and record["code"] == HEALTHY_CODE:
+                disease_info = None
+            elif record is not None:
+                disease_info = dict(record, **disease_info)
+
+        if not disease_info or "name" not in disease_info:
+            return {
+                "has_disease": False,
+                "irrigation_adjustment": 0,
+                "status": "success",
+                "message": "Kasallik ma'lumotlari mavjud emas"
+            }
+
+        # Common diseases that require reduced irrigation
+        reduce_water_diseases = [
+            "fitoftoroz", "bakterial_rak", "bakterial_dog", "qora_chirish",
+            "fuzarioz", "bakterial_chirish", "bakterioz", "so'lish", "un_shudring"
+        ]
+
+        # Check if disease name contains any keywords that suggest reducing water
+        disease_name = ((disease_info.get("code") or "") + " " + disease_info.get("name", "")).lower()
+        needs_reduced_water = any(disease in disease_name for disease in reduce_water_diseases)
+
+        # Calculate irrigation adjustment (-30% for water-sensitive diseases)
+        irrigation_adjustment = -0.3 if needs_reduced_water else 0
+
+        return {
+            "has_disease": True,
+            "disease_name": disease_info.get("name", ""),
+            "disease_code": disease_info.get("code"),
+            "severity": disease_info.get("severity", ""),
+            "requires_reduced_water": needs_reduced_water,
+            "irrigation_adjustment": irrigation_adjustment,
+            "recommendations": disease_info.get("treatment", ""),
+            "status": "success"
+        }
+    except Exception as e:
+        return {"status": "error", "message": f"Kasallik tahlilida xatolik: {str(e)}"}
+
+
+# Crop water requirements analysis
+def analyze_crop_water_needs(crop_data):
+    """
+    Analyze crop water requirements based on growth stage
+    Args:
+        crop_data: Dictionary with crop information
+    Returns:
+        Dictionary with water requirements
+    """
+    try:
+        crop_type = crop_data.get("crop_type", "")
+        growth_stage = crop_data.get("growth_stage", "")
+        area = crop_data.get("area", 1000)  # m²
+
+        # Get water requirements from crop.py functions
+        water_req_text = crop_data.get("water_requirement", "5-7 mm/day")
+        duration_text = crop_data.get("duration", "7-10 days")
+
+        # Calculate water requirements
+        daily_water = suv_talabini_hisoblash(water_req_text, area)
+        stage_duration = davomiylikni_hisoblash(duration_text)
+
+        return {
+            "crop_type": crop_type,
+            "growth_stage": growth_stage,
+            "area": area,
+            "daily_water_requirement": daily_water,
+            "stage_duration": stage_duration,
+            "total_stage_water": daily_water * stage_duration,
+            "status": "success"
+        }
+    except Exception as e:
+        return {"status": "error", "message": f"Ekin suv ehtiyojini tahlil qilishda xatolik: {str(e)}"}
+
+
+# Root-zone water balance of one field under one or more weather scenarios
+def field_water_balance(et0, rain_mm, field_data, crop_data, horizon_days=None):
+    """
+    Daily root-zone water balance of one field until the end of its season.
+    Demand is the crop.py stage requirement, replaced by Kc * ET0 on forecast days where
+    reference ET is known; forecast rain is counted on its days. Irrigation fires when
+    depletion reaches the crop's namlik_minimum and refills to namlik_optimal. Each row of
+    et0 and rain_mm is one weather scenario, all run in one pass.
+    Args:
+        et0: (F,) or (M, F) daily reference ET (mm/day) of the forecast days
+        rain_mm: (F,) or (M, F) daily rain (mm/day) of the forecast days
+        field_data: Field status analysis (analyze_field_status)
+        crop_data: Crop water needs analysis (analyze_crop_water_needs)
+        horizon_days: Days simulated (default: the days left until the crop matures, from
+            pishib_yetilish_muddat and the planting date, or DEFAULT_HORIZON_DAYS without one)
+    Returns:
+        simulate_water_balance output with one row per scenario plus horizon_days,
+        or None when the field has no crop or area to run the balance on
+    """
+    import numpy as np
+    from irrigation_core.water_balance import depletion_from_moisture, root_zone_parameters, simulate_water_balance
+
+    crop_type = field_data.get("crop_type")
+    if crop_type not in osimlik_turlari or not crop_data.get("area"):
+        return None
+    if horizon_days is None:
+        horizon_days = _season_horizon(field_data)
+
+    demand, rain = _daily_inputs(et0, rain_mm, field_data, crop_data, horizon_days)
+    n_scenarios = len(demand)
+    taw, allowable, refill = root_zone_parameters([crop_type])
+    initial = depletion_from_moisture([field_data.get("soil_moisture", 50)], taw)
+    result = simulate_water_balance(demand, np.repeat(taw, n_scenarios), np.repeat(allowable, n_scenarios),
+                                    np.repeat(initial, n_scenarios), rain_mm=rain,
+                                    refill_depletion=np.repeat(refill, n_scenarios))
+    result["horizon_days"] = horizon_days
+    return result
+
+
+def _season_horizon(field_data):
+    """Days left until the crop matures, or DEFAULT_HORIZON_DAYS without a planting date"""
+    from irrigation_core.water_balance import DEFAULT_HORIZON_DAYS
+
+    days_after_planting = field_data.get("days_after_planting")
+    if days_after_planting is None:
+        return DEFAULT_HORIZON_DAYS
+    return max(osimlik_turlari[field_data["crop_type"]]["pishib_yetilish_muddat"] * 30 - days_after_planting, 0)
+
+
+def _daily_inputs(et0, rain_mm, field_data, crop_data, horizon_days):
+    """
+    Daily demand and rain (mm/day) from today over horizon_days, one row per weather scenario:
+    the stage requirement (daily_water_requirement is m³ over the field area), replaced by
+    Kc * ET0 on forecast days, and the forecast rain
+    """
+    import numpy as np
+
+    et0 = np.atleast_2d(np.asarray(et0, dtype=float))[:, :horizon_days]
+    rain_mm = np.atleast_2d(np.asarray(rain_mm, dtype=float))[:, :horizon_days]
+    n_scenarios = max(len(et0), len(rain_mm))
+
+    stage_demand = crop_data.get("daily_water_requirement", 0) * 1000 / crop_data["area"]
+    demand = np.full((n_scenarios, horizon_days), stage_demand)
+    rain = np.zeros((n_scenarios, horizon_days))
+    if et0.shape[1]:
+        from irrigation_core.et0 import CROP_COEFFICIENTS, crop_coefficient
+
+        crop_type = field_data.get("crop_type")
+        if crop_type in CROP_COEFFICIENTS:
+            days_after_planting = (field_data.get("days_after_planting") or 0) + np.arange(et0.shape[1])
+            demand[:, :et0.shape[1]] = crop_coefficient(crop_type, days_after_planting) * et0
+    rain[:, :rain_mm.shape[1]] = rain_mm
+    return demand, rain
+
+
+# Irrigation timing from the root-zone water balance
+def water_balance_schedule(weather_data, field_data, crop_data, n_irrigations=None, horizon_days=None):
+    """
+    Days on which one field needs irrigation until the end of its season, from a daily
+    root-zone water balance (field_water_balance) with the forecast's ET0 and rain.
+    Args:
+        weather_data: Weather forecast analysis (summarize_forecast)
+        field_data: Field status analysis (analyze_field_status)
+        crop_data: Crop water needs analysis (analyze_crop_water_needs)
+        n_irrigations: Maximum number of irrigations (default: every irrigation in the horizon)
+        horizon_days: Days simulated (default: the rest of the season, see field_water_balance)
+    Returns:
+        Dictionary with day_offsets, depth_mm and depletion_mm arrays and horizon_days,
+        or None when the field has no crop or area to run the balance on
+    """
+    import numpy as np
+
+    result = field_water_balance(weather_data.get("et0", []), weather_data.get("rain_mm", []),
+                                 field_data, crop_data, horizon_days)
+    if result is None:
+        return None
+    days = np.flatnonzero(result["irrigation_mm"][0])[:n_irrigations]
+    return {
+        "day_offsets": days,
+        "depth_mm": result["irrigation_mm"][0, days],
+        "depletion_mm": result["depletion"][0],
+        "horizon_days": result["horizon_days"],
+    }
+
+
+# Season calendar of a field for an incremental season plan
+def season_calendar(field_data):
+    """
+    Calendar of a field's season: from planting (or today, without a planting date or when
+    it is still ahead) until the crop matures, as field_water_balance plans it
+    Args:
+        field_data: Field status analysis (analyze_field_status)
+    Returns:
+        (season_start, n_days, today_index) tuple: first date and length of the season and
+        the day of the season that today is
+    """
+    today_index = max(field_data.get("days_after_planting") or 0, 0)
+    season_start = datetime.date.today() - datetime.timedelta(days=today_index)
+    return season_start, today_index + _season_horizon(field_data), today_index
+
+
+def season_planner(planner, field_data):
+    """
+    Incremental planner for a field's season: the given planner while its calendar still
+    matches the field (season_calendar), otherwise a new one
+    Args:
+        planner: IncrementalPlanner kept from an earlier analysis of the field, or None
+        field_data: Field status analysis (analyze_field_status)
+    Returns:
+        IncrementalPlanner
+    """
+    import numpy as np
+    from irrigation_core.incremental import IncrementalPlanner
+
+    season_start, n_days, _ = season_calendar(field_data)
+    if planner is None or planner.season_start != np.datetime64(season_start, "D") or planner.n_days != n_days:
+        planner = IncrementalPlanner(season_start, n_days)
+    return planner
+
+
+# Irrigation timing from a season plan kept between analyses
+def planned_water_balance_schedule(planner, field_id, weather_data, field_data, crop_data, n_irrigations=None):
+    """
+    water_balance_schedule through an IncrementalPlanner (season_planner) kept between
+    analyses of a field. The whole season is planned on the planner's calendar with the
+    forecast from today and today's soil moisture as a reading, so a new forecast, reading
+    or crop requirement re-runs the balance only from the first day it changes.
+    Args:
+        planner: IncrementalPlanner of the field's season (season_planner)
+        field_id: Identifier of the field in the planner
+        weather_data: Weather forecast analysis (summarize_forecast)
+        field_data: Field status analysis (analyze_field_status)
+        crop_data: Crop water needs analysis (analyze_crop_water_needs)
+        n_irrigations: Maximum number of irrigations (default: every irrigation left this season)
+    Returns:
+        water_balance_schedule's dictionary plus recomputed_days and reused_days of this
+        update, or None when the field has no crop or area to run the balance on
+    """
+    import numpy as np
+    from irrigation_core.water_balance import depletion_from_moisture, root_zone_parameters
+
+    crop_type = field_data.get("crop_type")
+    if crop_type not in osimlik_turlari or not crop_data.get("area"):
+        return None
+    _, n_days, today_index = season_calendar(field_data)
+    horizon_days = n_days - today_index
+
+    # Days before today keep the stage requirement; from today on the forecast's demand and rain
+    demand, rain = _daily_inputs(weather_data.get("et0", []), weather_data.get("rain_mm", []),
+                                 field_data, crop_data, horizon_days)
+    season_demand = np.full((1, n_days), crop_data.get("daily_water_requirement", 0) * 1000 / crop_data["area"])
+    season_demand[:, today_index:] = demand
+    season_rain = np.zeros((1, n_days))
+    season_rain[:, today_index:] = rain
+
+    taw, allowable, refill = root_zone_parameters([crop_type])
+    reading = depletion_from_moisture([field_data.get("soil_moisture", 50)], taw)
+    observed = np.full((1, n_days), np.nan)
+    if horizon_days:
+        observed[0, today_index] = reading[0]
+    report = planner.update([field_id], season_demand, taw, allowable, refill, reading,
+                            rain_mm=season_rain, observed_depletion=observed)
+
+    plan = planner.plan(field_id)
+    irrigation = plan["irrigation_mm"][today_index:]
+    depletion = plan["depletion"][today_index:]
+    depletion[0] = reading[0]
+    days = np.flatnonzero(irrigation)[:n_irrigations]
+    return {
+        "day_offsets": days,
+        "depth_mm": irrigation[days],
+        "depletion_mm": depletion,
+        "horizon_days": horizon_days,
+        "recomputed_days": report["total_recomputed_days"],
+        "reused_days": report["total_reused_days"],
+    }
+
+
+# Smart irrigation scheduling
+def calculate_smart_irrigation(weather_data, field_data, disease_data, crop_data, planner=None, field_id=None):
+    """
+    Calculate smart irrigation schedule based on all factors
+    Args:
+        weather_data: Weather forecast analysis
+        field_data: Field status analysis
+        disease_data: Disease analysis
+        crop_data: Crop water needs analysis
+        planner: Optional IncrementalPlanner of the field's season (season_planner), kept
+            between analyses so only the changed days of the season plan are recomputed
+        field_id: Identifier of the field in the planner
+    Returns:
+        Dictionary with irrigation schedule and recommendations
+    """
+    try:
+        # Base water requirement
+        base_daily_water = crop_data.get("daily_water_requirement", 0)
+
+        # NumPy and the engine are imported here so that importing the core package stays cheap
+        import numpy as np
+        from irrigation_core.engine import DEFAULT_IRRIGATION_COUNT, plan_irrigation_batch
+
+        # Daily forecast values (lists or forecast arrays); missing days fall back to the averages
+        avg_temp = weather_data.get("avg_temp", 25)
+        avg_rain_prob = weather_data.get("avg_rain_prob", 0)
+        temps = weather_data.get("temps", [])
+        rain_probs = weather_data.get("rain_probs", [])
+        n_days = len(weather_data.get("dates", []))
+        day_temps = np.full(max(n_days, 1), avg_temp, dtype=float)
+        day_temps[:min(n_days, len(temps))] = temps[:n_days]
+        day_rain_probs = np.full(max(n_days, 1), avg_rain_prob, dtype=float)
+        day_rain_probs[:min(n_days, len(rain_probs))] = rain_probs[:n_days]
+
+        # Irrigation days fired by the root-zone water balance (fixed irrigation_period if it cannot run)
+        if planner is not None:
+            balance = planned_water_balance_schedule(planner, field_id, weather_data, field_data, crop_data)
+        else:
+            balance = water_balance_schedule(weather_data, field_data, crop_data)
+        day_offsets = None if balance is None else balance["day_offsets"]
+
+        # Plan this field with the vectorized engine (a batch of one)
+        plan = plan_irrigation_batch(
+            base_daily_water=[base_daily_water],
+            days_to_next=[field_data.get("days_to_next_irrigation", 7)],
+            urgency_score=[field_data.get("urgency_score", 2)],
+            irrigation_period=[field_data.get("irrigation_period", 7)],
+            disease_adjustment=[disease_data.get("irrigation_adjustment", 0)],
+            avg_temp=[avg_temp],
+            avg_rain_prob=[avg_rain_prob],
+            day_temps=[day_temps],
+            day_rain_probs=[day_rain_probs],
+            n_forecast_days=[n_days],
+            n_irrigations=DEFAULT_IRRIGATION_COUNT if day_offsets is None else len(day_offsets),
+            day_offsets=None if day_offsets is None else [day_offsets]
+        )
+
+        temp_adjustment = float(plan["temperature_adjustment"][0])
+        rain_adjustment = float(plan["rain_adjustment"][0])
+        disease_adjustment = float(plan["disease_adjustment"][0])
+        urgency_adjustment = float(plan["soil_urgency_adjustment"][0])
+        urgency_score = field_data.get("urgency_score", 2)
+        total_adjustment = float(plan["total_adjustment_factor"][0])
+        adjusted_water = float(plan["adjusted_water_requirement"][0])
+
+        today = datetime.date.today()
+        schedule = []
+        detailed_schedule = []
+
+        for i in range(plan["water_amount"].shape[1]):
+            current_date = today + datetime.timedelta(days=int(plan["day_offsets"][0, i]))
+            day_idx = int(plan["forecast_index"][0, i])
+            temperature = temps[day_idx] if 0 <= day_idx < len(temps) else None
+            rain_probability = rain_probs[day_idx] if 0 <= day_idx < len(rain_probs) else None
+            final_water = float(plan["water_amount"][0, i])
+
+            schedule.append({
+                "irrigation_number": i + 1,
+                "date": current_date,
+                "water_amount": final_water,
+                "adjustment_factor": float(plan["adjustment_factor"][0, i]),
+                "temperature": temperature,
+                "rain_probability": rain_probability,
+                "net_depth_mm": None if balance is None else float(balance["depth_mm"][i])
+            })
+
+            # Detailed schedule with individual adjustment factors
+            detailed_schedule.append({
+                "irrigation_number": i + 1,
+                "date": current_date,
+                "base_water": base_daily_water,
+                "final_water": final_water,
+                "temperature": temperature,
+                "temp_adjustment": float(plan["temp_adjustment"][0, i]),
+                "temp_effect": float(plan["temp_effect"][0, i]),
+                "rain_probability": rain_probability,
+                "rain_adjustment": float(plan["rain_adjustment_daily"][0, i]),
+                "rain_effect": float(plan["rain_effect"][0, i]),
+                "disease_adjustment": disease_adjustment,
+                "disease_effect": float(plan["disease_effect"][0, i]),
+                "soil_adjustment": urgency_adjustment,
+                "soil_effect": float(plan["soil_effect"][0, i]),
+                "total_adjustment": float(plan["total_adjustment"][0, i]),
+                "total_effect": float(plan["total_effect"][0, i])
+            })
+
+        # Crop water demand from the forecast's reference evapotranspiration (FAO-56 Kc table)
+        reference_et = weather_data.get("avg_et0")
+        crop_kc = None
+        if reference_et is not None:
+            from irrigation_core.et0 import CROP_COEFFICIENTS, crop_coefficient
+
+            crop_type = field_data.get("crop_type")
+            if crop_type in CROP_COEFFICIENTS:
+                crop_kc = float(crop_coefficient(crop_type, field_data.get("days_after_planting") or 0))
+
+        # Generate recommendations
+        recommendations = []
+
+        if temp_adjustment > 0:
+            recommendations.append("🌡️ Harorat yuqori bo'lgani uchun sug'orish miqdori oshirildi")
+
+        if rain_adjustment < 0:
+            recommendations.append("🌧️ Yomg'ir ehtimoli yuqori bo'lgani uchun sug'orish miqdori kamaytirildi")
+
+        if disease_data.get("requires_reduced_water", False):
+            recommendations.append(
+                f"🦠 {disease_data.get('disease_name')} kasalligi tufayli sug'orish miqdori kamaytirildi")
+
+        if urgency_score == 3:
+            recommendations.append("⚠️ Tuproq namligi juda past, tezda sug'orish tavsiya etiladi")
+
+        if balance is not None and not schedule:
+            if balance["horizon_days"] == 0:
+                recommendations.append("🌾 Ekin pishib yetilgan: mavsum yakunlandi, sug'orish talab etilmaydi")
+            else:
+                recommendations.append(
+                    f"💧 Tuproqdagi suv zaxirasi yetarli: yaqin {balance['horizon_days']} kun ichida "
+                    f"sug'orish talab etilmaydi")
+
+        return {
+            "base_water_requirement": base_daily_water,
+            "adjusted_water_requirement": adjusted_water,
+            "temperature_adjustment": temp_adjustment,
+            "rain_adjustment": rain_adjustment,
+            "disease_adjustment": disease_adjustment,
+            "soil_urgency_adjustment": urgency_adjustment,
+            "total_adjustment_factor": total_adjustment,
+            "reference_et": reference_et,
+            "crop_coefficient": crop_kc,
+            "crop_et": reference_et * crop_kc if crop_kc is not None else None,
+            "water_balance": balance is not None,
+            "season_update": None if balance is None or "recomputed_days" not in balance else {
+                "recomputed_days": balance["recomputed_days"],
+                "reused_days": balance["reused_days"],
+            },
+            "schedule": schedule,
+            "detailed_schedule": detailed_schedule,
+            "recommendations": recommendations,
+            "status": "success"
+        }
+    except Exception as e:
+        return {"status": "error", "message": f"Aqlli sug'orish jadvalini hisoblashda xatolik: {str(e)}"}
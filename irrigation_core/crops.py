@@ -0,0 +1,141 @@
+import datetime
+from datetime import timedelta
+
+# O'simlik turlari va ularning xususiyatlari
+osimlik_turlari = {
+    "bug'doy": {
+        "sugorish_davri": 10,  # Kunlarda
+        "pishib_yetilish_muddat": 4,  # Oylarda
+        "namlik_minimum": 30,
+        "namlik_optimal": 60,
+        "qurish_tezligi": 1.5
+    },
+    "makkajo'xori": {
+        "sugorish_davri": 7,
+        "pishib_yetilish_muddat": 3,
+        "namlik_minimum": 40,
+        "namlik_optimal": 70,
+        "qurish_tezligi": 2.0
+    },
+    "sholi": {
+        "sugorish_davri": 4,
+        "pishib_yetilish_muddat": 4,
+        "namlik_minimum": 60,
+        "namlik_optimal": 90,
+        "qurish_tezligi": 2.5
+    },
+    "paxta": {
+        "sugorish_davri": 8,
+        "pishib_yetilish_muddat": 5,
+        "namlik_minimum": 35,
+        "namlik_optimal": 65,
+        "qurish_tezligi": 1.8
+    },
+    "sabzavotlar": {
+        "sugorish_davri": 4,
+        "pishib_yetilish_muddat": 2,
+        "namlik_minimum": 45,
+        "namlik_optimal": 75,
+        "qurish_tezligi": 2.2
+    },
+    "kartoshka": {
+        "sugorish_davri": 6,
+        "pishib_yetilish_muddat": 3,
+        "namlik_minimum": 40,
+        "namlik_optimal": 70,
+        "qurish_tezligi": 1.7
+    },
+    "beda": {
+        "sugorish_davri": 12,
+        "pishib_yetilish_muddat": 2,
+        "namlik_minimum": 35,
+        "namlik_optimal": 65,
+        "qurish_tezligi": 1.4
+    },
+    "pomidor": {
+        "sugorish_davri": 3,
+        "pishib_yetilish_muddat": 3,
+        "namlik_minimum": 50,
+        "namlik_optimal": 80,
+        "qurish_tezligi": 2.3
+    },
+    "bodring": {
+        "sugorish_davri": 2,
+        "pishib_yetilish_muddat": 2,
+        "namlik_minimum": 55,
+        "namlik_optimal": 85,
+        "qurish_tezligi": 2.4
+    }
+}
+
+
+# Maydon rangini sug'orish jadvali va tuproq namligiga qarab aniqlash funksiyasi
+def maydon_rangini_olish(oxirgi_sugorilgan, ekin_turi, tuproq_namligi, ekish_sanasi=None):
+    if ekin_turi not in osimlik_turlari:
+        return "gray", "Ekin turi tanlanmagan"
+
+    sugorish_davri = osimlik_turlari[ekin_turi]["sugorish_davri"]
+    namlik_minimum = osimlik_turlari[ekin_turi]["namlik_minimum"]
+    namlik_optimal = osimlik_turlari[ekin_turi]["namlik_optimal"]
+
+    sugorishdan_otgan_kunlar = (datetime.date.today() - oxirgi_sugorilgan).days
+
+    # Pishib yetilish muddatini hisoblash
+    pishib_yetilish_holati = ""
+    if ekish_sanasi:
+        pishib_yetilish_muddat = osimlik_turlari[ekin_turi]["pishib_yetilish_muddat"] * 30  # oy kunlarga
+        utgan_kunlar = (datetime.date.today() - ekish_sanasi).days
+        qolgan_kunlar = pishib_yetilish_muddat - utgan_kunlar
+
+        if qolgan_kunlar <= 0:
+            pishib_yetilish_holati = "Pishib yetilgan"
+        else:
+            pishib_yetilish_holati = f"Pishib yetilishga {qolgan_kunlar} kun qoldi"
+
+    # Namlik holatini baholash
+    if tuproq_namligi < namlik_minimum and sugorishdan_otgan_kunlar >= sugorish_davri:
+        return "red", f"Tezda sug'orish kerak. {pishib_yetilish_holati}"
+    elif tuproq_namligi < namlik_minimum * 1.2 and sugorishdan_otgan_kunlar >= sugorish_davri - 2:
+        return "orange", f"Sug'orish kuni yaqinlashmoqda. {pishib_yetilish_holati}"
+    elif tuproq_namligi > namlik_optimal * 0.8 and sugorishdan_otgan_kunlar < sugorish_davri:
+        return "green", f"Yaqinda sug'orilgan. {pishib_yetilish_holati}"
+    elif pishib_yetilish_holati == "Pishib yetilgan":
+        return "purple", "Ekin hosilga tayyor"
+    else:
+        return "blue", f"Normal holat. {pishib_yetilish_holati}"
+
+
+def suv_talabini_hisoblash(suv_talabi, maydoni):
+    """Suv talabini hisoblash (m³)"""
+    # suv_talabi format: "5-7 mm/day"
+    if "-" in suv_talabi:
+        min_suv, max_suv = map(float, suv_talabi.split(" ")[0].split("-"))
+        ortacha_suv = (min_suv + max_suv) / 2  # mm/kun
+    else:
+        ortacha_suv = float(suv_talabi.split(" ")[0])  # mm/kun
+
+    # mm/kun -> m³/kun/gektar (1 mm = 10 m³/gektar)
+    kunlik_suv_m3_gektar = ortacha_suv * 10
+
+    # Umumiy suv hajmi (m³)
+    jami_suv_m3 = kunlik_suv_m3_gektar * (maydoni / 10000)  # maydoni m² dan gektarga o'tkaziladi
+
+    return jami_suv_m3
+
+
+def davomiylikni_hisoblash(davomiylik):
+    """Davomiylikni kunlarda hisoblash"""
+    # davomiylik format: "5-10 days"
+    if "-" in davomiylik:
+        min_kun, max_kun = map(int, davomiylik.split(" ")[0].split("-"))
+        ortacha_kun = (min_kun + max_kun) / 2
+    else:
+        ortacha_kun = int(davomiylik.split(" ")[0])
+
+    return ortacha_kun
+
+
+def keyingi_sugorish_kuni(oxirgi_sugorish_kuni, bosqich_davomiyligi):
+    """Keyingi sug'orish kunini hisoblash"""
+    keyingi_sana = oxirgi_sugorish_kuni + timedelta(days=bosqich_davomiyligi)
+    return keyingi_sana
@@ -0,0 +1,118 @@
+import csv
+import os
+import threading
+
+# Disease knowledge base shipped with the app (override with DISEASES_DB_PATH)
+DISEASES_CSV_PATH = os.environ.get(
+    "DISEASES_DB_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "diseases_database.csv")
+)
+
+# Result code of a leaf without disease; it has no row in the CSV
+HEALTHY_CODE = "sog_osimlik"
+
+HEALTHY = {
+    "code": HEALTHY_CODE,
+    "crop": None,
+    "name": "Sog'lom o'simlik",
+    "scientific_name": "",
+    "severity": "",
+    "description": "Bu o'simlikda biror kasallik belgilari aniqlanmadi.",
+    "symptoms": "",
+    "treatment": "Davolash talab etilmaydi. Muntazam sug'orish va o'g'itlashni davom ettiring.",
+    "fertilizers": ("Universal NPK o'g'it", "Organik o'g'it", "Mikroelementli o'g'it", "Humus"),
+    "prevention": "Profilaktika choralarini ko'rib turing, o'simliklarni muntazam tekshiring.",
+}
+
+# Codes produced by the image heuristics that are named differently in the CSV
+CODE_ALIASES = {
+    "pomidor_bakterial_dog": "pomidor_bakterioz",
+}
+
+# Crop names used by the irrigation planner -> crop names used in the CSV
+CROP_ALIASES = {
+    "bug'doy": "galla",
+    "sholi": "guruch",
+}
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def disease_record(row):
+    """One CSV row as a knowledge-base record; the fertilizer list is split once here"""
+    return {
+        "code": row["kasallik_kodi"],
+        "crop": row["o'simlik_turi"],
+        "name": row["nomi"],
+        "scientific_name": row["ilmiy_nomi"],
+        "severity": row["jiddiylik"],
+        "description": row["tavsif"],
+        "symptoms": row["belgilari"],
+        "treatment": row["davolash"],
+        "fertilizers": tuple(name.strip() for name in row["o'g'itlar"].split(",") if name.strip()),
+        "prevention": row["oldini_olish"],
+    }
+
+
+class DiseaseKnowledgeBase:
+    """
+    Disease records indexed by disease code and by crop.
+    Records are plain dictionaries shared by every caller, so treat them as read-only.
+    """
+
+    def __init__(self, records):
+        self.by_code = {HEALTHY_CODE: HEALTHY}
+        self.by_crop = {}
+        for record in records:
+            self.by_code[record["code"]] = record
+            self.by_crop.setdefault(record["crop"], []).append(record)
+
+    def __len__(self):
+        return len(self.by_code) - 1
+
+    def __contains__(self, code):
+        return CODE_ALIASES.get(code, code) in self.by_code
+
+    def get(self, code, default=None):
+        """Record of a disease code (heuristic aliases included), or default"""
+        return self.by_code.get(CODE_ALIASES.get(code, code), default)
+
+    def lookup(self, code):
+        """Record of a disease code; unknown codes get the healthy-plant record"""
+        return self.get(code, HEALTHY)
+
+    def for_crop(self, crop):
+        """Records of one crop in CSV order (planner crop names are mapped to CSV names)"""
+        return self.by_crop.get(CROP_ALIASES.get(crop, crop), [])
+
+    @property
+    def crops(self):
+        return list(self.by_crop)
+
+
+def read_diseases_csv(path):
+    """Read diseases_database.csv into a list of knowledge-base records"""
+    with open(path, 'r', encoding='utf-8') as fayl:
+        return [disease_record(row) for row in csv.DictReader(fayl) if row.get("kasallik_kodi")]
+
+
+def load_disease_kb(path=None):
+    """
+    DiseaseKnowledgeBase for a CSV file, cached per process and rebuilt when the file's mtime changes
+    Args:
+        path: Path to diseases_database.csv (defaults to DISEASES_CSV_PATH)
+    Returns:
+        DiseaseKnowledgeBase instance
+    """
+    path = path or DISEASES_CSV_PATH
+    mtime = os.stat(path).st_mtime_ns
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+    kb = DiseaseKnowledgeBase(read_diseases_csv(path))
+    with _cache_lock:
+        _cache[path] = (mtime, kb)
+    return kb
@@ -0,0 +1,134 @@
+import datetime
+
+import numpy as np
+
+# Number of irrigations planned per field (same as calculate_smart_irrigation)
+DEFAULT_IRRIGATION_COUNT = 5
+
+
+def _as_column(values, n, dtype=float):
+    """Broadcast a scalar or 1-D input to a float array of length n"""
+    arr = np.asarray(values, dtype=dtype)
+    if arr.ndim == 0:
+        arr = np.full(n, arr, dtype=dtype)
+    return arr
+
+
+# Vectorized multi-field irrigation planner
+def plan_irrigation_batch(base_daily_water, days_to_next, urgency_score, irrigation_period,
+                          disease_adjustment, avg_temp, avg_rain_prob, day_temps, day_rain_probs,
+                          n_forecast_days=None, n_irrigations=DEFAULT_IRRIGATION_COUNT, day_offsets=None):
+    """
+    Plan irrigation schedules for many fields in one vectorized pass.
+    Uses exactly the same rules as calculate_smart_irrigation, so a batch of one
+    field gives the same numbers as the single-field function.
+    Args:
+        base_daily_water: (N,) daily water requirement per field (m³)
+        days_to_next: (N,) days until the next scheduled irrigation
+        urgency_score: (N,) soil moisture urgency score (1, 2 or 3)
+        irrigation_period: (N,) days between irrigations
+        disease_adjustment: (N,) disease irrigation adjustment (e.g. -0.3)
+        avg_temp: (N,) average forecast temperature
+        avg_rain_prob: (N,) average forecast rain probability (%)
+        day_temps: (N, D) daily forecast temperatures
+        day_rain_probs: (N, D) daily forecast rain probabilities (%)
+        n_forecast_days: (N,) number of valid forecast days per field, default D
+        n_irrigations: number of irrigations to plan per field
+        day_offsets: Optional (N, n_irrigations) irrigation days from today (e.g. fired by the
+            water balance); each irrigation then uses the forecast of its own day. By default
+            irrigations follow irrigation_period and the i-th one uses the i-th forecast day
+    Returns:
+        Dictionary of NumPy arrays; per-field values have shape (N,),
+        per-irrigation values have shape (N, n_irrigations)
+    """
+    day_temps = np.atleast_2d(np.asarray(day_temps, dtype=float))
+    day_rain_probs = np.atleast_2d(np.asarray(day_rain_probs, dtype=float))
+    n = day_temps.shape[0]
+
+    base = _as_column(base_daily_water, n)
+    interval = _as_column(days_to_next, n, dtype=np.int64)
+    urgency = _as_column(urgency_score, n, dtype=np.int64)
+    period = _as_column(irrigation_period, n, dtype=np.int64)
+    disease_adj = _as_column(disease_adjustment, n)
+    avg_temp = _as_column(avg_temp, n)
+    avg_rain_prob = _as_column(avg_rain_prob, n)
+    if n_forecast_days is None:
+        n_days = np.full(n, day_temps.shape[1], dtype=np.int64)
+    else:
+        n_days = _as_column(n_forecast_days, n, dtype=np.int64)
+
+    # Weather adjustment factors
+    temp_adj = np.where(avg_temp > 30, 0.2, np.where(avg_temp < 15, -0.1, 0.0))
+    rain_adj = np.where(avg_rain_prob > 70, -0.3, np.where(avg_rain_prob > 40, -0.15, 0.0))
+
+    # Soil moisture urgency adjustment (high urgency means irrigate immediately)
+    urgency_adj = np.where(urgency == 3, 0.1, np.where(urgency == 1, -0.1, 0.0))
+    interval = np.where(urgency == 3, 0, interval)
+
+    total_adj = 1 + temp_adj + rain_adj + disease_adj + urgency_adj
+    adjusted_water = base * total_adj
+
+    # Forecast day used by each irrigation: the i-th day, or the last one available
+    steps = np.arange(n_irrigations)
+    if day_offsets is None:
+        day_idx = np.minimum(steps[None, :], (n_days - 1)[:, None])
+        has_day = day_idx >= 0
+    else:
+        day_offsets = np.asarray(day_offsets, dtype=np.int64).reshape(n, n_irrigations)
+        day_idx = day_offsets
+        has_day = (day_idx >= 0) & (day_idx < n_days[:, None])
+    safe_idx = np.clip(day_idx, 0, day_temps.shape[1] - 1)
+    rows = np.arange(n)[:, None]
+    day_temp = day_temps[rows, safe_idx]
+    day_rain = day_rain_probs[rows, safe_idx]
+
+    temp_day_adj = np.where(day_temp > 30, 0.15, np.where(day_temp < 15, -0.1, 0.0))
+    rain_day_adj = np.where(day_rain > 70, -0.4, np.where(day_rain > 40, -0.2, 0.0))
+    temp_day_adj = np.where(has_day, temp_day_adj, 0.0)
+    rain_day_adj = np.where(has_day, rain_day_adj, 0.0)
+    day_adj = 1.0 + temp_day_adj + rain_day_adj
+
+    water_amount = adjusted_water[:, None] * day_adj
+    base_col = base[:, None]
+
+    # Irrigation dates as day offsets from today
+    if day_offsets is None:
+        start_offset = np.where(interval > 0, interval, 0)
+        day_offsets = start_offset[:, None] + steps[None, :] * period[:, None]
+
+    return {
+        "base_water_requirement": base,
+        "adjusted_water_requirement": adjusted_water,
+        "temperature_adjustment": temp_adj,
+        "rain_adjustment": rain_adj,
+        "disease_adjustment": disease_adj,
+        "soil_urgency_adjustment": urgency_adj,
+        "total_adjustment_factor": total_adj,
+        "day_offsets": day_offsets,
+        "forecast_index": np.where(has_day, day_idx, -1),
+        "water_amount": np.maximum(0, water_amount),
+        "adjustment_factor": day_adj,
+        "temperature": np.where(has_day, day_temp, np.nan),
+        "rain_probability": np.where(has_day, day_rain, np.nan),
+        "temp_adjustment": temp_day_adj,
+        "temp_effect": base_col * temp_day_adj,
+        "rain_adjustment_daily": rain_day_adj,
+        "rain_effect": base_col * rain_day_adj,
+        "disease_effect": np.broadcast_to(base_col * disease_adj[:, None], water_amount.shape),
+        "soil_effect": np.broadcast_to(base_col * urgency_adj[:, None], water_amount.shape),
+        "total_adjustment": day_adj + disease_adj[:, None] + urgency_adj[:, None] - 1.0,
+        "total_effect": water_amount - base_col,
+    }
+
+
+def schedule_dates(day_offsets, today=None):
+    """
+    Convert day offsets from plan_irrigation_batch into datetime64[D] dates
+    Args:
+        day_offsets: Integer array of days from today
+        today: Start date, defaults to datetime.date.today()
+    Returns:
+        Array of datetime64[D] irrigation dates
+    """
+    today = today or datetime.date.today()
+    return np.datetime64(today, "D") + np.asarray(day_offsets).astype("timedelta64[D]")
@@ -0,0 +1,161 @@
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from irrigation_core.analysis import field_water_balance
+from irrigation_core.et0 import REGION_ELEVATIONS, daily_totals, reference_et
+from irrigation_core.water_balance import irrigation_volume_m3
+
+# Weather scenarios sampled when no ensemble size is given
+DEFAULT_SCENARIOS = 200
+
+# Standard deviation (°C) of the forecast temperature error on the first day, and its growth per day of lead time
+TEMP_ERROR = 1.0
+TEMP_ERROR_GROWTH = 0.4
+
+# Shape of the gamma distribution of a rainy slot's volume
+RAIN_SHAPE = 2.0
+
+# Percentiles reported for every irrigation
+PERCENTILES = (10, 50, 90)
+
+# Fewest scenarios handed to one worker thread (smaller chunks cost more in overhead than they gain)
+MIN_CHUNK_SCENARIOS = 100
+
+
+def sample_weather(forecast, n_scenarios, seed=None, rng=None):
+    """
+    Rain and temperature scenarios for the slots of a forecast.
+    A slot with a forecast rain volume rains with its probability of precipitation (pop),
+    with a gamma-distributed volume of mean volume / pop, so the expected rain of every slot
+    equals the forecast volume the deterministic plan counts; slots without a volume stay
+    dry. Temperatures get one error per scenario and calendar day, with a spread that
+    grows with lead time.
+    Args:
+        forecast: Forecast dictionary (weather.get_forecast) with per-slot dates, temps,
+            rain_probs (%) and optional rain_mm (mm per slot)
+        n_scenarios: Number of scenarios M
+        seed: Random seed (ignored when rng is given)
+        rng: Optional numpy Generator
+    Returns:
+        Dictionary with temps and rain_mm, (M, S) float arrays
+    """
+    rng = rng or np.random.default_rng(seed)
+    times = np.asarray(forecast["dates"], dtype="datetime64[s]")
+    temps = np.asarray(forecast["temps"], dtype=float)
+    pop = np.clip(np.asarray(forecast["rain_probs"], dtype=float) / 100, 0, 1)
+    volume = np.asarray(forecast.get("rain_mm", np.zeros(len(times))), dtype=float)
+
+    # A volume without a probability is taken as certain
+    pop = np.where((volume > 0) & (pop == 0), 1.0, pop)
+    rains = (rng.random((n_scenarios, len(times))) < pop) & (volume > 0)
+    mean = volume / np.where(pop > 0, pop, 1.0)
+    rain_mm = np.where(rains, rng.gamma(RAIN_SHAPE, mean / RAIN_SHAPE, (n_scenarios, len(times))), 0.0)
+
+    days, day_index = np.unique(times.astype("datetime64[D]"), return_inverse=True)
+    lead_days = (times - times[0]).astype(float) / 86400 if len(times) else np.zeros(0)
+    errors = rng.standard_normal((n_scenarios, len(days)))[:, day_index]
+    return {
+        "temps": temps + errors * (TEMP_ERROR + TEMP_ERROR_GROWTH * lead_days),
+        "rain_mm": rain_mm,
+    }
+
+
+def scenario_daily_weather(forecast, temps, rain_mm):
+    """
+    Daily reference ET and rain of weather scenarios, on the forecast's daily_dates
+    (the days summarize_forecast reports)
+    Args:
+        forecast: Forecast dictionary (weather.get_forecast)
+        temps, rain_mm: (M, S) scenario temperatures and rain (sample_weather)
+    Returns:
+        (et0, rain) daily arrays, (M, F) mm/day
+    """
+    result = reference_et(
+        forecast["dates"],
+        temps,
+        humidity=forecast["humidities"],
+        wind_speed=forecast["wind_speeds"],
+        clouds=forecast.get("clouds"),
+        latitude=forecast.get("latitude", 41.3),
+        longitude=forecast.get("longitude", 69.2),
+        elevation=REGION_ELEVATIONS.get(forecast.get("region"), 0),
+    )
+    days, et0 = daily_totals(forecast["dates"], result["et0"], result["hours"])
+    rain = daily_totals(forecast["dates"], rain_mm, result["hours"])[1]
+    selected = np.searchsorted(days, np.asarray(forecast["daily_dates"]).astype("datetime64[D]"))
+    return et0[:, selected], rain[:, selected]
+
+
+def _nth_irrigations(irrigation_mm):
+    """(M, K) day offsets and depths of each scenario's k-th irrigation, NaN where it has fewer"""
+    fired = irrigation_mm > 0
+    counts = fired.sum(axis=1)
+    n_max = int(counts.max()) if len(counts) else 0
+    rows, days = np.nonzero(fired)
+    order = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+    day_offsets = np.full((len(counts), n_max), np.nan)
+    depths = np.full((len(counts), n_max), np.nan)
+    day_offsets[rows, order] = days
+    depths[rows, order] = irrigation_mm[rows, days]
+    return day_offsets, depths
+
+
+def ensemble_irrigation(forecast, field_data, crop_data, n_scenarios=DEFAULT_SCENARIOS, workers=None,
+                        seed=None, horizon_days=None):
+    """
+    Irrigation plan of one field under many sampled weather scenarios.
+    Every scenario runs through the season water balance (field_water_balance); scenarios
+    are split between worker threads in chunks of at least MIN_CHUNK_SCENARIOS.
+    Args:
+        forecast: Forecast dictionary (weather.get_forecast)
+        field_data: Field status analysis (analyze_field_status)
+        crop_data: Crop water needs analysis (analyze_crop_water_needs)
+        n_scenarios: Ensemble size M
+        workers: Worker threads (defaults to the number of CPUs)
+        seed: Random seed of the scenarios (the result does not depend on workers)
+        horizon_days: Days simulated (see field_water_balance)
+    Returns:
+        Dictionary with percentiles (PERCENTILES) and, for the k-th irrigation of the
+        scenarios, day_offset (K, 3) and volume_m3 (K, 3) percentiles and probability (K,),
+        the share of scenarios that need it; plus irrigation_count (3,) and total_m3 (3,)
+        percentiles over the season and the number of scenarios; None when the field has
+        no crop or area to run the balance on
+    """
+    weather = sample_weather(forecast, n_scenarios, seed=seed)
+    workers = workers or os.cpu_count() or 1
+    n_chunks = max(1, min(workers, math.ceil(n_scenarios / MIN_CHUNK_SCENARIOS)))
+    chunks = np.array_split(np.arange(n_scenarios), n_chunks)
+
+    def run(rows):
+        et0, rain = scenario_daily_weather(forecast, weather["temps"][rows], weather["rain_mm"][rows])
+        return field_water_balance(et0, rain, field_data, crop_data, horizon_days)
+
+    if n_chunks > 1:
+        with ThreadPoolExecutor(max_workers=n_chunks, thread_name_prefix="irrigation-ensemble") as pool:
+            results = list(pool.map(run, chunks))
+    else:
+        results = [run(chunks[0])]
+    if results[0] is None:
+        return None
+
+    irrigation = np.concatenate([result["irrigation_mm"] for result in results])
+    day_offsets, depths = _nth_irrigations(irrigation)
+    volumes = irrigation_volume_m3(depths, crop_data["area"])
+    has_irrigation = ~np.isnan(volumes)
+    if volumes.shape[1]:
+        day_offset = np.nanpercentile(day_offsets, PERCENTILES, axis=0, method="nearest").T
+        volume_m3 = np.nanpercentile(volumes, PERCENTILES, axis=0).T
+    else:
+        day_offset = volume_m3 = np.empty((0, len(PERCENTILES)))
+    return {
+        "scenarios": n_scenarios,
+        "percentiles": PERCENTILES,
+        "day_offset": day_offset,
+        "volume_m3": volume_m3,
+        "probability": has_irrigation.mean(axis=0),
+        "irrigation_count": np.percentile(has_irrigation.sum(axis=1), PERCENTILES),
+        "total_m3": np.percentile(irrigation_volume_m3(irrigation.sum(axis=1), crop_data["area"]), PERCENTILES),
+    }
@@ -0,0 +1,282 @@
+import numpy as np
+
+# Solar constant (MJ m-2 min-1) and Stefan-Boltzmann constant per hour (MJ K-4 m-2 h-1), FAO-56
+SOLAR_CONSTANT = 0.0820
+STEFAN_BOLTZMANN_HOURLY = 2.043e-10
+
+# Albedo of the grass reference crop
+ALBEDO = 0.23
+
+# Hargreaves radiation coefficient for interior (non-coastal) regions, FAO-56 eq. 50
+KRS_INTERIOR = 0.16
+
+# Bounds of the relative shortwave radiation Rs/Rso used in the net longwave term
+MIN_RELATIVE_RADIATION = 0.3
+
+# Height (m) of the wind speed reported by OpenWeatherMap
+OWM_WIND_HEIGHT = 10
+
+# Slot length (hours) assumed for a series with a single timestamp (OpenWeatherMap 3-hour forecast)
+DEFAULT_SLOT_HOURS = 3
+
+# Approximate elevation (m) of each region's weather city (keys of weather_api.UZB_CITIES)
+REGION_ELEVATIONS = {
+    "Toshkent": 455,
+    "Samarqand": 702,
+    "Buxoro": 225,
+    "Farg'ona": 580,
+    "Andijon": 475,
+    "Namangan": 450,
+    "Xorazm": 100,
+    "Qashqadaryo": 375,
+    "Surxondaryo": 302,
+    "Navoiy": 347,
+    "Jizzax": 370,
+    "Sirdaryo": 275,
+    "Nukus": 75,
+}
+
+# Crop coefficients per osimlik_turlari crop (FAO-56 table 12 single Kc values) and the length in
+# days of the initial, development, mid-season and late stages (summing to pishib_yetilish_muddat)
+CROP_COEFFICIENTS = {
+    "bug'doy": {"kc_ini": 0.7, "kc_mid": 1.15, "kc_end": 0.4, "stages": (20, 30, 45, 25)},
+    "makkajo'xori": {"kc_ini": 0.3, "kc_mid": 1.2, "kc_end": 0.35, "stages": (20, 25, 30, 15)},
+    "sholi": {"kc_ini": 1.05, "kc_mid": 1.2, "kc_end": 0.75, "stages": (30, 30, 40, 20)},
+    "paxta": {"kc_ini": 0.35, "kc_mid": 1.2, "kc_end": 0.7, "stages": (30, 40, 50, 30)},
+    "sabzavotlar": {"kc_ini": 0.7, "kc_mid": 1.05, "kc_end": 0.95, "stages": (15, 15, 20, 10)},
+    "kartoshka": {"kc_ini": 0.5, "kc_mid": 1.15, "kc_end": 0.75, "stages": (20, 25, 30, 15)},
+    "beda": {"kc_ini": 0.4, "kc_mid": 0.95, "kc_end": 0.9, "stages": (10, 20, 20, 10)},
+    "pomidor": {"kc_ini": 0.6, "kc_mid": 1.15, "kc_end": 0.8, "stages": (20, 25, 30, 15)},
+    "bodring": {"kc_ini": 0.6, "kc_mid": 1.0, "kc_end": 0.75, "stages": (15, 15, 20, 10)},
+}
+
+
+def slot_hours(times):
+    """
+    Length in hours of each slot of a sorted time series: the gap to the next slot
+    (the last slot repeats the previous gap)
+    """
+    times = np.asarray(times, dtype="datetime64[s]")
+    if len(times) < 2:
+        return np.full(len(times), float(DEFAULT_SLOT_HOURS))
+    gaps = np.diff(times).astype(np.int64) / 3600
+    return np.append(gaps, gaps[-1])
+
+
+def saturation_vapour_pressure(temp):
+    """Saturation vapour pressure (kPa) at air temperature temp (°C)"""
+    return 0.6108 * np.exp(17.27 * temp / (temp + 237.3))
+
+
+def wind_speed_2m(wind_speed, height=OWM_WIND_HEIGHT):
+    """Wind speed (m/s) measured at height (m) converted to 2 m, FAO-56 eq. 47"""
+    return wind_speed * 4.87 / np.log(67.8 * height - 5.42)
+
+
+def extraterrestrial_radiation(times, latitude, longitude, hours):
+    """
+    Extraterrestrial radiation Ra (MJ m-2 per slot) of slots centred on UTC timestamps, FAO-56 eq. 28
+    Args:
+        times: (S,) datetime64 slot centres in UTC
+        latitude: (R, 1) or scalar latitude in degrees (north positive)
+        longitude: (R, 1) or scalar longitude in degrees (east positive)
+        hours: (S,) slot lengths in hours
+    Returns:
+        (R, S) array, zero for slots entirely at night
+    """
+    times = np.asarray(times, dtype="datetime64[s]")
+    day = times.astype("datetime64[D]")
+    doy = (day - day.astype("datetime64[Y]")).astype(np.int64) + 1
+    utc_hour = (times - day).astype(np.int64) / 3600
+
+    phi = np.radians(latitude)
+    inverse_distance = 1 + 0.033 * np.cos(2 * np.pi * doy / 365)
+    declination = 0.409 * np.sin(2 * np.pi * doy / 365 - 1.39)
+    b = 2 * np.pi * (doy - 81) / 364
+    seasonal_correction = 0.1645 * np.sin(2 * b) - 0.1255 * np.cos(b) - 0.025 * np.sin(b)
+
+    # Solar time angle at the slot centre, wrapped to [-pi, pi)
+    solar_hour = utc_hour + np.asarray(longitude) / 15 + seasonal_correction
+    omega = (np.pi / 12 * (solar_hour - 12) + np.pi) % (2 * np.pi) - np.pi
+    sunset = np.arccos(np.clip(-np.tan(phi) * np.tan(declination), -1, 1))
+    omega1 = np.clip(omega - np.pi * hours / 24, -sunset, sunset)
+    omega2 = np.clip(omega + np.pi * hours / 24, -sunset, sunset)
+
+    ra = 12 * 60 / np.pi * SOLAR_CONSTANT * inverse_distance * (
+        (omega2 - omega1) * np.sin(phi) * np.sin(declination) +
+        np.cos(phi) * np.cos(declination) * (np.sin(omega2) - np.sin(omega1)))
+    return np.maximum(ra, 0)
+
+
+def _daily_temperature_range(times, temp, longitude):
+    """
+    Mean, maximum and minimum temperature of each slot's local solar day, broadcast back to the slots
+    Args:
+        times: (S,) sorted datetime64 UTC timestamps
+        temp: (R, S) temperatures
+        longitude: (R, 1) longitudes, which shift each region's day boundary
+    Returns:
+        Three (R, S) arrays
+    """
+    n_regions, n_slots = temp.shape
+    seconds = np.asarray(times, dtype="datetime64[s]").astype(np.int64)
+    local_day = np.floor((seconds[None, :] / 3600 + longitude / 15) / 24).astype(np.int64)
+    local_day -= local_day.min(initial=0)
+
+    # Rows are sorted by day, so (region, day) keys are sorted over the flattened array
+    keys = (np.arange(n_regions)[:, None] * (local_day.max(initial=0) + 1) + local_day).ravel()
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    group = np.cumsum(np.r_[False, keys[1:] != keys[:-1]])
+    flat = temp.ravel()
+    tmax = np.maximum.reduceat(flat, starts)[group]
+    tmin = np.minimum.reduceat(flat, starts)[group]
+    tmean = (np.add.reduceat(flat, starts) / np.diff(np.r_[starts, len(flat)]))[group]
+    return tmean.reshape(temp.shape), tmax.reshape(temp.shape), tmin.reshape(temp.shape)
+
+
+def reference_et(times, temp, humidity=None, wind_speed=None, clouds=None, latitude=41.3, longitude=69.2,
+                 elevation=0, solar_radiation=None, wind_height=OWM_WIND_HEIGHT):
+    """
+    Grass reference evapotranspiration ET0 of every slot of one or more regions in one pass.
+    Uses the FAO-56 Penman-Monteith equation for short periods (eq. 53) where humidity and
+    wind speed are known, and the Hargreaves equation (eq. 52) for the remaining slots.
+    Solar radiation is taken from solar_radiation, or estimated from cloud cover (Angstrom,
+    eq. 35 with n/N = 1 - cloud fraction), or from the daily temperature range (eq. 50).
+    Args:
+        times: (S,) datetime64 slot centres in UTC, sorted, shared by every region
+        temp: (R, S) or (S,) air temperature (°C)
+        humidity: (R, S) relative humidity (%), NaN where unknown
+        wind_speed: (R, S) wind speed (m/s) at wind_height, NaN where unknown
+        clouds: (R, S) cloud cover (%), NaN where unknown
+        latitude, longitude: (R,) or scalar coordinates in degrees
+        elevation: (R,) or scalar elevation (m)
+        solar_radiation: (R, S) measured shortwave radiation (MJ m-2 per slot), NaN where unknown
+        wind_height: Height of the wind measurement (m)
+    Returns:
+        Dictionary with "et0" (R, S) mm per slot, "hours" (S,) slot lengths and
+        "penman_monteith" (R, S) bool, False where Hargreaves was used
+    """
+    temp = np.atleast_2d(np.asarray(temp, dtype=float))
+    shape = temp.shape
+
+    def column(values):
+        return np.asarray(values, dtype=float).reshape(-1, 1) if np.ndim(values) else float(values)
+
+    def field(values):
+        if values is None:
+            return np.full(shape, np.nan)
+        return np.broadcast_to(np.asarray(values, dtype=float), shape)
+
+    humidity, wind_speed, clouds, solar_radiation = (field(v) for v in (humidity, wind_speed, clouds,
+                                                                         solar_radiation))
+    latitude, longitude, elevation = column(latitude), column(longitude), column(elevation)
+    hours = slot_hours(times)
+
+    ra = extraterrestrial_radiation(times, latitude, longitude, hours)
+    tmean, tmax, tmin = _daily_temperature_range(times, temp, np.broadcast_to(longitude, (shape[0], 1)))
+    temperature_range = np.sqrt(np.maximum(tmax - tmin, 0))
+
+    # Shortwave radiation: measured, else from cloud cover, else from the temperature range.
+    # The relative radiation Rs/Rso of the estimates does not depend on Ra, so it also holds at night
+    clear_sky_factor = 0.75 + 2e-5 * elevation
+    estimated_ratio = np.where(np.isnan(clouds), KRS_INTERIOR * temperature_range,
+                               0.25 + 0.5 * (1 - clouds / 100)) / clear_sky_factor
+    rso = clear_sky_factor * ra
+    measured = ~np.isnan(solar_radiation)
+    daytime = rso > 0
+    rs = np.where(measured, solar_radiation, estimated_ratio * rso)
+    relative = np.where(measured & daytime, rs / np.where(daytime, rso, 1), estimated_ratio)
+    relative = np.clip(relative, MIN_RELATIVE_RADIATION, 1)
+
+    es = saturation_vapour_pressure(temp)
+    ea = es * np.nan_to_num(humidity, nan=0) / 100
+    net_longwave = (STEFAN_BOLTZMANN_HOURLY * hours * (temp + 273.16) ** 4 *
+                    (0.34 - 0.14 * np.sqrt(ea)) * (1.35 * relative - 0.35))
+    net_radiation = (1 - ALBEDO) * rs - net_longwave
+    soil_heat = np.where(daytime, 0.1, 0.5) * net_radiation
+
+    pressure = 101.3 * ((293 - 0.0065 * elevation) / 293) ** 5.26
+    gamma = 0.665e-3 * pressure
+    delta = 4098 * es / (temp + 237.3) ** 2
+    u2 = wind_speed_2m(np.nan_to_num(wind_speed, nan=0), wind_height)
+    penman_monteith = (0.408 * delta * (net_radiation - soil_heat) +
+                       gamma * 37 * hours / (temp + 273) * u2 * (es - ea)) / (delta + gamma * (1 + 0.34 * u2))
+
+    # Hargreaves with the day's mean temperature and range, spread over the slots by their Ra
+    hargreaves = 0.0023 * (tmean + 17.8) * temperature_range * 0.408 * ra
+
+    use_pm = ~(np.isnan(humidity) | np.isnan(wind_speed))
+    return {
+        "et0": np.maximum(np.where(use_pm, penman_monteith, hargreaves), 0),
+        "hours": hours,
+        "penman_monteith": use_pm,
+    }
+
+
+def daily_totals(times, values, hours):
+    """
+    Sum per-slot values into calendar days (of the timestamps), scaled to 24 hours so that
+    partly covered first and last days are comparable with full ones
+    Args:
+        times: (S,) sorted datetime64 timestamps
+        values: (R, S) or (S,) per-slot amounts (e.g. ET0 in mm)
+        hours: (S,) slot lengths in hours
+    Returns:
+        (days, totals) with days a (D,) datetime64[D] array and totals (R, D) or (D,)
+    """
+    day = np.asarray(times, dtype="datetime64[s]").astype("datetime64[D]")
+    days, starts = np.unique(day, return_index=True)
+    if len(day) == 0:
+        return days, np.zeros(np.shape(values)[:-1] + (0,))
+    totals = np.add.reduceat(values, starts, axis=-1)
+    covered = np.add.reduceat(hours, starts)
+    return days, totals * 24 / covered
+
+
+def forecast_reference_et(forecast, elevation=None):
+    """
+    Reference ET of a parsed forecast (irrigation_core.forecast.build_forecast output)
+    Args:
+        forecast: Forecast dictionary with per-slot dates, temps, humidities, wind_speeds,
+            optional clouds, and the latitude, longitude and region of its city
+        elevation: Elevation (m), defaults to REGION_ELEVATIONS of the forecast's region
+    Returns:
+        reference_et output for the forecast's slots, plus "days" and "daily_et0" (mm/day)
+    """
+    if elevation is None:
+        elevation = REGION_ELEVATIONS.get(forecast.get("region"), 0)
+    result = reference_et(
+        forecast["dates"],
+        forecast["temps"],
+        humidity=forecast["humidities"],
+        wind_speed=forecast["wind_speeds"],
+        clouds=forecast.get("clouds"),
+        latitude=forecast.get("latitude", 41.3),
+        longitude=forecast.get("longitude", 69.2),
+        elevation=elevation,
+    )
+    result["et0"] = result["et0"][0]
+    result["penman_monteith"] = result["penman_monteith"][0]
+    result["days"], result["daily_et0"] = daily_totals(forecast["dates"], result["et0"], result["hours"])
+    return result
+
+
+def crop_coefficient(crop, days_after_planting):
+    """
+    Crop coefficient Kc of a crop on the given days after planting: constant over the initial
+    stage, linear through development, constant mid-season and linear to kc_end in the late stage
+    Args:
+        crop: Key of osimlik_turlari (see CROP_COEFFICIENTS)
+        days_after_planting: Scalar or array of days
+    Returns:
+        Kc with the shape of days_after_planting
+    """
+    table = CROP_COEFFICIENTS[crop]
+    ends = np.cumsum(table["stages"])
+    return np.interp(days_after_planting, np.r_[0, ends],
+                     [table["kc_ini"], table["kc_ini"], table["kc_mid"], table["kc_mid"], table["kc_end"]])
+
+
+def crop_demand(et0, crop, days_after_planting):
+    """Crop evapotranspiration ETc = Kc * ET0 (same units as et0)"""
+    return crop_coefficient(crop, days_after_planting) * np.asarray(et0)
@@ -0,0 +1,150 @@
+import numpy as np
+
+# Grid cell size in degrees (about 1 km); drawn fields are usually smaller than a cell
+DEFAULT_CELL_SIZE = 0.01
+
+# Fields spanning more cells than this are kept in a short list checked by every query
+MAX_CELLS_PER_FIELD = 256
+
+
+def geometry_of(shape):
+    """GeoJSON geometry of a field shape stored either as a Feature or as a bare geometry"""
+    if shape and "geometry" in shape:
+        return shape["geometry"]
+    return shape
+
+
+def polygon_rings(geometry):
+    """
+    Rings of a Polygon / MultiPolygon as lists of (M, 2) arrays
+    Returns:
+        List of polygons, each a list of rings (outer ring first, then holes);
+        empty for points and lines, which have no area to hit
+    """
+    if not geometry:
+        return []
+    if geometry.get("type") == "Polygon":
+        polygons = [geometry["coordinates"]]
+    elif geometry.get("type") == "MultiPolygon":
+        polygons = geometry["coordinates"]
+    else:
+        return []
+    return [[np.asarray(ring, dtype=float)[:, :2] for ring in polygon if len(ring)] for polygon in polygons]
+
+
+def _all_points(coordinates):
+    """Flatten nested GeoJSON coordinates into an (M, 2) array"""
+    if coordinates and not isinstance(coordinates[0], (list, tuple)):
+        return np.asarray([coordinates[:2]], dtype=float)
+    return np.concatenate([_all_points(part) for part in coordinates])
+
+
+def point_in_ring(ring, lon, lat):
+    """Even-odd ray casting test of a point against one closed ring"""
+    x0, y0 = ring[:, 0], ring[:, 1]
+    x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+    crosses = (y0 > lat) != (y1 > lat)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_at = x0 + (lat - y0) * (x1 - x0) / (y1 - y0)
+    return bool(np.count_nonzero(crosses & (lon < x_at)) % 2)
+
+
+def point_in_polygons(polygons, lon, lat):
+    """True if the point lies inside any polygon (and outside its holes)"""
+    for rings in polygons:
+        if rings and point_in_ring(rings[0], lon, lat) and \
+                not any(point_in_ring(hole, lon, lat) for hole in rings[1:]):
+            return True
+    return False
+
+
+class FieldIndex:
+    """
+    Uniform-grid spatial index over field geometries.
+    Each field is registered in every grid cell its bounding box touches, so a click
+    only tests the fields of one cell and a viewport only visits the cells it covers.
+    Fields are appended in the same order as st.session_state.maydonlar; ids are list positions.
+    """
+
+    def __init__(self, cell_size=DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.large = []
+        self.polygons = []
+        self._bounds = np.empty((64, 4))
+
+    def __len__(self):
+        return len(self.polygons)
+
+    @property
+    def bounds(self):
+        """(N, 4) array of field bounding boxes: min_lon, min_lat, max_lon, max_lat"""
+        return self._bounds[:len(self.polygons)]
+
+    def _cell_range(self, min_lon, min_lat, max_lon, max_lat):
+        return (int(np.floor(min_lon / self.cell_size)), int(np.floor(min_lat / self.cell_size)),
+                int(np.floor(max_lon / self.cell_size)), int(np.floor(max_lat / self.cell_size)))
+
+    def add(self, shape):
+        """Index one field shape (Feature or geometry) and return its id"""
+        field_id = len(self.polygons)
+        if field_id == len(self._bounds):
+            self._bounds = np.concatenate([self._bounds, np.empty_like(self._bounds)])
+
+        geometry = geometry_of(shape)
+        polygons = polygon_rings(geometry)
+        self.polygons.append(polygons)
+        if not geometry or not geometry.get("coordinates"):
+            # Nothing to place on the map; keep the id so positions stay aligned
+            self._bounds[field_id] = np.nan
+            return field_id
+
+        # Outer rings bound a polygon; points and lines use all their coordinates
+        outer = [rings[0] for rings in polygons if rings]
+        if outer:
+            points = outer[0] if len(outer) == 1 else np.concatenate(outer)
+        else:
+            points = _all_points(geometry["coordinates"])
+        low, high = points.min(axis=0), points.max(axis=0)
+        box = (low[0], low[1], high[0], high[1])
+        self._bounds[field_id] = box
+        x0, y0, x1, y1 = self._cell_range(*box)
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > MAX_CELLS_PER_FIELD:
+            self.large.append(field_id)
+            return field_id
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                self.cells.setdefault((cx, cy), []).append(field_id)
+        return field_id
+
+    def extend(self, shapes):
+        """Index several shapes; returns their ids"""
+        return [self.add(shape) for shape in shapes]
+
+    def query_point(self, lon, lat):
+        """Ids of the fields whose polygon contains the point (e.g. a map click)"""
+        key = (int(np.floor(lon / self.cell_size)), int(np.floor(lat / self.cell_size)))
+        hits = []
+        for field_id in self.cells.get(key, []) + self.large:
+            min_lon, min_lat, max_lon, max_lat = self._bounds[field_id]
+            if min_lon <= lon <= max_lon and min_lat <= lat <= max_lat and \
+                    point_in_polygons(self.polygons[field_id], lon, lat):
+                hits.append(field_id)
+        return hits
+
+    def query_bbox(self, min_lon, min_lat, max_lon, max_lat):
+        """Sorted ids of the fields whose bounding box intersects the box (e.g. the map viewport)"""
+        x0, y0, x1, y1 = self._cell_range(min_lon, min_lat, max_lon, max_lat)
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(self.cells):
+            # The box covers more cells than are occupied; filtering every field at once is cheaper
+            candidates = np.arange(len(self.polygons))
+        else:
+            found = [self.cells.get((cx, cy), ()) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1)]
+            found = [ids for ids in found if ids] + ([self.large] if self.large else [])
+            if not found:
+                return np.empty(0, dtype=np.int64)
+            candidates = np.unique(np.concatenate(found)).astype(np.int64)
+
+        box = self._bounds[candidates]
+        overlaps = (box[:, 0] <= max_lon) & (box[:, 2] >= min_lon) & (box[:, 1] <= max_lat) & (box[:, 3] >= min_lat)
+        return candidates[overlaps]
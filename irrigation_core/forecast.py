@@ -0,0 +1,117 @@
+import numpy as np
+
+# Number of calendar days selected from the forecast
+FORECAST_DAYS = 7
+
+# Slots between these hours (inclusive) count as the noon forecast of a day
+NOON_HOURS = (11, 14)
+
+
+def parse_forecast_columns(data):
+    """
+    Parse an OpenWeatherMap 5-day / 3-hour response once into NumPy columns
+    Args:
+        data: Raw forecast response with a "list" of 3-hour slots
+    Returns:
+        Dictionary of equal-length arrays: time (datetime64[s]), temp, rain_prob,
+        wind_speed, humidity, clouds (%, NaN when missing), rain_mm (3-hour rain volume) and icon
+    """
+    entries = data["list"]
+    n = len(entries)
+    time = np.empty(n, dtype="datetime64[s]")
+    temp = np.empty(n, dtype=float)
+    rain_prob = np.empty(n, dtype=float)
+    wind_speed = np.empty(n, dtype=float)
+    humidity = np.empty(n, dtype=np.int64)
+    clouds = np.empty(n, dtype=float)
+    rain_mm = np.empty(n, dtype=float)
+    icon = np.empty(n, dtype="<U3")
+
+    for i, entry in enumerate(entries):
+        time[i] = np.datetime64(entry["dt_txt"].replace(" ", "T"), "s")
+        temp[i] = entry["main"]["temp"]
+        rain_prob[i] = entry.get("pop", 0)
+        wind_speed[i] = entry["wind"]["speed"]
+        humidity[i] = entry["main"]["humidity"]
+        clouds[i] = entry.get("clouds", {}).get("all", np.nan)
+        rain_mm[i] = entry.get("rain", {}).get("3h", 0)
+        icon[i] = entry["weather"][0]["icon"]
+
+    return {
+        "time": time,
+        "temp": np.rint(temp).astype(np.int64),
+        "rain_prob": rain_prob * 100,
+        "wind_speed": wind_speed,
+        "humidity": humidity,
+        "clouds": clouds,
+        "rain_mm": rain_mm,
+        "icon": icon,
+    }
+
+
+def daily_noon_index(times, days=FORECAST_DAYS):
+    """
+    Index of the noon slot of each forecast day (or the day's first slot if it has no noon slot)
+    Args:
+        times: Sorted datetime64 array of forecast slots
+        days: Number of calendar days from the first slot to select
+    Returns:
+        Integer array with one slot index per available day
+    """
+    if len(times) == 0:
+        return np.empty(0, dtype=np.int64)
+
+    day = times.astype("datetime64[D]")
+    day_offset = (day - day[0]).astype(np.int64)
+    hour = ((times - day) // np.timedelta64(1, "h")).astype(np.int64)
+    in_range = day_offset < days
+
+    # First slot of every day, then replace it with the first noon slot where one exists
+    available_days, first_index = np.unique(day_offset[in_range], return_index=True)
+    noon = in_range & (hour >= NOON_HOURS[0]) & (hour <= NOON_HOURS[1])
+    noon_days, noon_pos = np.unique(day_offset[noon], return_index=True)
+    selected = first_index.copy()
+    selected[np.searchsorted(available_days, noon_days)] = np.flatnonzero(noon)[noon_pos]
+    return selected
+
+
+def build_forecast(columns, days=FORECAST_DAYS):
+    """
+    Daily selection and weekly aggregates over a columnar forecast
+    Args:
+        columns: Output of parse_forecast_columns
+        days: Number of days for the daily selection
+    Returns:
+        Forecast dictionary whose per-slot and daily values are NumPy arrays
+    """
+    daily = daily_noon_index(columns["time"], days)
+    temps = columns["temp"]
+    rain_probs = columns["rain_prob"]
+
+    return {
+        "dates": columns["time"],
+        "temps": temps,
+        "rain_probs": rain_probs,
+        "icons": columns["icon"],
+        "wind_speeds": columns["wind_speed"],
+        "humidities": columns["humidity"],
+        "clouds": columns["clouds"],
+        "rain_mm": columns["rain_mm"],
+        "daily_index": daily,
+        "daily_dates": columns["time"][daily],
+        "daily_temps": temps[daily],
+        "daily_icons": columns["icon"][daily],
+        "daily_rain_probs": rain_probs[daily],
+        "daily_wind_speeds": columns["wind_speed"][daily],
+        "daily_humidities": columns["humidity"][daily],
+        "weekly_avg_temp": round(float(temps[:40].mean()), 1) if len(temps) else 0,
+        "weekly_avg_rain_prob": round(float(rain_probs[:40].mean()), 1) if len(rain_probs) else 0
+    }
+
+
+def format_day_month(times):
+    """Format a datetime64 array as "dd-mm" labels without going through Python datetimes"""
+    chars = np.datetime_as_string(np.asarray(times), unit="D").astype("<U10").view("<U1").reshape(-1, 10)
+    dash = np.full(len(chars), "-", dtype="<U1")
+    labels = np.column_stack([chars[:, 8], chars[:, 9], dash, chars[:, 5], chars[:, 6]])
+    return np.ascontiguousarray(labels).view("<U5").ravel()
@@ -0,0 +1,220 @@
+import threading
+
+import numpy as np
+
+from irrigation_core.water_balance import simulate_water_balance
+
+# Day-by-day inputs of a plan; a change in any of them invalidates the plan from that day on
+DAILY_INPUTS = ["demand", "rain_mm", "applied_mm", "observed_depletion"]
+
+# Daily inputs that use NaN for "no value" (all others are numbers once stored)
+NAN_INPUTS = {"observed_depletion"}
+
+# Per-field constants; a change in any of them invalidates the whole season
+FIELD_PARAMETERS = ["taw", "allowable_depletion", "refill_depletion", "initial_depletion"]
+
+
+def changed_entries(old, new, nan_equal=False):
+    """
+    Where two (N, D) arrays differ
+    (with nan_equal, NaN in both arrays counts as equal)
+    Returns:
+        (N,) bool array of the rows that changed and the first changed column (D when none)
+    """
+    if nan_equal:
+        # Compared bit for bit, so NaN equals NaN without isnan passes (-0.0 against 0.0 counts as a
+        # change, which only costs a re-run)
+        old, new = old.view(np.int64), new.view(np.int64)
+    changed = old != new
+    days = changed.any(axis=0)
+    return changed.any(axis=1), int(days.argmax()) if days.any() else old.shape[1]
+
+
+def _selector(rows):
+    """A slice for a run of consecutive rows (a view instead of a copy), else the rows themselves"""
+    if len(rows) and rows[-1] - rows[0] == len(rows) - 1 and (len(rows) < 2 or (np.diff(rows) == 1).all()):
+        return slice(int(rows[0]), int(rows[-1]) + 1)
+    return rows
+
+
+class IncrementalPlanner:
+    """
+    Season-long water-balance plans for many fields, kept between updates.
+    Each update compares the new daily inputs (demand, forecast rain, applied irrigation,
+    moisture readings) and field parameters with the stored ones, and re-runs the water
+    balance of a field only from its earliest changed day, starting from the stored
+    depletion of that day. Days before it are reused as they are.
+    All fields share one season calendar: day 0 is season_start.
+    """
+
+    def __init__(self, season_start, n_days):
+        self.season_start = np.datetime64(season_start, "D")
+        self.n_days = n_days
+        self.rows = {}
+        self.inputs = {name: np.empty((0, n_days)) for name in DAILY_INPUTS}
+        self.parameters = {name: np.empty(0) for name in FIELD_PARAMETERS}
+        self.depletion = np.empty((0, n_days + 1))
+        self.irrigation_mm = np.empty((0, n_days))
+        self.recomputed_days = 0
+        self.reused_days = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __contains__(self, field_id):
+        return field_id in self.rows
+
+    def _add_fields(self, field_ids):
+        new = [field_id for field_id in dict.fromkeys(field_ids) if field_id not in self.rows]
+        if not new:
+            return
+        for field_id in new:
+            self.rows[field_id] = len(self.rows)
+        pad = len(new)
+        for name in DAILY_INPUTS:
+            self.inputs[name] = np.vstack([self.inputs[name], np.full((pad, self.n_days), np.nan)])
+        for name in FIELD_PARAMETERS:
+            self.parameters[name] = np.append(self.parameters[name], np.full(pad, np.nan))
+        self.depletion = np.vstack([self.depletion, np.zeros((pad, self.n_days + 1))])
+        self.irrigation_mm = np.vstack([self.irrigation_mm, np.zeros((pad, self.n_days))])
+
+    def update(self, field_ids, demand, taw, allowable_depletion, refill_depletion, initial_depletion,
+               rain_mm=None, applied_mm=None, observed_depletion=None, from_day=None):
+        """
+        Store new inputs for some fields and bring their plans up to date
+        Args:
+            field_ids: (N,) field identifiers (any hashable); new ids start a plan from day 0
+            demand: (N, D) crop water demand (mm/day) over the whole season
+            taw, allowable_depletion, refill_depletion: (N,) root-zone parameters (mm),
+                see water_balance.root_zone_parameters
+            initial_depletion: (N,) depletion (mm) on season_start
+            rain_mm: Optional (N, D) or (D,) rain (mm/day), zero where not given
+            applied_mm: Optional (N, D) irrigation already applied (mm/day)
+            observed_depletion: Optional (N, D) depletion from moisture readings, NaN where none
+            from_day: Optional season day from which the inputs of every given field are known to
+                have changed (e.g. the first day of a new forecast): no diff is taken and every
+                field re-runs from that day; earlier days must be unchanged
+        Returns:
+            Dictionary with (N,) arrays recomputed_days and reused_days, and their totals
+        """
+        field_ids = list(field_ids)
+        n = len(field_ids)
+        shape = (n, self.n_days)
+        new_inputs = {
+            "demand": np.broadcast_to(np.asarray(demand, dtype=float), shape),
+            "rain_mm": np.broadcast_to(np.asarray(0.0 if rain_mm is None else rain_mm, dtype=float), shape),
+            "applied_mm": np.broadcast_to(np.asarray(0.0 if applied_mm is None else applied_mm, dtype=float),
+                                          shape),
+            "observed_depletion": np.broadcast_to(np.asarray(
+                np.nan if observed_depletion is None else observed_depletion, dtype=float), shape),
+        }
+        new_parameters = {
+            "taw": taw,
+            "allowable_depletion": allowable_depletion,
+            "refill_depletion": refill_depletion,
+            "initial_depletion": initial_depletion,
+        }
+        new_parameters = {name: np.broadcast_to(np.asarray(value, dtype=float), (n,))
+                          for name, value in new_parameters.items()}
+
+        with self._lock:
+            known = len(self.rows)
+            self._add_fields(field_ids)
+            rows = np.array([self.rows[field_id] for field_id in field_ids], dtype=np.int64)
+            selected = _selector(rows)
+
+            # Fields whose plan is no longer valid, and the earliest day any of them changed.
+            # Changed fields are re-run together from that day: the days a field re-runs before
+            # its own changed day have unchanged inputs and come out the same, and one pass over
+            # the days is cheaper than one pass per start day. Fields added by this update (rows
+            # past the known ones) start from day 0 without a diff
+            changed = rows >= known
+            day = 0 if changed.any() else self.n_days
+            if from_day is not None:
+                changed[:] = True
+                day = min(day, from_day)
+            for name in DAILY_INPUTS:
+                if changed.all():
+                    # Every field re-runs from day already: only an earlier change can move it, so
+                    # the diff stops at that day (and is skipped from day 0 or a given from_day)
+                    # and the inputs from the resulting day on are stored as they are
+                    if day and from_day is None:
+                        day = changed_entries(self.inputs[name][selected, :day], new_inputs[name][:, :day],
+                                              name in NAN_INPUTS)[1]
+                    self.inputs[name][selected, day:] = new_inputs[name][:, day:]
+                    continue
+                fields, first = changed_entries(self.inputs[name][selected], new_inputs[name], name in NAN_INPUTS)
+                if first < self.n_days:
+                    changed |= fields
+                    day = min(day, first)
+                    self.inputs[name][selected, first:] = new_inputs[name][:, first:]
+            for name in FIELD_PARAMETERS:
+                # Stored parameters are NaN only for fields added by this update, which run from day 0 anyway
+                fields = self.parameters[name][selected] != new_parameters[name]
+                if fields.any():
+                    changed |= fields
+                    day = 0
+                    self.parameters[name][selected] = new_parameters[name]
+
+            start = np.where(changed, day, self.n_days)
+            if changed.any():
+                self._recompute(selected if changed.all() else rows[changed], day)
+
+            recomputed = self.n_days - start
+            self.recomputed_days += int(recomputed.sum())
+            self.reused_days += int(start.sum())
+        return {
+            "recomputed_days": recomputed,
+            "reused_days": start,
+            "total_recomputed_days": int(recomputed.sum()),
+            "total_reused_days": int(start.sum()),
+        }
+
+    def _recompute(self, rows, day):
+        """Re-run the water balance of some fields from one day to the end of the season"""
+        initial = self.parameters["initial_depletion"][rows] if day == 0 else self.depletion[rows, day]
+        applied = self.inputs["applied_mm"][rows, day:]
+        observed = self.inputs["observed_depletion"][rows, day:]
+        # Inputs without a value are left out: checking is cheaper than the balance's day-major copies
+        result = simulate_water_balance(
+            self.inputs["demand"][rows, day:],
+            self.parameters["taw"][rows],
+            self.parameters["allowable_depletion"][rows],
+            initial,
+            rain_mm=self.inputs["rain_mm"][rows, day:],
+            applied_mm=applied if applied.any() else None,
+            refill_depletion=self.parameters["refill_depletion"][rows],
+            observed_depletion=None if np.isnan(observed).all() else observed,
+        )
+        self.depletion[rows, day:] = result["depletion"]
+        self.irrigation_mm[rows, day:] = result["irrigation_mm"]
+
+    def plan(self, field_id):
+        """
+        Stored season plan of one field
+        Returns:
+            Dictionary with dates (datetime64[D]) and depth_mm of every irrigation, and the daily
+            depletion (D + 1,) and irrigation_mm (D,) arrays; None for an unknown field
+        """
+        row = self.rows.get(field_id)
+        if row is None:
+            return None
+        irrigation = self.irrigation_mm[row]
+        days = np.flatnonzero(irrigation)
+        return {
+            "dates": self.season_start + days.astype("timedelta64[D]"),
+            "depth_mm": irrigation[days],
+            "depletion": self.depletion[row].copy(),
+            "irrigation_mm": irrigation.copy(),
+        }
+
+    def stats(self):
+        """Days recomputed and reused over every update so far"""
+        total = self.recomputed_days + self.reused_days
+        return {
+            "fields": len(self.rows),
+            "recomputed_days": self.recomputed_days,
+            "reused_days": self.reused_days,
+            "reuse_ratio": self.reused_days / total if total else 0.0,
+        }
@@ -0,0 +1,302 @@
+import bisect
+import csv
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from irrigation_core.disease_kb import DISEASES_CSV_PATH, load_disease_kb
+
+# Plant reference data shipped with the app (override with PLANTS_DB_PATH)
+PLANTS_CSV_PATH = os.environ.get(
+    "PLANTS_DB_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "plants_database.csv")
+)
+
+# Okina/apostrophe variants typed for Uzbek o' and g' (ASCII, ʻ, ʼ, ‘, ’, `, ´)
+APOSTROPHES = "'ʻʼ‘’`´"
+_APOSTROPHE_TABLE = str.maketrans("", "", APOSTROPHES)
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Title words count this many times, so a match in a name outranks one in a description
+TITLE_WEIGHT = 3
+
+# Query words of at least this length also match longer index terms ("kasal" -> "kasalligi")
+MIN_PREFIX_LENGTH = 3
+
+# Upper bound of index terms one query word expands to (the most frequent are kept)
+MAX_PREFIX_TERMS = 64
+
+# Merged postings of prefix query words kept between queries
+WORD_CACHE_ENTRIES = 1024
+
+# Postings read from each query word before the first stopping check of the top-k search
+FIRST_READ_DEPTH = 256
+
+# Terms in at least 1/DENSE_SHARE of the documents also keep their impacts in a dense array
+# indexed by document id (4 bytes a document, less than their postings take), so the top-k
+# search looks them up directly instead of binary searching the postings
+DENSE_SHARE = 4
+
+# Record fields indexed for each document kind
+PLANT_FIELDS = ["tur", "ilmiy_nomi", "turi_guruh", "tavsif", "parvarish", "foydalanish", "mintaqa"]
+DISEASE_FIELDS = ["crop", "scientific_name", "severity", "description", "symptoms", "treatment",
+                  "fertilizers", "prevention"]
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def normalize(text):
+    """Lowercase text with every apostrophe variant removed, so o'g'it, oʻgʻit and ogit match"""
+    return text.lower().translate(_APOSTROPHE_TABLE)
+
+
+def tokenize(text):
+    """Normalized words of a text"""
+    return _TOKEN_RE.findall(normalize(text))
+
+
+def _field_text(value):
+    if isinstance(value, (list, tuple)):
+        return " ".join(value)
+    return value or ""
+
+
+def plant_documents(path):
+    """Search documents of plants_database.csv"""
+    with open(path, 'r', encoding='utf-8') as fayl:
+        rows = [row for row in csv.DictReader(fayl) if row.get("tur")]
+    return [{
+        "kind": "osimlik",
+        "key": row["tur"],
+        "title": row["nomi"],
+        "text": " ".join(row.get(field) or "" for field in PLANT_FIELDS),
+        "summary": row.get("tavsif", ""),
+        "record": row,
+    } for row in rows]
+
+
+def disease_documents(path):
+    """Search documents of diseases_database.csv, taken from the shared disease knowledge base"""
+    kb = load_disease_kb(path)
+    return [{
+        "kind": "kasallik",
+        "key": record["code"],
+        "title": record["name"],
+        "text": " ".join(_field_text(record[field]) for field in DISEASE_FIELDS),
+        "summary": record["description"],
+        "record": record,
+    } for crop in kb.crops for record in kb.for_crop(crop)]
+
+
+class SearchIndex:
+    """
+    In-memory inverted index ranked with BM25.
+    Each term keeps an array of document ids and an array of precomputed BM25 impacts,
+    so a query only gathers and adds the postings of its terms. Query words also match
+    longer terms that start with them, which covers most Uzbek suffixes.
+    """
+
+    def __init__(self, documents, k1=BM25_K1, b=BM25_B):
+        self.documents = documents
+        kinds = sorted({document["kind"] for document in documents})
+        self.kind_ids = {kind: i for i, kind in enumerate(kinds)}
+        self.kinds = np.array([self.kind_ids[document["kind"]] for document in documents], dtype=np.int8)
+
+        postings = {}
+        lengths = np.zeros(len(documents))
+        for doc_id, document in enumerate(documents):
+            counts = {}
+            title_terms = tokenize(document["title"])
+            for term in title_terms:
+                counts[term] = counts.get(term, 0) + TITLE_WEIGHT
+            body_terms = tokenize(document["text"])
+            for term in body_terms:
+                counts[term] = counts.get(term, 0) + 1
+            lengths[doc_id] = TITLE_WEIGHT * len(title_terms) + len(body_terms)
+            for term, count in counts.items():
+                postings.setdefault(term, ([], []))
+                postings[term][0].append(doc_id)
+                postings[term][1].append(count)
+
+        n = len(documents)
+        norm = k1 * (1 - b + b * lengths / max(lengths.mean(), 1)) if n else lengths
+        self.postings = {}
+        for term, (ids, counts) in postings.items():
+            ids = np.array(ids, dtype=np.int32)
+            tf = np.array(counts, dtype=float)
+            idf = np.log(1 + (n - len(ids) + 0.5) / (len(ids) + 0.5))
+            self.postings[term] = (ids, (idf * tf * (k1 + 1) / (tf + norm[ids])).astype(np.float32))
+
+        self.vocabulary = sorted(self.postings)
+        self.document_frequency = np.array([len(self.postings[term][0]) for term in self.vocabulary])
+        # Postings of each term in descending impact order, walked by the threshold algorithm in search
+        self.ranked = {term: np.argsort(-impacts, kind="stable") for term, (_, impacts) in self.postings.items()}
+        self.dense = {term: self._dense(ids, impacts) for term, (ids, impacts) in self.postings.items()
+                      if len(ids) * DENSE_SHARE >= n}
+        self._words = OrderedDict()
+        self._seen = np.zeros(n, dtype=bool)
+        self._stamp = np.zeros(n, dtype=np.int64)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.documents)
+
+    def _dense(self, ids, impacts):
+        """Impacts of a postings list by document id, 0 where the term is missing"""
+        dense = np.zeros(len(self.documents), dtype=np.float32)
+        dense[ids] = impacts
+        return dense
+
+    def expand(self, term):
+        """Index terms matched by one query word: itself, plus longer terms starting with it"""
+        if len(term) < MIN_PREFIX_LENGTH:
+            return [term] if term in self.postings else []
+        start = bisect.bisect_left(self.vocabulary, term)
+        end = bisect.bisect_left(self.vocabulary, term + "\uffff", start)
+        if end - start > MAX_PREFIX_TERMS:
+            keep = np.argpartition(-self.document_frequency[start:end], MAX_PREFIX_TERMS)[:MAX_PREFIX_TERMS]
+            return [self.vocabulary[start + i] for i in keep]
+        return self.vocabulary[start:end]
+
+    def word_postings(self, word):
+        """
+        Postings of one query word: (doc ids ascending, impacts, positions in descending impact order,
+        dense impacts by doc id or None for words in fewer than 1/DENSE_SHARE of the documents).
+        Prefix expansions are merged keeping each document's best impact; merged lists are
+        kept in a small LRU because the same words are typed again and again.
+        """
+        terms = self.expand(word)
+        if not terms:
+            return None
+        if len(terms) == 1:
+            return self.postings[terms[0]] + (self.ranked[terms[0]], self.dense.get(terms[0]))
+
+        merged = self._words.get(word)
+        if merged is not None:
+            self._words.move_to_end(word)
+            return merged
+        ids = np.concatenate([self.postings[term][0] for term in terms])
+        impacts = np.concatenate([self.postings[term][1] for term in terms])
+        order = np.lexsort((impacts, ids))
+        ids, impacts = ids[order], impacts[order]
+        last = np.append(ids[1:] != ids[:-1], True)
+        ids, impacts = ids[last], impacts[last]
+        dense = self._dense(ids, impacts) if len(ids) * DENSE_SHARE >= len(self.documents) else None
+        merged = (ids, impacts, np.argsort(-impacts, kind="stable"), dense)
+        self._words[word] = merged
+        if len(self._words) > WORD_CACHE_ENTRIES:
+            self._words.popitem(last=False)
+        return merged
+
+    def search(self, query, limit=10, kind=None):
+        """
+        Ranked search over every indexed document
+        Args:
+            query: Free text; apostrophe variants and case are ignored
+            limit: Maximum number of results
+            kind: Only return documents of this kind ("osimlik" or "kasallik")
+        Returns:
+            List of (score, document) tuples, best first
+        """
+        if kind is not None and kind not in self.kind_ids:
+            return []
+        words = list(dict.fromkeys(tokenize(query)))
+        with self._lock:
+            lists = [postings for postings in (self.word_postings(word) for word in words) if postings]
+            if not lists:
+                return []
+            candidates, scores = self._top_k(lists, limit, None if kind is None else self.kind_ids[kind])
+
+        order = np.argsort(-scores, kind="stable")
+        return [(float(scores[i]), self.documents[candidates[i]]) for i in order]
+
+    def _top_k(self, lists, limit, kind_id):
+        """
+        Threshold algorithm over impact-ordered postings: read the best postings of every
+        word in growing rounds, score the documents met exactly, and stop once the limit-th
+        best score reaches the most any unread document could still score
+        """
+        found_ids, found_scores, seen = [], [], []
+        start, depth = 0, max(2 * limit, FIRST_READ_DEPTH if len(lists) > 1 else 0)
+        while True:
+            fresh = np.concatenate([ids[ranked[start:depth]] for ids, _, ranked, _ in lists])
+            fresh = fresh[~self._seen[fresh]]
+            # Drop repeats without a hash table: only the last copy of each id keeps its stamp
+            self._stamp[fresh] = np.arange(len(fresh))
+            fresh = np.sort(fresh[self._stamp[fresh] == np.arange(len(fresh))])
+            self._seen[fresh] = True
+            seen.append(fresh)
+            if kind_id is not None:
+                fresh = fresh[self.kinds[fresh] == kind_id]
+
+            # Sorted ids keep the binary searches moving forward through each postings list
+            scores = np.zeros(len(fresh), dtype=np.float32)
+            for ids, impacts, _, dense in lists:
+                if dense is not None:
+                    scores += dense[fresh]
+                    continue
+                position = np.minimum(np.searchsorted(ids, fresh), len(ids) - 1)
+                scores += np.where(ids[position] == fresh, impacts[position], 0)
+            found_ids.append(fresh)
+            found_scores.append(scores)
+
+            threshold = _unread_bound(lists, depth)
+            candidates, candidate_scores = np.concatenate(found_ids), np.concatenate(found_scores)
+            if not threshold:
+                break
+            if len(candidates) < limit:
+                start, depth = depth, depth * 2
+                continue
+            kth = float(np.partition(candidate_scores, -limit)[-limit])
+            if kth >= threshold:
+                break
+            # Read on just to the depth where the unread postings can no longer beat the limit-th
+            # best score so far, but at most twice as deep: that score still grows with the reads
+            start, depth = depth, _stop_depth(lists, kth, depth, depth * 2)
+
+        self._seen[np.concatenate(seen)] = False
+        if len(candidates) > limit:
+            top = np.argpartition(-candidate_scores, limit)[:limit]
+            candidates, candidate_scores = candidates[top], candidate_scores[top]
+        return candidates, candidate_scores
+
+
+def _unread_bound(lists, depth):
+    """Most a document missing from the first depth postings of every list can score"""
+    return sum(float(impacts[ranked[depth]]) for _, impacts, ranked, _ in lists if depth < len(ranked))
+
+
+def _stop_depth(lists, score, low, high):
+    """Smallest depth in (low, high] whose unread bound is at most score, else high (binary search)"""
+    if _unread_bound(lists, high) > score:
+        return high
+    while high - low > 1:
+        middle = (low + high) // 2
+        if _unread_bound(lists, middle) <= score:
+            high = middle
+        else:
+            low = middle
+    return high
+
+
+def build_search_index(plants_path=None, diseases_path=None):
+    """SearchIndex over plants_database.csv and diseases_database.csv"""
+    return SearchIndex(plant_documents(plants_path or PLANTS_CSV_PATH) +
+                       disease_documents(diseases_path or DISEASES_CSV_PATH))
+
+
+def get_search_index():
+    """Process-wide search index over both databases, built once and shared by every session"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = build_search_index()
+    return _index
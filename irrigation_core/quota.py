@@ -0,0 +1,116 @@
+import heapq
+
+import numpy as np
+
+from irrigation_core.crops import osimlik_turlari
+from irrigation_core.soil import DEFAULT_DRYING_RATE
+
+# Volumes below this (m³) count as delivered
+VOLUME_TOLERANCE = 1e-9
+
+
+def stress_weights(urgency_score, crops=None):
+    """
+    Stress weight per m³ of undelivered water for each field: the soil moisture urgency
+    score (1, 2 or 3, analyze_field_status), times the crop's drying rate (qurish_tezligi)
+    when crops are given, so fast-drying crops suffer more from the same wait
+    Args:
+        urgency_score: (N,) urgency scores
+        crops: Optional sequence of N crop names (keys of osimlik_turlari)
+    Returns:
+        (N,) float array
+    """
+    weights = np.asarray(urgency_score, dtype=float)
+    if crops is not None:
+        weights = weights * np.array([osimlik_turlari[c]["qurish_tezligi"] if c in osimlik_turlari
+                                      else DEFAULT_DRYING_RATE for c in crops], dtype=float)
+    return weights
+
+
+def demand_matrix(day_offsets, water_amount, n_days):
+    """
+    Daily water requests of many fields from their own irrigation plans
+    Args:
+        day_offsets: (N, K) irrigation days from today (plan_irrigation_batch "day_offsets")
+        water_amount: (N, K) irrigation volumes (m³, plan_irrigation_batch "water_amount")
+        n_days: Number of days D; irrigations outside 0..D-1 are left out
+    Returns:
+        (N, D) float array of requested volumes (m³)
+    """
+    day_offsets = np.asarray(day_offsets, dtype=np.int64)
+    water_amount = np.asarray(water_amount, dtype=float)
+    demand = np.zeros((day_offsets.shape[0], n_days))
+    inside = (day_offsets >= 0) & (day_offsets < n_days)
+    fields = np.broadcast_to(np.arange(day_offsets.shape[0])[:, None], day_offsets.shape)
+    np.add.at(demand, (fields[inside], day_offsets[inside]), water_amount[inside])
+    return demand
+
+
+def weighted_deficit(demand, delivered, weights):
+    """
+    Stress-weighted deficit of an allocation: water requested but not yet delivered at the
+    end of each day, times the field's stress weight, summed over fields and days (m³·days)
+    Returns:
+        Dictionary with waiting_m3 (N, D), total (float) and per_field (N,)
+    """
+    waiting = np.maximum(np.cumsum(demand, axis=1) - np.cumsum(delivered, axis=1), 0)
+    per_field = np.asarray(weights, dtype=float) * waiting.sum(axis=1)
+    return {"waiting_m3": waiting, "total": float(per_field.sum()), "per_field": per_field}
+
+
+def allocate_canal_water(demand, weights, capacity):
+    """
+    Share a rationed canal between fields day by day to minimize the stress-weighted deficit.
+    Requests wait in a priority queue from their day until they are delivered. Every day the
+    canal capacity goes to the waiting requests with the highest stress weight first (the
+    oldest first among equal weights); a request that does not fit is delivered in part and
+    keeps its place for the rest. Each m³ delivered removes its field's weight from every
+    following day's deficit, so on any day no other order removes more.
+    Args:
+        demand: (N, D) requested volumes (m³) per field and day, e.g. from demand_matrix
+        weights: (N,) stress weight per m³ (stress_weights)
+        capacity: (D,) or scalar canal capacity (m³/day)
+    Returns:
+        Dictionary with delivered_m3 (N, D), unmet_m3 (N,) water still waiting after the
+        last day, delay_days (N,) volume-weighted average wait of the delivered water,
+        weighted_deficit (float) and used_capacity_m3 (D,)
+    """
+    demand = np.asarray(demand, dtype=float)
+    weights = np.broadcast_to(np.asarray(weights, dtype=float), (demand.shape[0],))
+    n_fields, n_days = demand.shape
+    capacity = np.broadcast_to(np.asarray(capacity, dtype=float), (n_days,))
+
+    # Requests in release order: day-major positions of the non-zero demand entries
+    days, fields = np.nonzero(demand.T > 0)
+    remaining = demand[fields, days].tolist()
+    priorities = (-weights[fields]).tolist()
+    release = np.searchsorted(days, np.arange(n_days + 1)).tolist()
+    fields, days = fields.tolist(), days.tolist()
+
+    delivered = np.zeros((n_fields, n_days))
+    waited = np.zeros(n_fields)
+    queue = []
+    for day in range(n_days):
+        for k in range(release[day], release[day + 1]):
+            heapq.heappush(queue, (priorities[k], days[k], k))
+        left = float(capacity[day])
+        while queue and left > VOLUME_TOLERANCE:
+            k = queue[0][2]
+            volume = min(remaining[k], left)
+            field = fields[k]
+            delivered[field, day] += volume
+            waited[field] += volume * (day - days[k])
+            left -= volume
+            remaining[k] -= volume
+            if remaining[k] <= VOLUME_TOLERANCE:
+                heapq.heappop(queue)
+
+    total = delivered.sum(axis=1)
+    deficit = weighted_deficit(demand, delivered, weights)
+    return {
+        "delivered_m3": delivered,
+        "unmet_m3": deficit["waiting_m3"][:, -1] if n_days else np.zeros(n_fields),
+        "delay_days": np.divide(waited, total, out=np.zeros(n_fields), where=total > 0),
+        "weighted_deficit": deficit["total"],
+        "used_capacity_m3": delivered.sum(axis=0),
+    }
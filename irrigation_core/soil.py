@@ -0,0 +1,79 @@
+import numpy as np
+
+from irrigation_core.crops import osimlik_turlari
+
+# Values used for fields whose crop is not in osimlik_turlari
+DEFAULT_DRYING_RATE = 1.5
+DEFAULT_REFILL_MOISTURE = 80
+
+# Daily random variation of the moisture loss (uniform in -NOISE..NOISE)
+NOISE = 0.5
+
+# Moisture gained (percentage points) per mm of rain
+RAIN_GAIN_PER_MM = 1.0
+
+
+def crop_soil_parameters(crops):
+    """
+    Drying rate and post-irrigation moisture for a list of crop names
+    Args:
+        crops: Sequence of crop names (keys of osimlik_turlari)
+    Returns:
+        (drying_rate, refill_moisture) float arrays
+    """
+    drying_rate = np.array([osimlik_turlari[c]["qurish_tezligi"] if c in osimlik_turlari
+                            else DEFAULT_DRYING_RATE for c in crops], dtype=float)
+    refill = np.array([osimlik_turlari[c]["namlik_optimal"] if c in osimlik_turlari
+                       else DEFAULT_REFILL_MOISTURE for c in crops], dtype=float)
+    return drying_rate, refill
+
+
+def simulate_moisture(moisture, drying_rate, days_since_irrigation, n_days,
+                      irrigation=None, refill_moisture=None, rain_mm=None, seed=None, rng=None,
+                      max_moisture=100):
+    """
+    Advance soil moisture of N fields by K days.
+    Every day a field loses drying_rate * days_since_irrigation / 10 (plus uniform noise),
+    rain adds RAIN_GAIN_PER_MM per mm and an irrigation event refills it and resets the
+    days-since-irrigation counter. Moisture stays within 0..max_moisture.
+    Args:
+        moisture: (N,) current moisture in %
+        drying_rate: (N,) qurish_tezligi of each field's crop
+        days_since_irrigation: (N,) days since the last irrigation
+        n_days: Number of days K to simulate
+        irrigation: Optional (N, K) boolean array of irrigation events
+        refill_moisture: (N,) moisture after irrigation (defaults to DEFAULT_REFILL_MOISTURE)
+        rain_mm: Optional (K,) or (N, K) forecast rain in mm
+        seed: Seed for the noise; the same seed gives the same trajectories
+        rng: numpy Generator to use instead of seed
+        max_moisture: Upper bound of the moisture (None: only floored at 0)
+    Returns:
+        Dictionary with "moisture" (N, K + 1, including the start) and final "days_since_irrigation"
+    """
+    current = np.array(moisture, dtype=float)
+    n_fields = len(current)
+    rate = np.broadcast_to(np.asarray(drying_rate, dtype=float), (n_fields,))
+    days_since = np.array(days_since_irrigation, dtype=float)
+    refill = np.broadcast_to(np.asarray(
+        DEFAULT_REFILL_MOISTURE if refill_moisture is None else refill_moisture, dtype=float), (n_fields,))
+    rain_gain = None
+    if rain_mm is not None:
+        rain_gain = np.broadcast_to(np.asarray(rain_mm, dtype=float), (n_fields, n_days)) * RAIN_GAIN_PER_MM
+    rng = rng if rng is not None else np.random.default_rng(seed)
+
+    trajectory = np.empty((n_fields, n_days + 1))
+    trajectory[:, 0] = current
+    for day in range(n_days):
+        loss = rate * days_since / 10 + rng.uniform(-NOISE, NOISE, n_fields)
+        current -= loss
+        if rain_gain is not None:
+            current += rain_gain[:, day]
+        days_since += 1
+        if irrigation is not None:
+            watered = irrigation[:, day]
+            current[watered] = refill[watered]
+            days_since[watered] = 0
+        np.clip(current, 0, max_moisture, out=current)
+        trajectory[:, day + 1] = current
+
+    return {"moisture": trajectory, "days_since_irrigation": days_since}
@@ -0,0 +1,197 @@
+import numpy as np
+
+from irrigation_core.crops import osimlik_turlari
+
+# Available water capacity of the soil (mm of water per m of root depth, loam)
+AVAILABLE_WATER_CAPACITY = 140
+
+# Effective root depth (m) per osimlik_turlari crop (FAO-56 table 22, maximum rooting depth)
+ROOT_DEPTHS = {
+    "bug'doy": 1.5,
+    "makkajo'xori": 1.2,
+    "sholi": 0.6,
+    "paxta": 1.4,
+    "sabzavotlar": 0.5,
+    "kartoshka": 0.5,
+    "beda": 1.5,
+    "pomidor": 1.0,
+    "bodring": 0.9,
+}
+
+# Values used for crops without an entry
+DEFAULT_ROOT_DEPTH = 1.0
+DEFAULT_MINIMUM_MOISTURE = 40
+DEFAULT_OPTIMAL_MOISTURE = 70
+
+# Days simulated when planning one field's next irrigations
+DEFAULT_HORIZON_DAYS = 60
+
+# Share of forecast rain that reaches the root zone (the rest is runoff and interception)
+RAIN_EFFICIENCY = 0.8
+
+# osimlik_turlari crop -> crop name in sug'orish.csv (crops without a row use their own name)
+WATER_TABLE_CROPS = {
+    "bug'doy": "Wheat",
+    "makkajo'xori": "Corn",
+    "sholi": "Rice",
+    "paxta": "Cotton",
+    "kartoshka": "Potatoes",
+    "pomidor": "Tomatoes",
+    "bodring": "Cucumbers",
+}
+
+
+def root_zone_parameters(crops, available_water=AVAILABLE_WATER_CAPACITY):
+    """
+    Root-zone storage of a list of crops. Soil moisture in this app is a percentage of the
+    available water (0 = wilting point, 100 = field capacity), so a crop's namlik_minimum
+    marks the allowable depletion and namlik_optimal the level an irrigation refills to.
+    Args:
+        crops: Sequence of crop names (keys of osimlik_turlari)
+        available_water: Available water capacity (mm per m of root depth)
+    Returns:
+        (taw, allowable_depletion, refill_depletion) float arrays in mm: total available water,
+        depletion that triggers irrigation and depletion left after an irrigation
+    """
+    depth = np.array([ROOT_DEPTHS.get(c, DEFAULT_ROOT_DEPTH) for c in crops], dtype=float)
+    minimum = np.array([osimlik_turlari[c]["namlik_minimum"] if c in osimlik_turlari
+                        else DEFAULT_MINIMUM_MOISTURE for c in crops], dtype=float)
+    optimal = np.array([osimlik_turlari[c]["namlik_optimal"] if c in osimlik_turlari
+                        else DEFAULT_OPTIMAL_MOISTURE for c in crops], dtype=float)
+    taw = depth * available_water
+    return taw, taw * (1 - minimum / 100), taw * (1 - optimal / 100)
+
+
+def depletion_from_moisture(moisture, taw):
+    """Root-zone depletion (mm) of a soil moisture reading (% of available water)"""
+    return np.asarray(taw, dtype=float) * (1 - np.clip(np.asarray(moisture, dtype=float), 0, 100) / 100)
+
+
+def stage_demand(table, crop_ids, days_after_planting, n_days):
+    """
+    Daily crop water demand (mm/day) of many fields from the growth stages of sug'orish.csv.
+    Each crop's stages follow one another with their average durations; days after the
+    last stage (harvested fields) have no demand.
+    Args:
+        table: WaterTable (irrigation_core.water_table)
+        crop_ids: (N,) crop numbers (index into table.crops)
+        days_after_planting: (N,) days since planting on the first simulated day
+        n_days: Number of days D
+    Returns:
+        (N, D) float array
+    """
+    crop_ids = np.asarray(crop_ids)
+    days = np.asarray(days_after_planting)[:, None] + np.arange(n_days)[None, :]
+    demand = np.zeros(days.shape)
+    for crop in np.unique(crop_ids):
+        fields = np.flatnonzero(crop_ids == crop)
+        start = table.crop_row_start[crop]
+        rows = np.arange(start, start + table.crop_row_count[crop])
+        ends = np.cumsum(table.days_mean[rows])
+        stage = np.searchsorted(ends, days[fields], side="right")
+        water = np.append(table.water_mean[rows], 0.0)
+        demand[fields] = np.where(days[fields] >= 0, water[stage], 0.0)
+    return demand
+
+
+def simulate_water_balance(demand, taw, allowable_depletion, initial_depletion, rain_mm=None,
+                           applied_mm=None, refill_depletion=0.0, auto_irrigate=True, irrigate_on=None,
+                           observed_depletion=None, rain_efficiency=RAIN_EFFICIENCY):
+    """
+    Daily root-zone water balance (FAO-56 chapter 8) for N fields over D days.
+    Every day depletion grows by the crop demand (reduced by the water-stress coefficient Ks
+    once depletion passes the allowable level) and shrinks by effective rain and applied
+    irrigation; water beyond field capacity drains. When depletion reaches the allowable
+    level an irrigation is fired that brings it back to refill_depletion. A moisture reading
+    (observed_depletion) replaces the modelled depletion at the start of its day.
+    The recurrence runs day by day; every step works on all fields at once.
+    Args:
+        demand: (N, D) or (D,) crop water demand (mm/day)
+        taw: (N,) total available water (mm)
+        allowable_depletion: (N,) depletion (mm) at which irrigation is triggered
+        initial_depletion: (N,) depletion (mm) at the start of the first day
+        rain_mm: Optional (N, D) or (D,) rain (mm/day)
+        applied_mm: Optional (N, D) irrigation already applied or planned (mm/day)
+        refill_depletion: (N,) or scalar depletion (mm) left after a fired irrigation
+        auto_irrigate: Fire irrigations when depletion reaches allowable_depletion
+        irrigate_on: Optional (N, D) bool, irrigations fired on fixed days (e.g. a fixed interval plan)
+        observed_depletion: Optional (N, D) depletion (mm) measured at the start of each day, NaN where none
+        rain_efficiency: Share of rain that counts
+    Returns:
+        Dictionary of arrays: depletion (N, D + 1, start included, end of each day),
+        irrigation_mm (N, D) fired irrigation depths, drainage_mm (N, D),
+        stress_days (N,) days that ended above the allowable depletion,
+        irrigation_count (N,) and first_irrigation_day (N,, -1 when none)
+    """
+    taw = np.asarray(taw, dtype=float)
+    n_fields = len(taw)
+    demand = np.broadcast_to(np.asarray(demand, dtype=float), (n_fields, np.shape(demand)[-1]))
+    n_days = demand.shape[1]
+    raw = np.broadcast_to(np.asarray(allowable_depletion, dtype=float), (n_fields,))
+    refill = np.broadcast_to(np.asarray(refill_depletion, dtype=float), (n_fields,))
+    # Day-major copies so each step reads one contiguous row
+    demand_t = np.ascontiguousarray(demand.T)
+    water_in_t = np.zeros((n_days, n_fields))
+    if rain_mm is not None:
+        water_in_t += rain_efficiency * np.broadcast_to(np.asarray(rain_mm, dtype=float), (n_fields, n_days)).T
+    if applied_mm is not None:
+        water_in_t += np.broadcast_to(np.asarray(applied_mm, dtype=float), (n_fields, n_days)).T
+    fixed_t = None if irrigate_on is None else np.ascontiguousarray(np.asarray(irrigate_on, dtype=bool).T)
+    observed_t = None
+    if observed_depletion is not None:
+        observed_t = np.clip(np.broadcast_to(np.asarray(observed_depletion, dtype=float),
+                                             (n_fields, n_days)).T, 0, taw)
+        observed_mask = ~np.isnan(observed_t)
+        observed_days = observed_mask.any(axis=1)
+    stress_range = np.maximum(taw - raw, 1e-9)
+
+    depletion = np.empty((n_days + 1, n_fields))
+    irrigation = np.zeros((n_days, n_fields))
+    drainage = np.empty((n_days, n_fields))
+    current = np.clip(np.array(initial_depletion, dtype=float), 0, taw)
+    depletion[0] = current
+    # Scratch buffers reused every day (the loop allocates nothing)
+    ks = np.empty(n_fields)
+    fire = np.zeros(n_fields, dtype=bool)
+    for day in range(n_days):
+        if observed_t is not None and observed_days[day]:
+            np.copyto(current, observed_t[day], where=observed_mask[day])
+        np.subtract(taw, current, out=ks)
+        ks /= stress_range
+        np.clip(ks, 0, 1, out=ks)
+        ks *= demand_t[day]
+        current += ks
+        current -= water_in_t[day]
+        np.negative(current, out=drainage[day])
+        np.maximum(drainage[day], 0, out=drainage[day])
+        np.clip(current, 0, taw, out=current)
+
+        if auto_irrigate:
+            np.greater_equal(current, raw, out=fire)
+            if fixed_t is not None:
+                fire |= fixed_t[day]
+        elif fixed_t is not None:
+            fire[:] = fixed_t[day]
+        if fire.any():
+            np.subtract(current, refill, out=irrigation[day])
+            np.maximum(irrigation[day], 0, out=irrigation[day])
+            irrigation[day] *= fire
+            np.minimum(current, refill, out=current, where=fire)
+        depletion[day + 1] = current
+
+    irrigation, depletion = irrigation.T, depletion.T
+    fired = irrigation > 0
+    return {
+        "depletion": depletion,
+        "irrigation_mm": irrigation,
+        "drainage_mm": drainage.T,
+        "stress_days": (depletion[:, 1:] > raw[:, None]).sum(axis=1),
+        "irrigation_count": fired.sum(axis=1),
+        "first_irrigation_day": (np.where(fired.any(axis=1), fired.argmax(axis=1), -1) if n_days
+                                 else np.full(n_fields, -1)),
+    }
+
+
+def irrigation_volume_m3(depth_mm, area_m2):
+    """Water volume (m³) of an irrigation depth (mm) over a field area (m²)"""
+    return np.asarray(depth_mm, dtype=float) * np.asarray(area_m2, dtype=float) / 1000
@@ -0,0 +1,189 @@
+import csv
+import os
+import threading
+
+import numpy as np
+
+# 1 mm of water over one hectare is 10 m³
+M3_PER_MM_HECTARE = 10
+M2_PER_HECTARE = 10000
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def parse_range(text):
+    """Parse "5-7 mm/day" or "5-10 days" into (min, max); a single value gives (v, v)"""
+    value = text.split(" ")[0] if text else ""
+    if not value:
+        return np.nan, np.nan
+    if "-" in value:
+        low, high = value.split("-")
+        return float(low), float(high)
+    return float(value), float(value)
+
+
+def read_water_csv(path):
+    """
+    Read sug'orish.csv into {crop: {"bosqichlar": {stage: {"suv_talabi", "davomiylik"}}}}
+    using the same row rules as crop.csv_fayldan_oqish
+    """
+    ekinlar_malumoti = {}
+    with open(path, 'r', encoding='utf-8') as fayl:
+        joriy_ekin = None
+        for qator in csv.reader(fayl):
+            if len(qator) >= 4:  # Kamida 4 ta ustun bo'lishi kerak
+                if qator[1] and qator[1] not in ["Crop", ""]:  # Ekin nomi bo'lsa
+                    joriy_ekin = qator[1]
+                    ekinlar_malumoti[joriy_ekin] = {"bosqichlar": {}}
+
+                if joriy_ekin and qator[2] and qator[2] != "Growth Stage":  # O'sish bosqichi bo'lsa
+                    # Suv talabi va davomiyligi (masalan: "5-7 mm/day (5-10 days)")
+                    suv_malumoti = qator[3]
+                    if suv_malumoti:
+                        suv_talabi = suv_malumoti.split("(")[0].strip()
+                        davomiylik = suv_malumoti.split("(")[1].replace(")", "").strip() \
+                            if "(" in suv_malumoti else ""
+                        ekinlar_malumoti[joriy_ekin]["bosqichlar"][qator[2]] = {
+                            "suv_talabi": suv_talabi,
+                            "davomiylik": davomiylik
+                        }
+    return ekinlar_malumoti
+
+
+class WaterTable:
+    """
+    Crop water requirements compiled into numeric arrays, one row per (crop, stage).
+    Strings are parsed once here; lookups and water calculations afterwards are
+    array indexing only.
+    """
+
+    def __init__(self, ekinlar_malumoti):
+        self.ekinlar_malumoti = ekinlar_malumoti
+        self.crops = list(ekinlar_malumoti)
+        self.stages = []
+        self.crop_ids = {crop: i for i, crop in enumerate(self.crops)}
+        self.stage_ids = {}
+
+        crop_id, stage_id, water, days = [], [], [], []
+        self.row_index = {}
+        for crop, info in ekinlar_malumoti.items():
+            for stage, values in info["bosqichlar"].items():
+                if stage not in self.stage_ids:
+                    self.stage_ids[stage] = len(self.stages)
+                    self.stages.append(stage)
+                self.row_index[(crop, stage)] = len(crop_id)
+                crop_id.append(self.crop_ids[crop])
+                stage_id.append(self.stage_ids[stage])
+                water.append(parse_range(values["suv_talabi"]))
+                days.append(parse_range(values["davomiylik"]))
+
+        water = np.array(water, dtype=float).reshape(-1, 2)
+        days = np.array(days, dtype=float).reshape(-1, 2)
+        self.crop_id = np.array(crop_id, dtype=np.int64)
+        self.stage_id = np.array(stage_id, dtype=np.int64)
+        self.water_min, self.water_max = water[:, 0], water[:, 1]
+        self.water_mean = water.mean(axis=1)  # mm/kun
+        self.days_min, self.days_max = days[:, 0], days[:, 1]
+        self.days_mean = days.mean(axis=1)  # kun
+
+        # Dense (crop, stage) -> row lookup; -1 where the crop has no such stage
+        self.row_lookup = np.full((len(self.crops), len(self.stages)), -1, dtype=np.int64)
+        self.row_lookup[self.crop_id, self.stage_id] = np.arange(len(self.crop_id))
+
+        # Rows are stored crop by crop, so each crop's stages are one contiguous block
+        self.crop_row_count = np.bincount(self.crop_id, minlength=len(self.crops))
+        self.crop_row_start = np.cumsum(self.crop_row_count) - self.crop_row_count
+
+    def __len__(self):
+        return len(self.crop_id)
+
+    def row(self, crop, stage):
+        """Row number of a (crop, stage) pair, or None"""
+        return self.row_index.get((crop, stage))
+
+    def daily_water_m3(self, rows, area_m2):
+        """Daily water volume (m³) for the given rows and field areas (m²)"""
+        return self.water_mean[rows] * M3_PER_MM_HECTARE * (np.asarray(area_m2, dtype=float) / M2_PER_HECTARE)
+
+    def stage_days(self, rows):
+        """Average stage duration (days) for the given rows"""
+        return self.days_mean[rows]
+
+    def water_volumes(self, crop_ids, stage_ids, areas):
+        """
+        Daily and stage-total water volume for many parcels at once
+        Args:
+            crop_ids: (N,) crop numbers (index into self.crops)
+            stage_ids: (N,) stage numbers (index into self.stages)
+            areas: (N,) parcel areas in m²
+        Returns:
+            Dictionary of (N,) arrays: row, daily_m3, stage_days, stage_m3.
+            Parcels whose crop has no such stage get row -1 and NaN volumes.
+        """
+        rows = self.row_lookup[np.asarray(crop_ids), np.asarray(stage_ids)]
+        valid = rows >= 0
+        safe_rows = np.where(valid, rows, 0)
+        daily = np.where(valid, self.daily_water_m3(safe_rows, areas), np.nan)
+        days = np.where(valid, self.days_mean[safe_rows], np.nan)
+        return {"row": rows, "daily_m3": daily, "stage_days": days, "stage_m3": daily * days}
+
+    def all_stage_volumes(self, crop_ids, areas):
+        """
+        Water volume of every growth stage for every parcel (long format)
+        Args:
+            crop_ids: (N,) crop numbers of the parcels
+            areas: (N,) parcel areas in m²
+        Returns:
+            Dictionary of equal-length arrays: parcel, row, daily_m3, stage_days, stage_m3
+        """
+        crop_ids = np.asarray(crop_ids)
+        counts = self.crop_row_count[crop_ids]
+        parcel = np.repeat(np.arange(len(crop_ids)), counts)
+        group_start = np.repeat(np.cumsum(counts) - counts, counts)
+        rows = np.repeat(self.crop_row_start[crop_ids], counts) + (np.arange(len(parcel)) - group_start)
+        daily = self.daily_water_m3(rows, np.asarray(areas, dtype=float)[parcel])
+        days = self.days_mean[rows]
+        return {"parcel": parcel, "row": rows, "daily_m3": daily, "stage_days": days, "stage_m3": daily * days}
+
+    def to_frame(self, volumes, parcel_ids=None):
+        """
+        Export water_volumes / all_stage_volumes output as a pandas DataFrame
+        (use pyarrow.Table.from_pandas for an Arrow table)
+        """
+        import pandas as pd
+
+        rows = volumes["row"]
+        safe_rows = np.where(rows >= 0, rows, 0)
+        parcel = volumes.get("parcel", np.arange(len(rows)))
+        frame = pd.DataFrame({
+            "parcel": parcel if parcel_ids is None else np.asarray(parcel_ids)[parcel],
+            "crop": pd.Categorical.from_codes(np.where(rows >= 0, self.crop_id[safe_rows], -1),
+                                              categories=self.crops),
+            "stage": pd.Categorical.from_codes(np.where(rows >= 0, self.stage_id[safe_rows], -1),
+                                               categories=self.stages),
+            "daily_m3": volumes["daily_m3"],
+            "stage_days": volumes["stage_days"],
+            "stage_m3": volumes["stage_m3"],
+        })
+        return frame
+
+
+def load_water_table(path):
+    """
+    Compiled WaterTable for a CSV file, cached per process and rebuilt when the file's mtime changes
+    Args:
+        path: Path to sug'orish.csv
+    Returns:
+        WaterTable instance
+    """
+    mtime = os.stat(path).st_mtime_ns
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+    table = WaterTable(read_water_csv(path))
+    with _cache_lock:
+        _cache[path] = (mtime, table)
+    return table
@@ -0,0 +1,76 @@
+import time
+
+import streamlit as st
+
+from irrigation_core.knowledge_search import get_search_index
+
+# Qidiruv natijalari soni
+NATIJALAR_SONI = 20
+
+# Qidiruv turlari: ko'rsatiladigan nom -> hujjat turi
+QIDIRUV_TURLARI = {
+    "Hammasi": None,
+    "O'simliklar": "osimlik",
+    "Kasalliklar": "kasallik",
+}
+
+# Natija kartasida ko'rsatiladigan maydonlar: hujjat turi -> [(maydon, sarlavha)]
+KORSATILADIGAN_MAYDONLAR = {
+    "osimlik": [
+        ("ilmiy_nomi", "Ilmiy nomi"),
+        ("turi_guruh", "Guruhi"),
+        ("tavsif", "Tavsif"),
+        ("parvarish", "Parvarish"),
+        ("foydalanish", "Foydalanish"),
+        ("mintaqa", "Mintaqa"),
+    ],
+    "kasallik": [
+        ("scientific_name", "Ilmiy nomi"),
+        ("crop", "O'simlik"),
+        ("severity", "Jiddiylik"),
+        ("description", "Tavsif"),
+        ("symptoms", "Belgilari"),
+        ("treatment", "Davolash"),
+        ("fertilizers", "O'g'itlar"),
+        ("prevention", "Oldini olish"),
+    ],
+}
+
+
+# Bitta qidiruv natijasini kengaytiriladigan kartochka sifatida ko'rsatish
+def natijani_korsatish(hujjat):
+    belgi = "🌱" if hujjat["kind"] == "osimlik" else "🦠"
+    with st.expander(f"{belgi} {hujjat['title']}"):
+        for maydon, sarlavha in KORSATILADIGAN_MAYDONLAR[hujjat["kind"]]:
+            qiymat = hujjat["record"].get(maydon)
+            if isinstance(qiymat, (list, tuple)):
+                qiymat = ", ".join(qiymat)
+            if qiymat:
+                st.markdown(f"**{sarlavha}:** {qiymat}")
+
+
+# O'simliklar va kasalliklar bo'yicha ma'lumotlar sahifasi
+def show_osimlik_page():
+    st.title("O'simliklar bo'yicha ma'lumotlar")
+
+    indeks = get_search_index()
+    sorov = st.text_input("Qidirish (masalan: pomidor fitoftoroz, o'g'it, sug'orish)", key="osimlik_sorov")
+    tur = st.radio("Qayerdan qidirish", list(QIDIRUV_TURLARI), horizontal=True, key="osimlik_qidiruv_turi")
+
+    if not sorov.strip():
+        osimliklar = sum(1 for hujjat in indeks.documents if hujjat["kind"] == "osimlik")
+        st.info(f"Ma'lumotlar bazasida {osimliklar} ta o'simlik va {len(indeks) - osimliklar} ta kasallik bor. "
+                f"Qidirish uchun so'z kiriting.")
+        return
+
+    boshlanish = time.perf_counter()
+    natijalar = indeks.search(sorov, limit=NATIJALAR_SONI, kind=QIDIRUV_TURLARI[tur])
+    vaqt_ms = (time.perf_counter() - boshlanish) * 1000
+
+    if not natijalar:
+        st.warning("Hech narsa topilmadi. Boshqa so'z bilan qidirib ko'ring.")
+        return
+
+    st.caption(f"{len(natijalar)} ta natija ({vaqt_ms:.2f} ms)")
+    for _, hujjat in natijalar:
+        natijani_korsatish(hujjat)
@@ -1,19 +1,21 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
 import datetime
-import matplotlib.pyplot as plt
-import time
-from datetime import timedelta
-import plotly.express as px
 import plotly.graph_objects as go
 
-# Existing modules import
-# Note: We've removed the direct import of analyze_plant_image since it doesn't exist
-from weather import get_forecast, show_weather
-from xarita2 import maydon_rangini_olish, osimlik_turlari
+# The weather page (folium, streamlit_folium) is imported only when a forecast is needed
 # No direct import from diseaseai
-from crop import suv_talabini_hisoblash, davomiylikni_hisoblash, keyingi_sugorish_kuni
+# Pure computation lives in the headless irrigation_core package
+from irrigation_core import (
+    osimlik_turlari,
+    summarize_forecast,
+    analyze_field_status,
+    analyze_disease_status,
+    analyze_crop_water_needs,
+    calculate_smart_irrigation,
+    load_disease_kb,
+)
+from irrigation_core.analysis import season_planner
 
 # O'zbekiston viloyatlari
 UZB_VILOYATLAR = {
@@ -56,330 +58,11 @@ def analyze_weather_forecast(region):
         Dictionary with avg_temp, avg_rain_prob
     """
     try:
-        forecast_data = get_forecast(region)
-        if forecast_data:
-            # Calculate monthly averages
-            avg_temp = forecast_data["weekly_avg_temp"]  # Using weekly as an approximation
-            avg_rain_prob = forecast_data["weekly_avg_rain_prob"]
-
-            # Prepare daily data for visualization
-            dates = [date.strftime("%d-%m") for date in forecast_data["daily_dates"]]
-            temps = forecast_data["daily_temps"]
-            rain_probs = forecast_data["daily_rain_probs"]
-
-            return {
-                "avg_temp": avg_temp,
-                "avg_rain_prob": avg_rain_prob,
-                "dates": dates,
-                "temps": temps,
-                "rain_probs": rain_probs,
-                "status": "success"
-            }
-        else:
-            return {"status": "error", "message": "Ob-havo ma'lumotlari olinmadi"}
-    except Exception as e:
-        return {"status": "error", "message": f"Ob-havo tahlili xatosi: {str(e)}"}
+        from weather import get_forecast
 
-
-# Field status analysis
-def analyze_field_status(field_data):
-    """
-    Analyze field data to get soil moisture, crop type, last irrigation date
-    Args:
-        field_data: Dictionary with field information
-    Returns:
-        Dictionary with analysis results
-    """
-    try:
-        crop_type = field_data.get("ekin", "")
-        last_irrigated = field_data.get("oxirgi_sugorilgan", datetime.date.today())
-        soil_moisture = field_data.get("tuproq_namligi", 50)
-        planting_date = field_data.get("ekish_sanasi", None)
-
-        if crop_type in osimlik_turlari:
-            crop_info = osimlik_turlari[crop_type]
-            irrigation_period = crop_info["sugorish_davri"]
-            optimal_moisture = crop_info["namlik_optimal"]
-            min_moisture = crop_info["namlik_minimum"]
-
-            days_since_irrigation = (datetime.date.today() - last_irrigated).days
-
-            # Calculate irrigation urgency
-            if soil_moisture < min_moisture:
-                urgency = "high"
-                urgency_score = 3
-            elif soil_moisture < min_moisture * 1.2:
-                urgency = "medium"
-                urgency_score = 2
-            else:
-                urgency = "low"
-                urgency_score = 1
-
-            # Calculate next irrigation date based on period
-            next_irrigation_date = last_irrigated + datetime.timedelta(days=irrigation_period)
-            days_to_next = (next_irrigation_date - datetime.date.today()).days
-
-            return {
-                "crop_type": crop_type,
-                "last_irrigated": last_irrigated,
-                "soil_moisture": soil_moisture,
-                "optimal_moisture": optimal_moisture,
-                "min_moisture": min_moisture,
-                "days_since_irrigation": days_since_irrigation,
-                "next_scheduled_irrigation": next_irrigation_date,
-                "days_to_next_irrigation": days_to_next,
-                "irrigation_urgency": urgency,
-                "urgency_score": urgency_score,
-                "irrigation_period": irrigation_period,
-                "status": "success"
-            }
-        else:
-            return {"status": "error", "message": "Ekin turi tanlanmagan yoki noto'g'ri"}
+        return summarize_forecast(get_forecast(region))
     except Exception as e:
-        return {"status": "error", "message": f"Dalani tahlil qilishda xatolik: {str(e)}"}
-
-
-# Disease analysis - rewritten to not depend on the missing function
-def analyze_disease_status(disease_info):
-    """
-    Analyze if plant has disease and if it affects irrigation
-    Args:
-        disease_info: Dictionary with disease information
-    Returns:
-        Dictionary with analysis results
-    """
-    try:
-        if not disease_info or "name" not in disease_info:
-            return {
-                "has_disease": False,
-                "irrigation_adjustment": 0,
-                "status": "success",
-                "message": "Kasallik ma'lumotlari mavjud emas"
-            }
-
-        # Common diseases that require reduced irrigation
-        reduce_water_diseases = [
-            "fitoftoroz", "bakterial_rak", "bakterial_dog", "qora_chirish",
-            "fuzarioz", "bakterial_chirish", "so'lish", "un_shudring"
-        ]
-
-        # Check if disease name contains any keywords that suggest reducing water
-        disease_name = disease_info.get("name", "").lower()
-        needs_reduced_water = any(disease in disease_name for disease in reduce_water_diseases)
-
-        # Calculate irrigation adjustment (-30% for water-sensitive diseases)
-        irrigation_adjustment = -0.3 if needs_reduced_water else 0
-
-        return {
-            "has_disease": True,
-            "disease_name": disease_info.get("name", ""),
-            "requires_reduced_water": needs_reduced_water,
-            "irrigation_adjustment": irrigation_adjustment,
-            "recommendations": disease_info.get("treatment", ""),
-            "status": "success"
-        }
-    except Exception as e:
-        return {"status": "error", "message": f"Kasallik tahlilida xatolik: {str(e)}"}
-
-
-# Crop water requirements analysis
-def analyze_crop_water_needs(crop_data):
-    """
-    Analyze crop water requirements based on growth stage
-    Args:
-        crop_data: Dictionary with crop information
-    Returns:
-        Dictionary with water requirements
-    """
-    try:
-        crop_type = crop_data.get("crop_type", "")
-        growth_stage = crop_data.get("growth_stage", "")
-        area = crop_data.get("area", 1000)  # m²
-
-        # Get water requirements from crop.py functions
-        water_req_text = crop_data.get("water_requirement", "5-7 mm/day")
-        duration_text = crop_data.get("duration", "7-10 days")
-
-        # Calculate water requirements
-        daily_water = suv_talabini_hisoblash(water_req_text, area)
-        stage_duration = davomiylikni_hisoblash(duration_text)
-
-        return {
-            "crop_type": crop_type,
-            "growth_stage": growth_stage,
-            "area": area,
-            "daily_water_requirement": daily_water,
-            "stage_duration": stage_duration,
-            "total_stage_water": daily_water * stage_duration,
-            "status": "success"
-        }
-    except Exception as e:
-        return {"status": "error", "message": f"Ekin suv ehtiyojini tahlil qilishda xatolik: {str(e)}"}
-
-
-# Smart irrigation scheduling
-def calculate_smart_irrigation(weather_data, field_data, disease_data, crop_data):
-    """
-    Calculate smart irrigation schedule based on all factors
-    Args:
-        weather_data: Weather forecast analysis
-        field_data: Field status analysis
-        disease_data: Disease analysis
-        crop_data: Crop water needs analysis
-    Returns:
-        Dictionary with irrigation schedule and recommendations
-    """
-    try:
-        # Base water requirement
-        base_daily_water = crop_data.get("daily_water_requirement", 0)
-        base_irrigation_interval = field_data.get("days_to_next_irrigation", 7)
-
-        # Weather adjustment factors
-        temp_adjustment = 0
-        rain_adjustment = 0
-
-        # Adjust for temperature
-        avg_temp = weather_data.get("avg_temp", 25)
-        if avg_temp > 30:
-            temp_adjustment = 0.2  # Increase water by 20% for hot weather
-        elif avg_temp < 15:
-            temp_adjustment = -0.1  # Decrease water by 10% for cool weather
-
-        # Adjust for rain probability
-        avg_rain_prob = weather_data.get("avg_rain_prob", 0)
-        if avg_rain_prob > 70:
-            rain_adjustment = -0.3  # Decrease water by 30% if high rain probability
-        elif avg_rain_prob > 40:
-            rain_adjustment = -0.15  # Decrease water by 15% if medium rain probability
-
-        # Disease adjustment
-        disease_adjustment = disease_data.get("irrigation_adjustment", 0)
-
-        # Soil moisture urgency adjustment
-        urgency_score = field_data.get("urgency_score", 2)
-        urgency_adjustment = 0
-        if urgency_score == 3:  # High urgency
-            urgency_adjustment = 0.1  # Increase water by 10%
-            base_irrigation_interval = 0  # Irrigate immediately
-        elif urgency_score == 1:  # Low urgency
-            urgency_adjustment = -0.1  # Decrease water by 10%
-
-        # Calculate final adjustments
-        total_adjustment = 1 + temp_adjustment + rain_adjustment + disease_adjustment + urgency_adjustment
-        adjusted_water = base_daily_water * total_adjustment
-
-        # Generate irrigation schedule
-        start_date = datetime.date.today()
-        if base_irrigation_interval > 0:
-            start_date = start_date + datetime.timedelta(days=base_irrigation_interval)
-
-        schedule = []
-        detailed_schedule = []
-        current_date = start_date
-
-        # Generate schedule for next 5 irrigations
-        for i in range(5):
-            # Adjust water amount based on the forecast for that specific day
-            day_adjustment = 1.0
-            temp_day_adj = 0
-            rain_day_adj = 0
-
-            # Check if we have forecast data for this day
-            day_idx = min(i, len(weather_data.get("dates", [])) - 1)
-            if day_idx >= 0:
-                day_temp = weather_data.get("temps", [])[day_idx] if day_idx < len(
-                    weather_data.get("temps", [])) else avg_temp
-                day_rain_prob = weather_data.get("rain_probs", [])[day_idx] if day_idx < len(
-                    weather_data.get("rain_probs", [])) else avg_rain_prob
-
-                # Adjust for that day's temperature
-                if day_temp > 30:
-                    temp_day_adj = 0.15
-                elif day_temp < 15:
-                    temp_day_adj = -0.1
-
-                # Adjust for that day's rain probability
-                if day_rain_prob > 70:
-                    rain_day_adj = -0.4
-                elif day_rain_prob > 40:
-                    rain_day_adj = -0.2
-
-                # Combined daily adjustment
-                day_adjustment = 1.0 + temp_day_adj + rain_day_adj
-
-            # Calculate water amount for this irrigation
-            water_amount = adjusted_water * day_adjustment
-
-            # Base water without adjustments (for comparison)
-            base_water = base_daily_water
-
-            # Add to schedule
-            schedule.append({
-                "irrigation_number": i + 1,
-                "date": current_date,
-                "water_amount": max(0, water_amount),  # Ensure non-negative
-                "adjustment_factor": day_adjustment,
-                "temperature": weather_data.get("temps", [])[day_idx] if day_idx < len(
-                    weather_data.get("temps", [])) else None,
-                "rain_probability": weather_data.get("rain_probs", [])[day_idx] if day_idx < len(
-                    weather_data.get("rain_probs", [])) else None
-            })
-
-            # Add to detailed schedule with individual adjustment factors
-            detailed_schedule.append({
-                "irrigation_number": i + 1,
-                "date": current_date,
-                "base_water": base_water,
-                "final_water": max(0, water_amount),
-                "temperature": day_temp if day_idx < len(weather_data.get("temps", [])) else None,
-                "temp_adjustment": temp_day_adj,
-                "temp_effect": base_water * temp_day_adj,
-                "rain_probability": day_rain_prob if day_idx < len(weather_data.get("rain_probs", [])) else None,
-                "rain_adjustment": rain_day_adj,
-                "rain_effect": base_water * rain_day_adj,
-                "disease_adjustment": disease_adjustment,
-                "disease_effect": base_water * disease_adjustment,
-                "soil_adjustment": urgency_adjustment,
-                "soil_effect": base_water * urgency_adjustment,
-                "total_adjustment": day_adjustment + disease_adjustment + urgency_adjustment - 1.0,
-                "total_effect": water_amount - base_water
-            })
-
-            # Move to next irrigation date based on crop needs
-            interval = field_data.get("irrigation_period", 7)
-            current_date = current_date + datetime.timedelta(days=interval)
-
-        # Generate recommendations
-        recommendations = []
-
-        if temp_adjustment > 0:
-            recommendations.append("🌡️ Harorat yuqori bo'lgani uchun sug'orish miqdori oshirildi")
-
-        if rain_adjustment < 0:
-            recommendations.append("🌧️ Yomg'ir ehtimoli yuqori bo'lgani uchun sug'orish miqdori kamaytirildi")
-
-        if disease_data.get("requires_reduced_water", False):
-            recommendations.append(
-                f"🦠 {disease_data.get('disease_name')} kasalligi tufayli sug'orish miqdori kamaytirildi")
-
-        if urgency_score == 3:
-            recommendations.append("⚠️ Tuproq namligi juda past, tezda sug'orish tavsiya etiladi")
-
-        return {
-            "base_water_requirement": base_daily_water,
-            "adjusted_water_requirement": adjusted_water,
-            "temperature_adjustment": temp_adjustment,
-            "rain_adjustment": rain_adjustment,
-            "disease_adjustment": disease_adjustment,
-            "soil_urgency_adjustment": urgency_adjustment,
-            "total_adjustment_factor": total_adjustment,
-            "schedule": schedule,
-            "detailed_schedule": detailed_schedule,
-            "recommendations": recommendations,
-            "status": "success"
-        }
-    except Exception as e:
-        return {"status": "error", "message": f"Aqlli sug'orish jadvalini hisoblashda xatolik: {str(e)}"}
+        return {"status": "error", "message": f"Ob-havo tahlili xatosi: {str(e)}"}
 
 
 def show_ai_results():
@@ -527,43 +210,53 @@ def show_ai_results():
         has_disease = st.checkbox("Ekinlarda kasallik bormi?")
 
         if has_disease:
-            disease_options = [
-                "Fitoftoroz", "Barg dog'lanishi", "Bakterial dog'lanish",
-                "Un shudring", "Bakterial chirish", "Fuzarioz"
-            ]
-            selected_disease = st.selectbox("Kasallik turini tanlang:", disease_options)
-
-            # Create simple disease info object
-            disease_info = {
-                "name": selected_disease,
-                "treatment": "Maxsus fungitsid bilan ishlov bering va sug'orishni kamaytiring."
-            }
+            # Tanlangan ekin kasalliklari bilim bazasidan olinadi (diseases_database.csv)
+            disease_kb = load_disease_kb()
+            crop_diseases = [record["code"] for record in disease_kb.for_crop(crop_type)]
+            if crop_diseases:
+                selected_disease = st.selectbox("Kasallik turini tanlang:", crop_diseases,
+                                                format_func=lambda code: disease_kb.get(code)["name"])
+                disease_info = disease_kb.get(selected_disease)
+            else:
+                disease_options = [
+                    "Fitoftoroz", "Barg dog'lanishi", "Bakterial dog'lanish",
+                    "Un shudring", "Bakterial chirish", "Fuzarioz"
+                ]
+                selected_disease = st.selectbox("Kasallik turini tanlang:", disease_options)
+
+                # Create simple disease info object
+                disease_info = {
+                    "name": selected_disease,
+                    "treatment": "Maxsus fungitsid bilan ishlov bering va sug'orishni kamaytiring."
+                }
         else:
             disease_info = {
                 "name": "Sog'lom o'simlik",
                 "treatment": "Davolash talab etilmaydi."
             }
 
+        # Prognoz noaniqligi: yomg'ir va harorat ssenariylari bo'yicha P10/P50/P90 suv hajmlari
+        ensemble_mode = st.checkbox("Prognoz noaniqligini hisobga olish (P10/P50/P90)")
+
         # Analysis button
         if st.button("🔍 Tahlil qilish", use_container_width=True):
             with st.spinner("Ma'lumotlar tahlil qilinmoqda..."):
-                # Progress bar for better UX
-                progress_bar = st.progress(0)
+                # Progress bar: each step advances only once the previous analysis has finished
+                progress_bar = st.progress(0, text="Ob-havo prognozi tahlil qilinmoqda...")
 
                 # 1. Analyze weather data
-                progress_bar.progress(20)
                 weather_data = analyze_weather_forecast(selected_region)
+                progress_bar.progress(20, text="Maydon holati tahlil qilinmoqda...")
 
                 # 2. Analyze field status
-                progress_bar.progress(40)
                 field_data = analyze_field_status(selected_field)
+                progress_bar.progress(40, text="Kasallik holati tahlil qilinmoqda...")
 
                 # 3. Analyze disease status
-                progress_bar.progress(60)
                 disease_data = analyze_disease_status(disease_info)
+                progress_bar.progress(60, text="Ekinning suv ehtiyoji hisoblanmoqda...")
 
                 # 4. Analyze crop water needs
-                progress_bar.progress(80)
                 crop_data = {
                     "crop_type": crop_type,
                     "growth_stage": selected_stage,
@@ -572,18 +265,24 @@ def show_ai_results():
                     "duration": duration_value
                 }
                 crop_analysis = analyze_crop_water_needs(crop_data)
+                progress_bar.progress(80, text="Sug'orish jadvali tuzilmoqda...")
 
                 # 5. Calculate smart irrigation schedule
-                progress_bar.progress(100)
-                time.sleep(0.5)  # Short delay for better UX
-
-                # Final calculations
                 if (weather_data.get("status") == "success" and
                         field_data.get("status") == "success" and
                         disease_data.get("status") == "success" and
                         crop_analysis.get("status") == "success"):
 
-                    irrigation_plan = calculate_smart_irrigation(weather_data, field_data, disease_data, crop_analysis)
+                    # The field's season plan is kept in the session, so a new analysis of the same
+                    # field recomputes only the days from the first changed input
+                    if "mavsum_rejalari" not in st.session_state:
+                        st.session_state.mavsum_rejalari = {}
+                    field_name = selected_field["nomi"]
+                    planner = season_planner(st.session_state.mavsum_rejalari.get(field_name), field_data)
+                    st.session_state.mavsum_rejalari[field_name] = planner
+                    irrigation_plan = calculate_smart_irrigation(weather_data, field_data, disease_data, crop_analysis,
+                                                                 planner=planner, field_id=field_name)
+                    progress_bar.progress(100, text="Tahlil yakunlandi")
 
                     # Show results
                     st.success("Tahlil muvaffaqiyatli yakunlandi!")
@@ -621,11 +320,18 @@ def show_ai_results():
 
                     # Weather & Temperature summary
                     st.markdown("##### 🌡️ Ob-havo ma'lumotlari:")
-                    col1, col2 = st.columns(2)
+                    col1, col2, col3, col4 = st.columns(4)
                     with col1:
                         st.metric("O'rtacha harorat", f"{weather_data.get('avg_temp', 0):.1f}°C")
                     with col2:
                         st.metric("Yomg'ir ehtimoli", f"{weather_data.get('avg_rain_prob', 0):.1f}%")
+                    with col3:
+                        st.metric("Bug'lanish (ET0)", f"{weather_data.get('avg_et0', 0):.1f} mm/kun")
+                    with col4:
+                        crop_et = irrigation_plan.get("crop_et")
+                        st.metric("Ekin suv ehtiyoji (ETc)",
+                                  f"{crop_et:.1f} mm/kun" if crop_et is not None else "N/A",
+                                  help=f"Kc = {irrigation_plan.get('crop_coefficient') or 0:.2f}")
 
                     # Irrigation schedule table
                     st.markdown("##### 📅 Sug'orish jadvali:")
@@ -639,10 +345,41 @@ def show_ai_results():
                             "Harorat (°C)": item.get("temperature", "N/A"),
                             "Yomg'ir ehtimoli (%)": item.get("rain_probability", "N/A")
                         }
+                        if item.get("net_depth_mm") is not None:
+                            day_data["Sof me'yor (mm)"] = f"{item['net_depth_mm']:.1f}"
                         schedule_data.append(day_data)
 
                     schedule_df = pd.DataFrame(schedule_data)
                     st.table(schedule_df)
+                    season_update = irrigation_plan.get("season_update")
+                    if season_update:
+                        st.caption(f"Mavsum rejasi: {season_update['recomputed_days']} kun qayta hisoblandi, "
+                                   f"{season_update['reused_days']} kun oldingi tahlildan olindi")
+
+                    # Forecast uncertainty: each irrigation over sampled rain/temperature scenarios
+                    if ensemble_mode and weather_data.get("forecast"):
+                        from irrigation_core.ensemble import ensemble_irrigation
+
+                        ensemble = ensemble_irrigation(weather_data["forecast"], field_data, crop_analysis)
+                        if ensemble is not None and len(ensemble["volume_m3"]):
+                            st.markdown(f"##### 🎲 Prognoz noaniqligi ({ensemble['scenarios']} ssenariy):")
+                            today = datetime.date.today()
+                            ensemble_data = []
+                            for i, (days, volume, probability) in enumerate(zip(
+                                    ensemble["day_offset"], ensemble["volume_m3"], ensemble["probability"])):
+                                ensemble_data.append({
+                                    "№": i + 1,
+                                    "Sana (P50)": (today + datetime.timedelta(days=int(days[1]))).strftime("%d.%m.%Y"),
+                                    "Kun (P10-P90)": f"{int(days[0])}-{int(days[2])}",
+                                    "Sof hajm P10 (m³)": f"{volume[0]:.2f}",
+                                    "Sof hajm P50 (m³)": f"{volume[1]:.2f}",
+                                    "Sof hajm P90 (m³)": f"{volume[2]:.2f}",
+                                    "Ehtimollik (%)": f"{probability * 100:.0f}"
+                                })
+                            st.table(pd.DataFrame(ensemble_data))
+                            total_p10, total_p50, total_p90 = ensemble["total_m3"]
+                            st.caption(f"Mavsum davomida jami sof hajm: P10 {total_p10:.0f} m³, "
+                                       f"P50 {total_p50:.0f} m³, P90 {total_p90:.0f} m³")
 
                     # NEW: Add detailed water adjustment table
                     st.markdown("##### 💧 Suv hajmi o'zgarishi jadvali:")
@@ -796,13 +533,11 @@ def show_ai_results():
                         title="Keyingi kunlar uchun ob-havo bashorati",
                         xaxis_title="Sana",
                         yaxis=dict(
-                            title="Harorat (°C)",
-                            titlefont=dict(color="#FF9800"),
+                            title=dict(text="Harorat (°C)", font=dict(color="#FF9800")),
                             tickfont=dict(color="#FF9800")
                         ),
                         yaxis2=dict(
-                            title="Yomg'ir ehtimoli (%)",
-                            titlefont=dict(color="#0078D4"),
+                            title=dict(text="Yomg'ir ehtimoli (%)", font=dict(color="#0078D4")),
                             tickfont=dict(color="#0078D4"),
                             anchor="x",
                             overlaying="y",
@@ -1,34 +1,14 @@
 import streamlit as st
-import requests
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
 import folium
 from streamlit_folium import folium_static
-from datetime import datetime, timedelta
-import time
-
-# API settings
-API_KEY = "3edb4ae23e76cb211977b49f0ac13c1a"
-BASE_URL = "https://api.openweathermap.org/data/2.5/weather"
-FORECAST_URL = "https://api.openweathermap.org/data/2.5/forecast"
-
-# Uzbekistan cities with API names and coordinates
-UZB_CITIES = {
-    "Toshkent": ("Tashkent", 41.2995, 69.2401),
-    "Samarqand": ("Samarkand", 39.6542, 66.9758),
-    "Buxoro": ("Bukhara", 39.7686, 64.4556),
-    "Farg'ona": ("Fergana", 40.3842, 71.7843),
-    "Andijon": ("Andijan", 40.7833, 72.3500),
-    "Namangan": ("Namangan", 40.9983, 71.6726),
-    "Xorazm": ("Urgench", 41.5500, 60.6333),
-    "Qashqadaryo": ("Qarshi", 38.8600, 65.8000),
-    "Surxondaryo": ("Termiz", 37.2242, 67.2783),
-    "Navoiy": ("Navoiy", 40.1000, 65.3667),
-    "Jizzax": ("Jizzakh", 40.1000, 67.8500),
-    "Sirdaryo": ("Gulistan", 40.5000, 68.7833),
-    "Nukus": ("Nukus", 42.4667, 59.6000)
-}
+from datetime import datetime
+
+# API settings, region list and the persistent forecast store live in weather_api
+from weather_api import API_KEY, BASE_URL, FORECAST_URL, UZB_CITIES
+import weather_api
 
 # Icons for weather conditions
 WEATHER_ICONS = {
@@ -57,114 +37,16 @@ WEATHER_COLORS = {
 }
 
 
-@st.cache_data(ttl=600)
+# st.cache_data is only a short per-process tier; the shared on-disk store behind it
+# survives restarts and refreshes expired entries in the background
+@st.cache_data(ttl=60)
 def show_weather(region):
-    if region not in UZB_CITIES:
-        return None
-    city_name, lat, lon = UZB_CITIES[region]
-    params = {"q": city_name + ",UZ", "appid": API_KEY, "units": "metric", "lang": "uz"}
-    try:
-        response = requests.get(BASE_URL, params=params)
-        data = response.json()
-        if response.status_code == 200:
-            return {
-                "temp": round(data["main"]["temp"]),
-                "feels_like": round(data["main"]["feels_like"]),
-                "humidity": data["main"]["humidity"],
-                "wind_speed": data["wind"]["speed"],
-                "pressure": data["main"]["pressure"],
-                "rain_chance": data.get("rain", {}).get("1h", 0),
-                "description": data["weather"][0]["description"].capitalize(),
-                "icon": data["weather"][0]["icon"],
-                "date": datetime.now().strftime("%d-%m-%Y %H:%M"),
-                "lat": lat,
-                "lon": lon
-            }
-        else:
-            return None
-    except requests.exceptions.RequestException:
-        return None
+    return weather_api.get_current(region)
 
 
-@st.cache_data(ttl=1800)
+@st.cache_data(ttl=60)
 def get_forecast(region):
-    if region not in UZB_CITIES:
-        return None
-    city_name, _, _ = UZB_CITIES[region]
-    params = {"q": city_name + ",UZ", "appid": API_KEY, "units": "metric", "cnt": 40, "lang": "uz"}
-    try:
-        response = requests.get(FORECAST_URL, params=params)
-        data = response.json()
-        if response.status_code == 200:
-            temps, rain_probs, dates, icons, wind_speeds, humidities = [], [], [], [], [], []
-            for entry in data["list"]:
-                temps.append(round(entry["main"]["temp"]))
-                rain_probs.append(entry.get("pop", 0) * 100)
-                dates.append(datetime.strptime(entry["dt_txt"], "%Y-%m-%d %H:%M:%S"))
-                icons.append(entry["weather"][0]["icon"])
-                wind_speeds.append(entry["wind"]["speed"])
-                humidities.append(entry["main"]["humidity"])
-
-            # Get daily forecasts (use noon forecasts for each day)
-            daily_dates, daily_temps, daily_icons, daily_rain_probs, daily_descriptions, daily_wind_speeds, daily_humidities = [], [], [], [], [], [], []
-            current_date = dates[0].date()
-
-            # Group forecast by date
-            date_groups = {}
-            for i, date in enumerate(dates):
-                date_key = date.date()
-                if date_key not in date_groups:
-                    date_groups[date_key] = []
-                date_groups[date_key].append(i)
-
-            # Get 7 days of forecasts with full data
-            for i in range(7):  # Get 7 days
-                target_date = current_date + timedelta(days=i)
-                if target_date in date_groups:
-                    indices = date_groups[target_date]
-                    # Try to get noon forecast
-                    noon_index = None
-                    for idx in indices:
-                        if 11 <= dates[idx].hour <= 14:
-                            noon_index = idx
-                            break
-
-                    # If no noon forecast, take the first one of the day
-                    if noon_index is None and indices:
-                        noon_index = indices[0]
-
-                    if noon_index is not None:
-                        daily_dates.append(dates[noon_index])
-                        daily_temps.append(temps[noon_index])
-                        daily_icons.append(icons[noon_index])
-                        daily_rain_probs.append(rain_probs[noon_index])
-                        daily_wind_speeds.append(wind_speeds[noon_index])
-                        daily_humidities.append(humidities[noon_index])
-
-            # Calculate weekly averages
-            weekly_avg_temp = sum(temps[:40]) / len(temps[:40]) if temps else 0
-            weekly_avg_rain_prob = sum(rain_probs[:40]) / len(rain_probs[:40]) if rain_probs else 0
-
-            return {
-                "dates": dates,
-                "temps": temps,
-                "rain_probs": rain_probs,
-                "icons": icons,
-                "wind_speeds": wind_speeds,
-                "humidities": humidities,
-                "daily_dates": daily_dates,
-                "daily_temps": daily_temps,
-                "daily_icons": daily_icons,
-                "daily_rain_probs": daily_rain_probs,
-                "daily_wind_speeds": daily_wind_speeds,
-                "daily_humidities": daily_humidities,
-                "weekly_avg_temp": round(weekly_avg_temp, 1),
-                "weekly_avg_rain_prob": round(weekly_avg_rain_prob, 1)
-            }
-        else:
-            return None
-    except requests.exceptions.RequestException:
-        return None
+    return weather_api.get_forecast(region)
 
 
 def apply_weather_css():
@@ -583,19 +465,18 @@ def show_weather_page():
                 region = st.session_state.last_region
 
             with st.spinner("Ma'lumotlar yuklanmoqda..."):
-                # Loading animation
-                st.markdown("""
+                # Loading animation, shown only while the requests are in flight
+                loader = st.empty()
+                loader.markdown("""
                 <div class="loader">
                     <div class="loading-animation"></div>
                 </div>
                 """, unsafe_allow_html=True)
 
-                # Small delay for animation effect
-                time.sleep(1)
-
                 # Get weather data
                 weather_data = show_weather(region)
                 forecast_data = get_forecast(region)
+                loader.empty()
 
                 if weather_data and forecast_data:
                     temp = weather_data["temp"]
@@ -734,9 +615,9 @@ def show_weather_page():
                         <tbody>
                     """
 
-                    for i, date in enumerate(forecast_data["daily_dates"]):
-                        day_name = date.strftime("%a")
-                        date_str = date.strftime("%d-%m")
+                    daily_dates = pd.DatetimeIndex(forecast_data["daily_dates"])
+                    for i, (day_name, date_str) in enumerate(zip(daily_dates.strftime("%a"),
+                                                                 daily_dates.strftime("%d-%m"))):
                         temp = forecast_data["daily_temps"][i]
                         icon = forecast_data["daily_icons"][i]
                         rain_prob = forecast_data["daily_rain_probs"][i]
@@ -772,7 +653,7 @@ def show_weather_page():
                     """, unsafe_allow_html=True)
 
                     # Create temperature chart data
-                    dates_str = [date.strftime("%d-%m %H:%M") for date in forecast_data["dates"][:20]]
+                    dates_str = pd.DatetimeIndex(forecast_data["dates"][:20]).strftime("%d-%m %H:%M")
                     fig = go.Figure()
                     fig.add_trace(go.Scatter(
                         x=dates_str,
@@ -0,0 +1,143 @@
+import os
+import threading
+from datetime import datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from forecast_store import ForecastStore
+from irrigation_core.forecast import parse_forecast_columns, build_forecast
+
+# API settings (the root can point at a local stub server for testing)
+API_KEY = os.environ.get("OWM_API_KEY", "3edb4ae23e76cb211977b49f0ac13c1a")
+API_ROOT = os.environ.get("OWM_API_ROOT", "https://api.openweathermap.org/data/2.5")
+BASE_URL = API_ROOT + "/weather"
+FORECAST_URL = API_ROOT + "/forecast"
+REQUEST_TIMEOUT = 10
+
+# Keep-alive connections kept open to the API host (one per concurrent prefetch worker)
+HTTP_POOL_SIZE = 16
+
+# Refresh intervals of the persistent store (seconds)
+CURRENT_TTL = 600
+FORECAST_TTL = 1800
+
+# Uzbekistan cities with API names and coordinates
+UZB_CITIES = {
+    "Toshkent": ("Tashkent", 41.2995, 69.2401),
+    "Samarqand": ("Samarkand", 39.6542, 66.9758),
+    "Buxoro": ("Bukhara", 39.7686, 64.4556),
+    "Farg'ona": ("Fergana", 40.3842, 71.7843),
+    "Andijon": ("Andijan", 40.7833, 72.3500),
+    "Namangan": ("Namangan", 40.9983, 71.6726),
+    "Xorazm": ("Urgench", 41.5500, 60.6333),
+    "Qashqadaryo": ("Qarshi", 38.8600, 65.8000),
+    "Surxondaryo": ("Termiz", 37.2242, 67.2783),
+    "Navoiy": ("Navoiy", 40.1000, 65.3667),
+    "Jizzax": ("Jizzakh", 40.1000, 67.8500),
+    "Sirdaryo": ("Gulistan", 40.5000, 68.7833),
+    "Nukus": ("Nukus", 42.4667, 59.6000)
+}
+
+_store = None
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Process-wide pooled HTTP session so requests reuse keep-alive TLS connections"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=HTTP_POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+    return _session
+
+
+def get_store():
+    """Process-wide forecast store, created on first use"""
+    global _store
+    if _store is None:
+        _store = ForecastStore()
+    return _store
+
+
+def _fetch_json(url, params):
+    try:
+        response = get_session().get(url, params=params, timeout=REQUEST_TIMEOUT)
+        if response.status_code == 200:
+            return response.json()
+        return None
+    except (requests.exceptions.RequestException, ValueError):
+        return None
+
+
+def fetch_current_payload(region):
+    """Raw current-weather response for a region, or None"""
+    if region not in UZB_CITIES:
+        return None
+    city_name, _, _ = UZB_CITIES[region]
+    params = {"q": city_name + ",UZ", "appid": API_KEY, "units": "metric", "lang": "uz"}
+    return _fetch_json(BASE_URL, params)
+
+
+def fetch_forecast_payload(region):
+    """Raw 5-day / 3-hour forecast response for a region, or None"""
+    if region not in UZB_CITIES:
+        return None
+    city_name, _, _ = UZB_CITIES[region]
+    params = {"q": city_name + ",UZ", "appid": API_KEY, "units": "metric", "cnt": 40, "lang": "uz"}
+    return _fetch_json(FORECAST_URL, params)
+
+
+def parse_current(region, data, fetched_at):
+    """Convert a current-weather response into the dictionary used by the weather page"""
+    _, lat, lon = UZB_CITIES[region]
+    return {
+        "temp": round(data["main"]["temp"]),
+        "feels_like": round(data["main"]["feels_like"]),
+        "humidity": data["main"]["humidity"],
+        "wind_speed": data["wind"]["speed"],
+        "pressure": data["main"]["pressure"],
+        "rain_chance": data.get("rain", {}).get("1h", 0),
+        "description": data["weather"][0]["description"].capitalize(),
+        "icon": data["weather"][0]["icon"],
+        "date": datetime.fromtimestamp(fetched_at).strftime("%d-%m-%Y %H:%M"),
+        "lat": lat,
+        "lon": lon
+    }
+
+
+def parse_forecast(data):
+    """Parse a forecast response once into NumPy columns with daily selection and weekly averages"""
+    return build_forecast(parse_forecast_columns(data))
+
+
+def get_current(region, store=None):
+    """Current weather for a region served from the persistent store (stale-while-revalidate)"""
+    if region not in UZB_CITIES:
+        return None
+    entry = (store or get_store()).get("current", region, fetch_current_payload, CURRENT_TTL)
+    if entry is None:
+        return None
+    fetched_at, payload = entry
+    return parse_current(region, payload, fetched_at)
+
+
+def get_forecast(region, store=None):
+    """
+    Forecast for a region served from the persistent store (stale-while-revalidate),
+    tagged with the region and its city coordinates (used for evapotranspiration)
+    """
+    if region not in UZB_CITIES:
+        return None
+    entry = (store or get_store()).get("forecast", region, fetch_forecast_payload, FORECAST_TTL)
+    if entry is None:
+        return None
+    _, lat, lon = UZB_CITIES[region]
+    forecast = parse_forecast(entry[1])
+    forecast.update(region=region, latitude=lat, longitude=lon)
+    return forecast
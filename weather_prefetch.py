@@ -0,0 +1,91 @@
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import weather_api
+
+# Upper bound on concurrent requests to the weather API
+MAX_WORKERS = 8
+
+# Default interval between scheduled prefetch runs (seconds)
+PREFETCH_INTERVAL = weather_api.CURRENT_TTL
+
+
+def _log(message):
+    print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {message}", file=sys.stderr, flush=True)
+
+
+def _prefetch_one(store, kind, region):
+    """
+    Refresh one store entry. Any error (HTTP, parsing, a locked database on store.put)
+    is logged and the job counted as failed, so one bad job never stops the others
+    Returns:
+        (kind, region, ok, seconds, error) with error None on success
+    """
+    fetch = weather_api.fetch_current_payload if kind == "current" else weather_api.fetch_forecast_payload
+    start = time.perf_counter()
+    try:
+        entry = store.refresh(kind, region, fetch)
+    except Exception as e:
+        _log(f"prefetch {kind} {region} failed: {e!r}")
+        return kind, region, False, time.perf_counter() - start, repr(e)
+    return kind, region, entry is not None, time.perf_counter() - start, None
+
+
+def prefetch_all(store=None, regions=None, max_workers=MAX_WORKERS):
+    """
+    Fetch current weather and forecasts for all regions concurrently and warm the store
+    Args:
+        store: ForecastStore to warm, defaults to the shared weather_api store
+        regions: Region names, defaults to every region in UZB_CITIES
+        max_workers: Size of the bounded thread pool
+    Returns:
+        Dictionary with wall time, per-request results, failed jobs and the errors raised
+    """
+    store = store or weather_api.get_store()
+    regions = list(regions or weather_api.UZB_CITIES)
+    jobs = [(kind, region) for region in regions for kind in ("current", "forecast")]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="weather-prefetch") as pool:
+        results = list(pool.map(lambda job: _prefetch_one(store, *job), jobs))
+    wall_time = time.perf_counter() - start
+
+    return {
+        "regions": len(regions),
+        "requests": len(jobs),
+        "wall_time": wall_time,
+        "failed": [(kind, region) for kind, region, ok, _, _ in results if not ok],
+        "errors": [(kind, region, error) for kind, region, _, _, error in results if error],
+        "results": results
+    }
+
+
+def run_forever(interval=PREFETCH_INTERVAL, max_workers=MAX_WORKERS):
+    """Prefetch on a fixed schedule, e.g. from a cron-style worker process; a failed run is logged and retried"""
+    while True:
+        start = time.perf_counter()
+        try:
+            report = prefetch_all(max_workers=max_workers)
+            print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {report['regions']} regions, "
+                  f"{report['requests']} requests in {report['wall_time']:.2f} s, "
+                  f"{len(report['failed'])} failed", flush=True)
+        except Exception as e:
+            _log(f"prefetch run failed: {e!r}")
+        time.sleep(max(0.0, interval - (time.perf_counter() - start)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Warm the forecast store for all regions")
+    parser.add_argument("--interval", type=float, default=None,
+                        help="repeat every INTERVAL seconds instead of running once")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS)
+    args = parser.parse_args()
+
+    if args.interval:
+        run_forever(args.interval, args.workers)
+    else:
+        report = prefetch_all(max_workers=args.workers)
+        print(f"{report['regions']} regions, {report['requests']} requests in {report['wall_time']:.2f} s, "
+              f"{len(report['failed'])} failed")
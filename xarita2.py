@@ -9,110 +9,13 @@ import numpy as np
 import time
 import altair as alt
 import json
+import os
 from branca.colormap import linear
 
-# O'simlik turlari va ularning xususiyatlari
-osimlik_turlari = {
-    "bug'doy": {
-        "sugorish_davri": 10,  # Kunlarda
-        "pishib_yetilish_muddat": 4,  # Oylarda
-        "namlik_minimum": 30,
-        "namlik_optimal": 60,
-        "qurish_tezligi": 1.5
-    },
-    "makkajo'xori": {
-        "sugorish_davri": 7,
-        "pishib_yetilish_muddat": 3,
-        "namlik_minimum": 40,
-        "namlik_optimal": 70,
-        "qurish_tezligi": 2.0
-    },
-    "sholi": {
-        "sugorish_davri": 4,
-        "pishib_yetilish_muddat": 4,
-        "namlik_minimum": 60,
-        "namlik_optimal": 90,
-        "qurish_tezligi": 2.5
-    },
-    "paxta": {
-        "sugorish_davri": 8,
-        "pishib_yetilish_muddat": 5,
-        "namlik_minimum": 35,
-        "namlik_optimal": 65,
-        "qurish_tezligi": 1.8
-    },
-    "sabzavotlar": {
-        "sugorish_davri": 4,
-        "pishib_yetilish_muddat": 2,
-        "namlik_minimum": 45,
-        "namlik_optimal": 75,
-        "qurish_tezligi": 2.2
-    },
-    "kartoshka": {
-        "sugorish_davri": 6,
-        "pishib_yetilish_muddat": 3,
-        "namlik_minimum": 40,
-        "namlik_optimal": 70,
-        "qurish_tezligi": 1.7
-    },
-    "beda": {
-        "sugorish_davri": 12,
-        "pishib_yetilish_muddat": 2,
-        "namlik_minimum": 35,
-        "namlik_optimal": 65,
-        "qurish_tezligi": 1.4
-    },
-    "pomidor": {
-        "sugorish_davri": 3,
-        "pishib_yetilish_muddat": 3,
-        "namlik_minimum": 50,
-        "namlik_optimal": 80,
-        "qurish_tezligi": 2.3
-    },
-    "bodring": {
-        "sugorish_davri": 2,
-        "pishib_yetilish_muddat": 2,
-        "namlik_minimum": 55,
-        "namlik_optimal": 85,
-        "qurish_tezligi": 2.4
-    }
-}
-
-
-# Maydon rangini sug'orish jadvali va tuproq namligiga qarab aniqlash funksiyasi
-def maydon_rangini_olish(oxirgi_sugorilgan, ekin_turi, tuproq_namligi, ekish_sanasi=None):
-    if ekin_turi not in osimlik_turlari:
-        return "gray", "Ekin turi tanlanmagan"
-
-    sugorish_davri = osimlik_turlari[ekin_turi]["sugorish_davri"]
-    namlik_minimum = osimlik_turlari[ekin_turi]["namlik_minimum"]
-    namlik_optimal = osimlik_turlari[ekin_turi]["namlik_optimal"]
-
-    sugorishdan_otgan_kunlar = (datetime.date.today() - oxirgi_sugorilgan).days
-
-    # Pishib yetilish muddatini hisoblash
-    pishib_yetilish_holati = ""
-    if ekish_sanasi:
-        pishib_yetilish_muddat = osimlik_turlari[ekin_turi]["pishib_yetilish_muddat"] * 30  # oy kunlarga
-        utgan_kunlar = (datetime.date.today() - ekish_sanasi).days
-        qolgan_kunlar = pishib_yetilish_muddat - utgan_kunlar
-
-        if qolgan_kunlar <= 0:
-            pishib_yetilish_holati = "Pishib yetilgan"
-        else:
-            pishib_yetilish_holati = f"Pishib yetilishga {qolgan_kunlar} kun qoldi"
-
-    # Namlik holatini baholash
-    if tuproq_namligi < namlik_minimum and sugorishdan_otgan_kunlar >= sugorish_davri:
-        return "red", f"Tezda sug'orish kerak. {pishib_yetilish_holati}"
-    elif tuproq_namligi < namlik_minimum * 1.2 and sugorishdan_otgan_kunlar >= sugorish_davri - 2:
-        return "orange", f"Sug'orish kuni yaqinlashmoqda. {pishib_yetilish_holati}"
-    elif tuproq_namligi > namlik_optimal * 0.8 and sugorishdan_otgan_kunlar < sugorish_davri:
-        return "green", f"Yaqinda sug'orilgan. {pishib_yetilish_holati}"
-    elif pishib_yetilish_holati == "Pishib yetilgan":
-        return "purple", "Ekin hosilga tayyor"
-    else:
-        return "blue", f"Normal holat. {pishib_yetilish_holati}"
+from irrigation_core.crops import osimlik_turlari, maydon_rangini_olish
+from irrigation_core.soil import crop_soil_parameters, simulate_moisture
+from irrigation_core.field_index import FieldIndex
+from field_layers import maydonlarni_xaritaga_qoshish
 
 
 # Sessiya holatini ishga tushirish
@@ -184,27 +87,53 @@ def demo_maydonlar_yaratish():
 def tuproq_namligini_yangilash():
     hozir = time.time()
     if hozir - st.session_state.oxirgi_yangilanish > 5:  # Har 5 sekundda yangilash
-        for i, maydon in enumerate(st.session_state.maydonlar):
-            # Oxirgi sug'orishdan o'tgan vaqtga asosan namlikni kamaytirish
-            sugorishdan_otgan_kunlar = (datetime.date.today() - maydon["oxirgi_sugorilgan"]).days
+        maydonlar = st.session_state.maydonlar
+        if maydonlar:
+            # Barcha maydonlar bitta vektorlashtirilgan qadamda yangilanadi
+            qurish_tezligi, _ = crop_soil_parameters([maydon["ekin"] for maydon in maydonlar])
+            bugun = datetime.date.today()
+            natija = simulate_moisture(
+                [maydon["tuproq_namligi"] for maydon in maydonlar],
+                qurish_tezligi,
+                [(bugun - maydon["oxirgi_sugorilgan"]).days for maydon in maydonlar],
+                n_days=1,
+                rng=_namlik_generatori(),
+                max_moisture=None  # Avvalgidek faqat pastdan (0) cheklanadi
+            )
+            for maydon, yangi_namlik in zip(maydonlar, natija["moisture"][:, -1].tolist()):
+                maydon["tuproq_namligi"] = yangi_namlik
 
-            # Ekin turiga qarab qurishni simulyatsiya qilish
-            if maydon["ekin"] in osimlik_turlari:
-                qurish_koeffitsienti = osimlik_turlari[maydon["ekin"]]["qurish_tezligi"]
-            else:
-                qurish_koeffitsienti = 1.5
+        st.session_state.oxirgi_yangilanish = hozir
 
-            # Tasodifiy o'zgarish (-0.5 dan 0.5 gacha)
-            tasodifiy_ozgarish = np.random.uniform(-0.5, 0.5)
 
-            # Namlik kamayishini hisoblash
-            namlik_kamayishi = (qurish_koeffitsienti * sugorishdan_otgan_kunlar / 10) + tasodifiy_ozgarish
+# Sessiyadagi tasodifiy sonlar generatori (NAMLIK_SEED berilsa takrorlanadigan)
+def _namlik_generatori():
+    if 'namlik_rng' not in st.session_state:
+        seed = os.environ.get("NAMLIK_SEED")
+        st.session_state.namlik_rng = np.random.default_rng(int(seed) if seed else None)
+    return st.session_state.namlik_rng
 
-            # Namlik qiymatini yangilash (0 dan kam bo'lmasligi kerak)
-            yangi_namlik = max(0, maydon["tuproq_namligi"] - namlik_kamayishi)
-            st.session_state.maydonlar[i]["tuproq_namligi"] = yangi_namlik
 
-        st.session_state.oxirgi_yangilanish = hozir
+# Maydonlar geometriyasi bo'yicha fazoviy indeks (yangi maydonlar qo'shilganda to'ldiriladi)
+def maydon_indeksi():
+    if 'maydon_indeksi' not in st.session_state:
+        st.session_state.maydon_indeksi = FieldIndex()
+    indeks = st.session_state.maydon_indeksi
+    for maydon in st.session_state.maydonlar[len(indeks):]:
+        indeks.add(maydon.get("shakl"))
+    return indeks
+
+
+# Xaritaning hozir ko'rinadigan qismidagi maydonlar (chegaralar hali ma'lum bo'lmasa - hammasi).
+# st_folium key="maydonlar_xaritasi" bilan chaqiriladi, shuning uchun surish yoki zoomdan keyingi qayta ishga
+# tushishda yangi chegaralar sahifa boshidanoq st.session_state.maydonlar_xaritasi da bo'ladi
+def korinadigan_maydonlar(indeks):
+    chegaralar = (st.session_state.get("maydonlar_xaritasi") or {}).get("bounds")
+    if not chegaralar or not chegaralar.get("_southWest") or not chegaralar.get("_northEast"):
+        return range(len(st.session_state.maydonlar))
+    janubi_garb, shimoli_sharq = chegaralar["_southWest"], chegaralar["_northEast"]
+    return indeks.query_bbox(janubi_garb["lng"], janubi_garb["lat"],
+                             shimoli_sharq["lng"], shimoli_sharq["lat"]).tolist()
 
 
 # Maydonni tanlash funksiyasi
@@ -338,74 +267,33 @@ def show_xarita_page():
         '''
         xarita_obyekti.get_root().html.add_child(folium.Element(legend_html))
 
-        # Mavjud maydonlarni xaritaga qo'shish
-        for i, maydon in enumerate(st.session_state.maydonlar):
-            if "shakl" in maydon and maydon["shakl"]:
-                ekish_sanasi = maydon.get("ekish_sanasi", None)
-                rang, holat = maydon_rangini_olish(maydon["oxirgi_sugorilgan"], maydon["ekin"],
-                                                   maydon["tuproq_namligi"],
-                                                   ekish_sanasi)
-
-                # GeoJSON obyektini yaratish
-                if "geometry" in maydon["shakl"]:
-                    geo_json = maydon["shakl"]
-                else:
-                    geo_json = {
-                        "type": "Feature",
-                        "geometry": maydon["shakl"]
-                    }
-
-                # Sug'orish davrini olish
-                if maydon["ekin"] in osimlik_turlari:
-                    sugorish_davri = osimlik_turlari[maydon["ekin"]]["sugorish_davri"]
-                    pishib_yetilish_muddat = osimlik_turlari[maydon["ekin"]]["pishib_yetilish_muddat"]
-                else:
-                    sugorish_davri = "Aniqlanmagan"
-                    pishib_yetilish_muddat = "Aniqlanmagan"
-
-                # Pishib yetilish muddatini hisoblash
-                if ekish_sanasi:
-                    pishib_yetilish_kuni = ekish_sanasi + datetime.timedelta(days=pishib_yetilish_muddat * 30)
-                    qolgan_kunlar = (pishib_yetilish_kuni - datetime.date.today()).days
-                    if qolgan_kunlar > 0:
-                        pishib_yetilish_holati = f"Pishib yetilishga {qolgan_kunlar} kun qoldi"
-                    else:
-                        pishib_yetilish_holati = "Pishib yetilgan"
-                else:
-                    pishib_yetilish_holati = "Ekish sanasi kiritilmagan"
-
-                # Popup ma'lumotini yaratish
-                popup = folium.Popup(
-                    f"<b>{maydon['nomi']}</b><br>" +
-                    f"Ekin: {maydon['ekin']}<br>" +
-                    f"Sug'orish davri: {sugorish_davri} kun<br>" +
-                    f"Pishib yetilish: {pishib_yetilish_muddat} oy<br>" +
-                    f"Oxirgi sug'orilgan: {maydon['oxirgi_sugorilgan']}<br>" +
-                    f"Tuproq namligi: {maydon['tuproq_namligi']:.1f}%<br>" +
-                    f"Status: {holat}<br>" +
-                    (f"Ekish sanasi: {ekish_sanasi}<br>" if ekish_sanasi else "") +
-                    (f"Pishib yetilish sanasi: {pishib_yetilish_kuni}<br>" if ekish_sanasi else "") +
-                    (f"Pishib yetilish holati: {pishib_yetilish_holati}" if ekish_sanasi else ""),
-                    max_width=300
-                )
-
-                # Maydonni xaritaga qo'shish
-                folium.GeoJson(
-                    geo_json,
-                    style_function=lambda x, rang=rang: {
-                        'fillColor': rang,
-                        'color': 'white',
-                        'weight': 2,
-                        'fillOpacity': 0.5,
-                        'dashArray': '5, 5'
-                    },
-                    popup=popup,
-                    tooltip=folium.Tooltip(f"{maydon['nomi']} - {holat}")
-                ).add_to(xarita_obyekti)
+        # Mavjud maydonlarni (faqat ko'rinadigan qismdagilarini) alohida guruhga qo'shish. Guruh xaritaga
+        # feature_group_to_add orqali beriladi: ko'rinadigan maydonlar o'zgarganda xarita qayta yuklanmaydi,
+        # faqat guruh almashtiriladi, shuning uchun foydalanuvchi tanlagan markaz va zoom saqlanib qoladi
+        indeks = maydon_indeksi()
+        maydonlar_guruhi = folium.FeatureGroup(name="Maydonlar")
+        maydonlarni_xaritaga_qoshish(maydonlar_guruhi, st.session_state.maydonlar, korinadigan_maydonlar(indeks))
 
         # Xaritani ko'rsatish
-        xarita_data = st_folium(xarita_obyekti, height=500, width="100%",
-                                returned_objects=["all_drawings", "last_active_drawing"])
+        xarita_data = st_folium(xarita_obyekti, key="maydonlar_xaritasi", height=500, width="100%",
+                                feature_group_to_add=maydonlar_guruhi,
+                                returned_objects=["all_drawings", "last_active_drawing", "last_clicked", "bounds"])
+
+        if xarita_data:
+            # Bosilgan nuqtadagi maydonni indeks orqali topish
+            bosilgan = xarita_data.get("last_clicked")
+            if bosilgan and bosilgan != st.session_state.get("oxirgi_bosish"):
+                st.session_state.oxirgi_bosish = bosilgan
+                topilganlar = indeks.query_point(bosilgan["lng"], bosilgan["lat"])
+                if topilganlar:
+                    maydonni_tanlash(topilganlar[-1])
+
+        if st.session_state.tanlangan_maydon is not None:
+            tanlangan = st.session_state.maydonlar[st.session_state.tanlangan_maydon]
+            st.info(f"Tanlangan maydon: **{tanlangan['nomi']}** ({tanlangan['ekin']}, "
+                    f"namlik {tanlangan['tuproq_namligi']:.1f}%)")
+            if st.button("💧 Tanlangan maydonni sug'orish"):
+                maydonni_sugorish()
 
         # Xarita ko'rsatmalari
         st.info("""